@@ -0,0 +1,63 @@
+"""
+수강 과목 내보내기
+
+courses 컬렉션을 과목 한 건당 한 줄(NDJSON/CSV)로 파일이나 표준 출력에 씁니다.
+API(GET /oasis/export/courses)와 같은 ExportService를 사용합니다.
+
+    python -m app.cli.export_courses --format csv --year 2024 -o courses.csv
+    python -m app.cli.export_courses --format csv --year 2024 -o courses.csv --resume   # 중단된 파일 이어 받기
+    python -m app.cli.export_courses --after 202012345 > rest.ndjson
+
+--resume은 파일 끝의 잘린 줄과 마지막 학번(일부만 쓰였을 수 있음)의 줄을 잘라내고 그 학번부터 다시 받습니다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pymongo import AsyncMongoClient
+from app.core.config import settings
+from app.repositories.taken_courses_repository import TakenCoursesRepository
+from app.services.export_service import ExportService, CourseExportFilter, find_resume_point
+
+
+async def export(args: argparse.Namespace):
+    client = AsyncMongoClient(settings.MONGODB_URL)
+    service = ExportService(TakenCoursesRepository(client[settings.MONGODB_DB_NAME]))
+    filters = CourseExportFilter(year=args.year, semester=args.semester, course_type=args.course_type)
+
+    after = args.after
+    if args.resume and os.path.exists(args.output):
+        out = open(args.output, "r+b")
+        cut, after = find_resume_point(out, args.format)
+        out.truncate(cut)
+        out.seek(cut)
+    else:
+        out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for chunk in service.stream_courses(args.format, filters, after, args.batch_size):
+            out.write(chunk)
+    finally:
+        out.flush()
+        if args.output:
+            out.close()
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 수강 과목을 NDJSON/CSV로 내보내기")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--year")
+    parser.add_argument("--semester")
+    parser.add_argument("--course-type")
+    parser.add_argument("--after", help="이 학번 다음부터 내보내기 (CSV 헤더 생략)")
+    parser.add_argument("--resume", action="store_true", help="중단된 출력 파일(-o)을 정리하고 이어 받기")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("-o", "--output", help="출력 파일 (기본: 표준 출력)")
+    args = parser.parse_args()
+    if args.resume and (not args.output or args.after):
+        parser.error("--resume은 -o와 함께, --after 없이 사용합니다.")
+    asyncio.run(export(args))
+
+
+if __name__ == "__main__":
+    main()
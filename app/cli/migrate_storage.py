@@ -0,0 +1,72 @@
+"""
+저장 레이아웃 마이그레이션
+
+섹션별 컬렉션(students, credits, courses) <-> 학생당 통합 문서(MONGODB_UNIFIED_COLLECTION) 사이로
+데이터를 복사합니다. 원본 컬렉션은 지우지 않으므로, 확인 후 STORAGE_LAYOUT을 바꾸고 직접 정리하면 됩니다.
+여러 번 실행해도 같은 결과가 되도록 std_no 기준 upsert로 씁니다.
+
+    python -m app.cli.migrate_storage --to unified
+    python -m app.cli.migrate_storage --to split --dry-run
+"""
+import argparse
+import asyncio
+from pymongo import AsyncMongoClient, UpdateOne
+from app.core.config import settings
+from app.repositories.layout import SectionLayout, SECTION_COLLECTIONS
+
+
+async def _flush(collection, ops: list, dry_run: bool) -> int:
+    if ops and not dry_run:
+        await collection.bulk_write(ops, ordered=False)
+    written = len(ops)
+    ops.clear()
+    return written
+
+
+async def migrate(target: str, batch_size: int, dry_run: bool):
+    source_layout = "split" if target == "unified" else "unified"
+    client = AsyncMongoClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+
+    try:
+        for section in SECTION_COLLECTIONS:
+            source = SectionLayout(db, section, layout=source_layout)
+            dest = SectionLayout(db, section, layout=target)
+
+            # 원본에서 이 섹션이 있는 문서만 읽습니다.
+            query = {section: {"$exists": True}} if source.unified else {}
+            projection = {"_id": 0, "std_no": 1, section: 1} if source.unified else {"_id": 0}
+
+            ops, total = [], 0
+            async for doc in source.collection.find(query, projection, batch_size=batch_size):
+                fields = source.extract(doc)
+                if not fields:
+                    continue
+                fields = {k: v for k, v in fields.items() if k != "std_no"}
+                ops.append(UpdateOne(
+                    {"std_no": doc["std_no"]},
+                    {"$set": {"std_no": doc["std_no"], **dest.wrap(fields)}},
+                    upsert=True,
+                ))
+                if len(ops) >= batch_size:
+                    total += await _flush(dest.collection, ops, dry_run)
+            total += await _flush(dest.collection, ops, dry_run)
+
+            if not dry_run:
+                await dest.collection.create_indexes(dest.indexes())
+            print(f"{section}: {source.collection.name} -> {dest.collection.name} {total}건{' (dry-run)' if dry_run else ''}")
+    finally:
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="split <-> unified 저장 레이아웃 마이그레이션")
+    parser.add_argument("--to", choices=("unified", "split"), required=True, help="옮겨 갈 레이아웃")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="쓰기 없이 옮길 건수만 출력")
+    args = parser.parse_args()
+    asyncio.run(migrate(args.to, args.batch_size, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from app.core.config import settings
+from app.utils import get_logger, dumps, loads
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # 선택 의존성: CACHE_BACKEND=redis 일 때만 필요
+    aioredis = None
+
+logger = get_logger("oasis.cache")
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float):
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """프로세스 내 LRU + TTL 캐시 (공유 백엔드의 로컬 대체용으로도 사용)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._store: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._store[key] = (time.monotonic() + ttl, value)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._store.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+# Redis 값 앞에 붙이는 형식 표시: 미리 만든 JSON(bytes)은 그대로, 나머지(dict/list)는 JSON으로 저장
+_RAW = b"b"
+_JSON = b"j"
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    여러 프로세스/인스턴스가 공유하는 Redis 캐시
+    값은 pickle 대신 JSON으로 저장합니다. (Redis에 쓸 수 있으면 코드를 실행할 수 있게 되지 않도록)
+    """
+
+    def __init__(self, url: str, prefix: str = "oasis:cache:"):
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND=redis 를 사용하려면 redis 패키지를 설치해야 합니다.")
+        self.client = aioredis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        kind, payload = raw[:1], raw[1:]
+        if kind == _RAW:
+            return payload
+        if kind == _JSON:
+            return loads(payload)
+        # 형식을 모르는 값(이전 버전이 pickle로 저장한 값 등)은 캐시 미스로 처리합니다.
+        return None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        if isinstance(value, (bytes, bytearray)):
+            raw = _RAW + bytes(value)
+        else:
+            raw = _JSON + dumps(value)
+        await self.client.set(self.prefix + key, raw, px=int(ttl * 1000))
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+
+class ResponseCache:
+    """
+    [Read-through Cache]
+    조회 결과를 캐시하고, 없으면 loader(DB 조회)를 호출해 채웁니다.
+    동기화(sync) 시에는 invalidate로 해당 학생의 항목을 지웁니다.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(section: str, std_no: str) -> str:
+        return f"{section}:{std_no}"
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning("캐시 조회 실패 (%s): %s", key, e)
+            value = None
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = await loader()
+        # 없는 데이터(None)는 캐시하지 않습니다. (동기화 직후 바로 보이도록)
+        if value is not None:
+            await self.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any):
+        if not self.enabled:
+            return
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning("캐시 저장 실패 (%s): %s", key, e)
+
+    async def invalidate(self, key: str):
+        if not self.enabled:
+            return
+        try:
+            await self.backend.delete(key)
+        except Exception as e:
+            logger.warning("캐시 삭제 실패 (%s): %s", key, e)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def _build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(
+    backend=_build_backend(),
+    ttl=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
+
+# 의존성 주입용 함수
+def get_response_cache() -> ResponseCache:
+    return response_cache
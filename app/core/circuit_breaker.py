@@ -0,0 +1,125 @@
+import time
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import BREAKER_STATE, BREAKER_EVENTS
+from app.core.state import StateBackend, get_state_backend
+from app.exceptions import UpstreamUnavailableError
+from app.utils import get_logger
+
+logger = get_logger("oasis.breaker")
+
+
+class CircuitBreaker:
+    """
+    [Circuit Breaker]
+    - closed: 정상. 연속 실패가 failure_threshold에 도달하면 open
+    - open: reset_timeout 동안 업스트림을 호출하지 않고 즉시 실패
+    - half_open: 시험 요청 1건만 통과시켜 성공하면 closed, 실패하면 다시 open
+    열린 시각과 시험 요청 자리는 StateBackend에 두어 모든 워커가 같은 상태를 봅니다. (연속 실패 수는 워커별)
+    공유 저장소에 접근할 수 없으면 이 워커가 마지막으로 연 시각으로 판단하고, 시험 요청은 막지 않습니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float, backend: StateBackend):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.backend = backend
+        self._key = f"breaker:{name}"
+        self._probe_key = f"breaker:{name}:probe"
+        # 이 워커가 마지막으로 본 상태 (메트릭, 재시도 판단용)
+        self.state = "closed"
+        self._failures = 0
+        self._local_opened_at: Optional[float] = None
+        # 결과 카운터 (/upstream/status 노출용, 메트릭은 BREAKER_EVENTS 카운터)
+        self.counters = {"success": 0, "failure": 0, "rejected": 0, "retry": 0}
+
+    def _count(self, event: str):
+        self.counters[event] += 1
+        BREAKER_EVENTS.inc(event)
+
+    async def _opened_at(self) -> Optional[float]:
+        """서킷이 열린 시각 (epoch), 닫혀 있으면 None"""
+        try:
+            raw = await self.backend.get(self._key)
+        except Exception as e:
+            logger.warning("%s 서킷 상태 조회 실패: %s", self.name, e)
+            return self._local_opened_at
+        return float(raw) if raw is not None else None
+
+    async def _claim_probe(self) -> bool:
+        # 시험 요청이 취소되어 결과가 기록되지 않은 경우를 대비해 자리는 reset_timeout 뒤에 풀립니다.
+        try:
+            return await self.backend.set_nx(self._probe_key, b"1", self.reset_timeout)
+        except Exception as e:
+            logger.warning("%s 서킷 시험 요청 자리 확보 실패: %s", self.name, e)
+            return True
+
+    async def is_open(self) -> bool:
+        """호출하지 않고 open(reset_timeout 전) 상태인지만 확인합니다."""
+        opened_at = await self._opened_at()
+        return opened_at is not None and time.time() - opened_at < self.reset_timeout
+
+    async def before_call(self):
+        """호출 가능 여부 확인. 차단 상태면 UpstreamUnavailableError를 던집니다."""
+        opened_at = await self._opened_at()
+        if opened_at is None:
+            self.state = "closed"
+            return
+
+        if time.time() - opened_at < self.reset_timeout:
+            self.state = "open"
+            self._count("rejected")
+            raise UpstreamUnavailableError(f"{self.name} circuit is open")
+
+        self.state = "half_open"
+        if not await self._claim_probe():
+            self._count("rejected")
+            raise UpstreamUnavailableError(f"{self.name} circuit is half-open")
+
+    async def record_success(self):
+        self._count("success")
+        self._failures = 0
+        if self.state == "closed":
+            return
+        logger.info("%s circuit closed", self.name)
+        self.state = "closed"
+        self._local_opened_at = None
+        try:
+            await self.backend.delete(self._key)
+            await self.backend.delete(self._probe_key)
+        except Exception as e:
+            logger.warning("%s 서킷 상태 기록 실패: %s", self.name, e)
+
+    async def record_failure(self):
+        self._count("failure")
+        self._failures += 1
+        if self.state != "half_open" and self._failures < self.failure_threshold:
+            return
+        if self.state != "open":
+            logger.warning("%s circuit opened (%d consecutive failures)", self.name, self._failures)
+        self.state = "open"
+        self._local_opened_at = time.time()
+        try:
+            # 호출이 끊겨 아무도 닫지 않아도 오래된 상태가 남지 않도록 TTL을 둡니다. (만료되면 closed)
+            await self.backend.set(self._key, str(self._local_opened_at).encode(), self.reset_timeout * 10)
+            await self.backend.delete(self._probe_key)
+        except Exception as e:
+            logger.warning("%s 서킷 상태 기록 실패: %s", self.name, e)
+
+    def record_retry(self):
+        self._count("retry")
+
+    def stats(self) -> dict:
+        return {"name": self.name, "state": self.state, "consecutive_failures": self._failures, **self.counters}
+
+
+oasis_breaker = CircuitBreaker(
+    name="oasis",
+    failure_threshold=settings.OASIS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.OASIS_BREAKER_RESET_SECONDS,
+    backend=get_state_backend(),
+)
+
+
+_STATE_VALUES = {"closed": 0.0, "half_open": 1.0, "open": 2.0}
+BREAKER_STATE.set_function(lambda: {(): _STATE_VALUES[oasis_breaker.state]})
@@ -9,9 +9,99 @@ class Settings(BaseSettings):
     
     MONGODB_URL: str
     MONGODB_DB_NAME: str = "jbnu-oasis"
+    MONGODB_CREATE_INDEXES: bool = True  # 시작 시 std_no/updated_at 인덱스 생성
+
+    # MongoDB 커넥션 풀 (워커 프로세스마다 별도 풀 -> 전체 연결 수 = 워커 수 x MAX_POOL_SIZE)
+    MONGODB_MAX_POOL_SIZE: int = 100                  # 최대 연결 수
+    MONGODB_MIN_POOL_SIZE: int = 5                    # 유지할 최소 연결 수 (시작 시 미리 연결)
+    MONGODB_MAX_IDLE_TIME_MS: int | None = None       # 유휴 연결 정리 시간 (None: 정리 안 함)
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 10000        # 풀이 가득 찼을 때 연결을 기다리는 최대 시간
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000   # 서버를 찾지 못하면 실패로 판단하는 시간
+    MONGODB_COMPRESSORS: str = ""                     # 예: "zstd,snappy,zlib" (zstd/snappy는 별도 패키지 필요)
+    MONGODB_READ_PREFERENCE: str = "primary"          # primary, primaryPreferred, secondaryPreferred ...
+    MONGODB_WRITE_CONCERN_W: str = ""                 # "", "1", "majority" ("": 서버 기본값)
+    MONGODB_WRITE_CONCERN_JOURNAL: bool | None = None
+
+    # 저장 레이아웃
+    # split: 섹션별 컬렉션(students, credits, courses) / unified: 학생당 문서 하나에 섹션별 필드
+    STORAGE_LAYOUT: str = "split"
+    MONGODB_UNIFIED_COLLECTION: str = "student_records"
+
+    # 여러 학생 일괄 조회 (POST /oasis/students/batch)
+    BATCH_READ_MAX_STUDENTS: int = 1000   # 한 요청에 넣을 수 있는 최대 학번 수
+    BATCH_READ_CURSOR_SIZE: int = 200     # MongoDB 커서 배치 크기 (스트리밍 중 메모리 상한)
     
+    # OASIS HTTP 커넥션 풀
+    OASIS_POOL_SIZE: int = 100                # 전체 최대 연결 수
+    OASIS_POOL_MAX_KEEPALIVE: int = 20        # 유지할 keep-alive 연결 수
+    OASIS_POOL_KEEPALIVE_EXPIRY: float = 30.0 # 유휴 연결 유지 시간(초)
+    OASIS_MAX_CONNECTIONS_PER_HOST: int = 50  # 호스트별 동시 요청 수
+
+    # OASIS 타임아웃 / 재시도 / 서킷 브레이커
+    OASIS_CONNECT_TIMEOUT: float = 5.0          # 연결 타임아웃(초)
+    OASIS_READ_TIMEOUT: float = 20.0            # 조회(XML) 응답 타임아웃(초)
+    OASIS_LOGIN_READ_TIMEOUT: float = 10.0      # 로그인/OTP 응답 타임아웃(초)
+    OASIS_FETCH_RETRIES: int = 2                # 조회 요청 재시도 횟수 (로그인은 재시도 안 함)
+    OASIS_RETRY_BACKOFF_BASE: float = 0.3       # 백오프 기본값(초), 시도마다 2배
+    OASIS_RETRY_BACKOFF_MAX: float = 3.0        # 백오프 상한(초)
+    OASIS_BREAKER_FAILURE_THRESHOLD: int = 5    # 연속 실패 시 서킷 open
+    OASIS_BREAKER_RESET_SECONDS: float = 30.0   # open 유지 시간(초) 후 시험 요청 허용
+
+    # OASIS 세션 저장소
+    OASIS_SESSION_TTL_SECONDS: float = 1800.0 # 마지막 사용 후 세션 유지 시간(초)
+    OASIS_MAX_SESSIONS: int = 1000            # 보관할 최대 세션 수 (초과 시 가장 오래 안 쓴 세션부터 폐기, 워커별 OasisClient도 이 수까지)
+
+    # 배치 동기화 작업
+    JOB_MAX_CONCURRENCY: int = 8               # 동시에 동기화할 최대 학생 수
+    JOB_MAX_ITEMS: int = 1000                  # 작업 하나에 넣을 수 있는 최대 학생 수
+    JOB_RETENTION_SECONDS: float = 3600.0      # 완료된 작업 결과 보관 시간(초)
+    JOB_MAX_PENDING_ITEMS: int = 5000          # 끝나지 않은 항목이 이보다 많으면 새 작업 거절 (429)
+    JOB_EVENTS_HEARTBEAT_SECONDS: float = 15.0 # 작업 이벤트(SSE) 연결 유지용 주석 전송 간격(초)
+    JOB_STATE_PUBLISH_INTERVAL_SECONDS: float = 0.5 # 작업 상태를 공유 저장소에 기록하는 최소 간격(초)
+    OASIS_RATE_LIMIT_PER_SECOND: float = 10.0  # OASIS로 보내는 초당 요청 수 (토큰 버킷)
+    OASIS_RATE_LIMIT_BURST: float = 20.0       # 순간 허용 요청 수 (버킷 크기)
+
+    # 백그라운드 재동기화 (세션이 살아 있는 학생 중 오래된 데이터를 주기적으로 갱신)
+    RESYNC_ENABLED: bool = False
+    RESYNC_INTERVAL_SECONDS: float = 60.0      # 대상 선정 주기(초)
+    RESYNC_JITTER: float = 0.2                 # 주기에 더할 무작위 비율 (워커끼리 동시에 돌지 않도록)
+    RESYNC_STALE_AFTER_SECONDS: float = 600.0  # updated_at이 이보다 오래되면 재동기화 대상
+    RESYNC_MAX_PER_TICK: int = 50              # 한 주기에 재동기화할 최대 학생 수
+    RESYNC_MAX_CONCURRENCY: int = 4            # 동시에 재동기화할 최대 학생 수
+    RESYNC_READ_WINDOW_SECONDS: float = 900.0  # 이 시간 안에 조회된 학생을 먼저 갱신
+    RESYNC_READ_TRACK_MAX: int = 10000         # 최근 조회 시각을 기억할 최대 학생 수
+
+    # 워커 간 공유 상태 (세션, 작업 상태, 재동기화 락, OASIS 요청 예산, 서킷 상태)
+    STATE_BACKEND: str = "memory"   # memory (단일 워커), redis (여러 워커/인스턴스)
+    STATE_REDIS_URL: str = "redis://localhost:6379/0"
+    # 워커 프로세스 수 (gunicorn이 시작할 때 --workers까지 반영한 값으로 덮어씀)
+    # 워커마다 따로 세는 동시 실행 수(JOB_MAX_CONCURRENCY, RESYNC_MAX_*)는 이 값으로 나눠 전체 합계를 지킵니다.
+    WEB_CONCURRENCY: int = 1
+
+    # 조회 캐시
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"   # memory, redis
+    CACHE_MAX_ENTRIES: int = 10000  # memory 백엔드 최대 항목 수 (초과 시 LRU 축출)
+    CACHE_TTL_SECONDS: float = 300.0
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # CPU 작업(XML 파싱, 행 검증) 실행기: 임계값을 넘는 큰 응답만 이벤트 루프 밖에서 처리
+    CPU_EXECUTOR: str = "thread"         # inline (항상 이벤트 루프), thread, process
+    CPU_EXECUTOR_WORKERS: int = 2        # 워커 프로세스(gunicorn 워커)마다 만드는 풀 크기
+    CPU_OFFLOAD_MIN_BYTES: int = 65536   # 이보다 큰 XML 응답만 풀에서 파싱
+    CPU_OFFLOAD_MIN_ROWS: int = 1000     # 이보다 많은 수강 과목 행만 풀에서 검증
+
+    # 저장 시 조회 응답 JSON(data_json)을 미리 만들어 두고, 조회 시 그대로 내보냄
+    STORE_RENDERED_JSON: bool = True
+
+    # 수강 과목 전체 내보내기 API(GET /oasis/export/courses) 관리자 토큰
+    # 모든 학생의 성적을 한 번에 내보내므로 비워 두면(기본값) 엔드포인트를 등록하지 않습니다.
+    # 값을 주면 Authorization: Bearer <토큰>을 보낸 요청만 허용합니다. (오프라인 내보내기는 app.cli.export_courses)
+    EXPORT_API_TOKEN: str = ""
+
     # Logging
     LOG_LEVEL: str = "DEBUG"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    LOG_FORMAT: str = "json"  # json, text
 
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8080"]
@@ -22,5 +112,9 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
+    def per_worker(self, total: int) -> int:
+        """워커 전체 합계로 정한 값 중 워커 하나의 몫 (최소 1)"""
+        return max(1, total // self.WEB_CONCURRENCY)
+
 
 settings = Settings()
@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+from app.core.config import settings
+from app.utils import get_logger
+
+logger = get_logger("oasis.cpu")
+
+T = TypeVar("T")
+
+
+class CpuExecutor:
+    """
+    [CPU Offload]
+    XML 파싱, 행 검증처럼 CPU만 쓰는 단계를 작업 크기에 따라 이벤트 루프 밖에서 실행합니다.
+    - inline:  항상 이벤트 루프에서 실행 (풀 없음)
+    - thread:  스레드 풀. GIL 때문에 처리량은 늘지 않지만 큰 응답을 파싱하는 동안에도 이벤트 루프가 틈틈이 돕니다.
+    - process: 프로세스 풀. 다른 코어에서 실행되지만 인자/결과를 pickle로 주고받으므로 작은 작업은 오히려 느립니다.
+    작업 종류(kind)별 임계값 이하인 작업은 모드와 관계없이 그 자리에서 실행합니다.
+    """
+
+    def __init__(self, mode: str, workers: int, thresholds: Dict[str, int]):
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(f"Unknown CPU_EXECUTOR: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.thresholds = thresholds
+        self._pool: Optional[Executor] = None
+        self.in_flight = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "inline"
+
+    def should_offload(self, kind: str, size: int) -> bool:
+        return self.enabled and size > self.thresholds[kind]
+
+    def _get_pool(self) -> Executor:
+        # lifespan 밖(스크립트 등)에서 호출되면 그 자리에서 생성합니다.
+        if self._pool is None:
+            if self.mode == "process":
+                # 워커 프로세스에는 이벤트 루프/로깅/DB 스레드가 있으므로 fork 대신 spawn으로 띄웁니다.
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="oasis-cpu")
+            logger.info("CPU 실행기 시작 (%s, %d개)", self.mode, self.workers)
+        return self._pool
+
+    def start(self):
+        """앱 시작 시 풀을 만들고, process 모드면 첫 요청이 프로세스 기동을 기다리지 않도록 미리 띄웁니다."""
+        if self.enabled:
+            pool = self._get_pool()
+            if self.mode == "process":
+                for _ in range(self.workers):
+                    pool.submit(int)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, kind: str, size: int, func: Callable[..., T], *args) -> T:
+        """
+        size가 kind의 임계값을 넘으면 풀에서, 아니면 바로 실행합니다.
+        풀이 손상되면(BrokenExecutor) 풀을 버리고 이번 작업은 바로 실행합니다.
+        process 모드에서 func와 인자/반환값은 pickle할 수 있어야 합니다. (모듈 최상위 함수, 기본 자료형/데이터클래스)
+        """
+        if not self.should_offload(kind, size):
+            return func(*args)
+
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_pool(), func, *args)
+        except BrokenExecutor:
+            # 풀 프로세스가 죽으면 풀 전체가 못 쓰게 되므로 버리고 다음 호출 때 새로 만듭니다.
+            # 이번 작업은 입력 문제가 아니므로 그 자리에서 다시 실행합니다. (함수 자체의 예외는 그대로 올라감)
+            logger.error("CPU 실행기 풀이 손상되어 다시 만들고, 이번 작업(%s)은 그 자리에서 실행합니다.", kind)
+            self.shutdown()
+        finally:
+            self.in_flight -= 1
+        return func(*args)
+
+    def queue_depth(self) -> int:
+        """풀에 넘겼지만 아직 실행을 시작하지 못한 작업 수 (추정: 진행 중 - 풀 크기)"""
+        return max(0, self.in_flight - self.workers)
+
+
+cpu_executor = CpuExecutor(
+    mode=settings.CPU_EXECUTOR,
+    workers=settings.CPU_EXECUTOR_WORKERS,
+    thresholds={
+        "xml": settings.CPU_OFFLOAD_MIN_BYTES,
+        "rows": settings.CPU_OFFLOAD_MIN_ROWS,
+    },
+)
+
+# 의존성 주입용 함수
+def get_cpu_executor() -> CpuExecutor:
+    return cpu_executor
@@ -0,0 +1,46 @@
+import asyncio
+import httpx
+from app.core.config import settings
+
+class HttpClient:
+    transport: httpx.AsyncBaseTransport = None
+    host_limits: dict[str, asyncio.Semaphore] = {}
+
+http_instance = HttpClient()
+
+def _build_transport() -> httpx.AsyncHTTPTransport:
+    limits = httpx.Limits(
+        max_connections=settings.OASIS_POOL_SIZE,
+        max_keepalive_connections=settings.OASIS_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.OASIS_POOL_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncHTTPTransport(limits=limits, retries=0)
+
+async def open_http_client():
+    """앱 수명 동안 공유할 커넥션 풀(keep-alive)을 생성합니다."""
+    http_instance.transport = _build_transport()
+    http_instance.host_limits = {}
+    print("✅ OASIS HTTP Pool Ready!")
+
+async def close_http_client():
+    if http_instance.transport:
+        await http_instance.transport.aclose()
+        http_instance.transport = None
+        print("❌ OASIS HTTP Pool Closed!")
+
+def get_http_transport() -> httpx.AsyncBaseTransport:
+    """
+    공유 트랜스포트를 반환합니다.
+    lifespan 밖(스크립트 등)에서 호출되면 그 자리에서 생성합니다.
+    """
+    if http_instance.transport is None:
+        http_instance.transport = _build_transport()
+    return http_instance.transport
+
+def get_host_limit(host: str) -> asyncio.Semaphore:
+    """호스트별 동시 연결 수 제한용 세마포어"""
+    sem = http_instance.host_limits.get(host)
+    if sem is None:
+        sem = asyncio.Semaphore(settings.OASIS_MAX_CONNECTIONS_PER_HOST)
+        http_instance.host_limits[host] = sem
+    return sem
@@ -0,0 +1,204 @@
+import time
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from app.core.cpu_executor import cpu_executor
+
+# Prometheus 텍스트 포맷(0.0.4)으로 노출하는 최소한의 메트릭 구현입니다.
+# 핫패스 비용을 줄이기 위해 라벨은 위치 인자(tuple)로 받고 dict 조회 한 번으로 기록합니다.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._function: Optional[Callable[[], Dict[tuple, float]]] = None
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set_function(self, function: Callable[[], Dict[tuple, float]]):
+        """스크레이프 시점에 값을 계산하는 콜백 ({라벨 tuple: 값})"""
+        self._function = function
+
+    def _samples(self):
+        values = dict(self._values)
+        if self._function is not None:
+            try:
+                values.update(self._function())
+            except Exception:
+                pass
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[tuple, List[int]] = {}
+        self._sums: Dict[tuple, float] = {}
+
+    def observe(self, value: float, *labels: str):
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _samples(self):
+        lines = []
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            base = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{base} {self._sums[labels]}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# --- HTTP (라우트 단위) ---
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests handled", ("route", "method", "status"))
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("route", "method"))
+
+# --- OASIS 업스트림 ---
+UPSTREAM_REQUESTS = registry.counter(
+    "oasis_upstream_requests_total", "OASIS upstream calls", ("endpoint", "result"))
+UPSTREAM_LATENCY = registry.histogram(
+    "oasis_upstream_duration_seconds", "OASIS upstream call latency (incl. streaming parse)", ("endpoint",))
+UPSTREAM_IN_FLIGHT = registry.gauge(
+    "oasis_upstream_in_flight", "OASIS upstream calls currently in flight")
+BREAKER_STATE = registry.gauge(
+    "oasis_circuit_state", "OASIS circuit breaker state (0=closed, 1=half_open, 2=open)")
+BREAKER_EVENTS = registry.counter(
+    "oasis_circuit_events_total", "OASIS circuit breaker outcomes", ("event",))
+
+# --- 동기화 단계 ---
+CRAWLER_LATENCY = registry.histogram(
+    "crawler_duration_seconds", "Crawler run latency", ("crawler", "result"))
+STAGE_LATENCY = registry.histogram(
+    "sync_stage_duration_seconds", "Latency of sync stages", ("stage", "target"))
+RESYNC_ITEMS = registry.counter(
+    "oasis_resync_items_total", "Background re-sync outcomes", ("result",))
+
+# --- 리소스 ---
+THREADPOOL_QUEUE = registry.gauge(
+    "threadpool_queue_depth", "Pending work items in executors", ("executor",))
+MONGO_POOL = registry.gauge(
+    "mongo_pool_connections", "MongoDB pool connections", ("state",))
+
+
+def _executor_queue_depth() -> Dict[tuple, float]:
+    executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    queue = getattr(executor, "_work_queue", None)
+    return {
+        ("default",): float(queue.qsize()) if queue is not None else 0.0,
+        ("cpu",): float(cpu_executor.queue_depth()),
+    }
+
+
+THREADPOOL_QUEUE.set_function(_executor_queue_depth)
@@ -1,5 +1,8 @@
+import asyncio
 from pymongo import AsyncMongoClient
+from pymongo.monitoring import ConnectionPoolListener
 from app.core.config import settings
+from app.core.metrics import MONGO_POOL
 
 class MongoDB:
     client: AsyncMongoClient = None
@@ -7,20 +10,118 @@ class MongoDB:
 
 db_instance = MongoDB()
 
+
+class PoolStatsListener(ConnectionPoolListener):
+    """커넥션 풀 이벤트로 열린/사용 중/대기 중 연결 수를 집계합니다."""
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.waiting = 0
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+
+    def connection_created(self, event):
+        self.open += 1
+
+    def connection_closed(self, event):
+        self.open -= 1
+
+    def connection_check_out_started(self, event):
+        self.waiting += 1
+
+    def connection_check_out_failed(self, event):
+        self.waiting -= 1
+
+    def connection_checked_out(self, event):
+        self.waiting -= 1
+        self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def stats(self) -> dict:
+        return {"open": self.open, "checked_out": self.checked_out, "waiting": self.waiting}
+
+
+pool_stats = PoolStatsListener()
+MONGO_POOL.set_function(lambda: {(state,): float(value) for state, value in pool_stats.stats().items()})
+
+def _client_options() -> dict:
+    """Settings의 풀/압축/읽기·쓰기 옵션을 AsyncMongoClient 인자로 변환"""
+    options = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
+        "event_listeners": [pool_stats],
+    }
+    if settings.MONGODB_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGODB_MAX_IDLE_TIME_MS
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    if settings.MONGODB_WRITE_CONCERN_W:
+        w = settings.MONGODB_WRITE_CONCERN_W
+        options["w"] = int(w) if w.isdigit() else w
+    if settings.MONGODB_WRITE_CONCERN_JOURNAL is not None:
+        options["journal"] = settings.MONGODB_WRITE_CONCERN_JOURNAL
+    return options
+
+
 async def connect_to_mongo():
-    db_instance.client = AsyncMongoClient(settings.MONGODB_URL)
+    """
+    연결 후 ping으로 확인하고, 최소 연결 수(MONGODB_MIN_POOL_SIZE)만큼 풀을 미리 채웁니다.
+    DB에 연결할 수 없으면 예외를 그대로 올려 앱 시작을 중단합니다.
+    """
+    db_instance.client = AsyncMongoClient(settings.MONGODB_URL, **_client_options())
     db_instance.db = db_instance.client[settings.MONGODB_DB_NAME]
     try:
         await db_instance.client.admin.command('ping')
-        print("✅ MongoDB Connected! (PyMongo Native Async)")
+        # 동시에 ping을 보내 첫 요청들이 연결 생성을 기다리지 않도록 풀을 데워 둡니다.
+        await asyncio.gather(*(
+            db_instance.client.admin.command('ping')
+            for _ in range(settings.MONGODB_MIN_POOL_SIZE)
+        ))
     except Exception as e:
         print(f"❌ MongoDB Connection Error: {e}")
+        await close_mongo_connection()
+        raise RuntimeError(f"MongoDB에 연결할 수 없습니다: {e}") from e
+    print(f"✅ MongoDB Connected! (PyMongo Native Async, pool: {pool_stats.stats()})")
 
 async def close_mongo_connection():
     if db_instance.client:
-        db_instance.client.close()
+        await db_instance.client.close()
+        db_instance.client = None
         print("❌ MongoDB Closed!")
 
+async def mongo_health(timeout: float = 2.0) -> dict:
+    """readiness 확인용: ping 결과와 커넥션 풀 상태"""
+    ok = False
+    error = None
+    if db_instance.client is not None:
+        try:
+            await asyncio.wait_for(db_instance.client.admin.command('ping'), timeout)
+            ok = True
+        except Exception as e:
+            error = str(e) or type(e).__name__
+    else:
+        error = "not connected"
+
+    return {
+        "ok": ok,
+        "error": error,
+        "pool": {
+            **pool_stats.stats(),
+            "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+            "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        },
+    }
+
 # 의존성 주입용 함수
 def get_mongo_db():
     return db_instance.db
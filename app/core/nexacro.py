@@ -0,0 +1,111 @@
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+NEXACRO_NS = "{http://www.nexacroplatform.com/platform/dataset}"
+
+_TAG_NAMES = ("Parameter", "Dataset", "Column", "ConstColumn", "Rows", "Row", "OrgRow", "Col")
+# 네임스페이스가 붙은 태그와 붙지 않은 태그를 모두 한 번의 dict 조회로 판별합니다.
+_TAGS = {f"{NEXACRO_NS}{name}": name for name in _TAG_NAMES}
+_TAGS.update({name: name for name in _TAG_NAMES})
+
+
+@dataclass(slots=True)
+class NexacroDataset:
+    id: str
+    # 컬럼 ID -> ColumnInfo 속성 (type, size, ConstColumn이면 value까지)
+    columns: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    rows: List[Dict[str, Optional[str]]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class NexacroResult:
+    parameters: Dict[str, Optional[str]] = field(default_factory=dict)
+    datasets: Dict[str, NexacroDataset] = field(default_factory=dict)
+
+    def last_rows(self) -> Optional[List[Dict[str, Optional[str]]]]:
+        """마지막 Dataset의 Row 목록 (Dataset이 없으면 None)"""
+        if not self.datasets:
+            return None
+        return next(reversed(self.datasets.values())).rows
+
+
+class NexacroParser:
+    """
+    넥사크로 XML 응답을 한 번의 순회로 파싱하는 증분 파서입니다.
+    바이트 청크를 feed()로 밀어 넣으면 처리된 Row는 즉시 메모리에서 해제됩니다.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._result = NexacroResult()
+        self._dataset: Optional[NexacroDataset] = None
+        self._rows_elem: Optional[ET.Element] = None
+        self._row: Optional[Dict[str, Optional[str]]] = None
+        # <OrgRow>(수정 전 원본 값) 안에 있는 동안은 Col을 현재 Row에 넣지 않습니다.
+        self._org_depth = 0
+
+    def feed(self, chunk: bytes | str):
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> NexacroResult:
+        self._parser.close()
+        self._drain()
+        return self._result
+
+    def _drain(self):
+        for event, elem in self._parser.read_events():
+            tag = _TAGS.get(elem.tag)
+            if tag is None:
+                continue
+
+            if event == "start":
+                if tag == "Row":
+                    self._row = {}
+                elif tag == "OrgRow":
+                    self._org_depth += 1
+                elif tag == "Rows":
+                    self._rows_elem = elem
+                elif tag == "Dataset":
+                    self._dataset = NexacroDataset(elem.get("id", ""))
+                    self._result.datasets[self._dataset.id] = self._dataset
+                continue
+
+            # event == "end": 텍스트와 속성이 모두 채워진 시점
+            if tag == "Col":
+                if self._row is not None and not self._org_depth:
+                    self._row[elem.get("id")] = elem.text
+            elif tag == "OrgRow":
+                self._org_depth -= 1
+            elif tag == "Row":
+                if self._dataset is not None:
+                    self._dataset.rows.append(self._row)
+                self._row = None
+                # 처리가 끝난 Row 노드를 부모에서 떼어내 메모리를 즉시 반환
+                if self._rows_elem is not None:
+                    self._rows_elem.clear()
+            elif tag in ("Column", "ConstColumn"):
+                if self._dataset is not None:
+                    self._dataset.columns[elem.get("id")] = {
+                        k: v for k, v in elem.attrib.items() if k != "id"
+                    }
+            elif tag == "Parameter":
+                self._result.parameters[elem.get("id")] = elem.text or ""
+            elif tag == "Dataset":
+                self._dataset = None
+                self._rows_elem = None
+                elem.clear()
+
+
+# 완성된 문서도 이 크기로 나눠 feed합니다. (처리한 Row를 바로 해제하고,
+# 스레드 풀에서 실행될 때 expat이 문서 전체를 파싱하는 동안 GIL을 붙잡고 있지 않도록)
+FEED_CHUNK_SIZE = 65536
+
+
+def parse_nexacro_xml(xml: bytes | str) -> NexacroResult:
+    """완성된 XML 문서(bytes/str)를 파싱"""
+    parser = NexacroParser()
+    for offset in range(0, len(xml), FEED_CHUNK_SIZE):
+        parser.feed(xml[offset:offset + FEED_CHUNK_SIZE])
+    return parser.close()
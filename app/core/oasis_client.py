@@ -1,13 +1,74 @@
-import requests
+import time
+import random
 import asyncio
-import xml.etree.ElementTree as ET
-from functools import partial
+import httpx
+from contextlib import contextmanager
 from app.utils import get_logger
 from typing import List, Dict, Optional
 from app.core import constants as const
+from app.core.config import settings
+from app.core.circuit_breaker import oasis_breaker
+from app.core.metrics import UPSTREAM_REQUESTS, UPSTREAM_LATENCY, UPSTREAM_IN_FLIGHT, STAGE_LATENCY
+from app.exceptions import UpstreamUnavailableError
+from app.core.http_client import get_http_transport, get_host_limit
+from app.core.cpu_executor import cpu_executor
+from app.core.nexacro import NexacroParser, NexacroResult, parse_nexacro_xml
 
 logger = get_logger("oasis.client")
 
+# 진행 중인 동일 요청(URL, 세션 쿠키가 든 페이로드)을 하나로 합치기 위한 테이블
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+# 로그인 단계는 OTP 검증이 포함되어 있어 재시도하지 않고, 별도 타임아웃을 씁니다.
+_LOGIN_URLS = {const.LOGIN_URL, const.LOGIN_OTP_TRIGGER, const.LOGIN_OTP_CHECK}
+
+
+def _timeout_for(url: str) -> httpx.Timeout:
+    """엔드포인트별 connect/read 타임아웃"""
+    read = settings.OASIS_LOGIN_READ_TIMEOUT if url in _LOGIN_URLS else settings.OASIS_READ_TIMEOUT
+    return httpx.Timeout(read, connect=settings.OASIS_CONNECT_TIMEOUT)
+
+
+def _backoff(attempt: int) -> float:
+    """지수 백오프 + Full Jitter"""
+    cap = min(settings.OASIS_RETRY_BACKOFF_MAX, settings.OASIS_RETRY_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+# 메트릭 라벨용 URL -> 상수 이름 (같은 URL을 공유하면 먼저 정의된 이름 사용)
+_ENDPOINT_NAMES: Dict[str, str] = {}
+for _name, _value in vars(const).items():
+    if _name.isupper() and isinstance(_value, str) and _value.startswith(const.BASE_URL + "/"):
+        _ENDPOINT_NAMES.setdefault(_value, _name)
+
+
+def _endpoint_name(url: str) -> str:
+    return _ENDPOINT_NAMES.get(url, "OTHER")
+
+
+async def _before_call(endpoint: str):
+    try:
+        await oasis_breaker.before_call()
+    except UpstreamUnavailableError:
+        UPSTREAM_REQUESTS.inc(endpoint, "rejected")
+        raise
+
+
+@contextmanager
+def _track_upstream(endpoint: str):
+    """진행 중 요청 수와 응답 시간을 기록합니다."""
+    UPSTREAM_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        UPSTREAM_IN_FLIGHT.dec()
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint)
+
+
+class _UpstreamServerError(Exception):
+    """재시도 대상인 5xx 응답"""
+
 class OasisClient:
     """
     [Facade Pattern]
@@ -15,14 +76,53 @@ class OasisClient:
     단 하나의 메서드(authenticate)로 캡슐화합니다.
     """
     def __init__(self):
-        self.session = requests.Session()
         self.headers = const.LOGIN_HEADER
-        self.session.headers.update(self.headers)
+        # 커넥션 풀(트랜스포트)은 앱 전체가 공유하고, 쿠키 저장소만 사용자별로 분리합니다.
+        # 주의: aclose()를 호출하면 공유 트랜스포트까지 닫히므로 호출하지 않습니다.
+        self.session = httpx.AsyncClient(
+            transport=get_http_transport(),
+            headers=self.headers,
+            timeout=None,
+            follow_redirects=True,
+        )
+        # 업스트림이 세션 만료 신호(로그인 페이지 리다이렉트, 401/403)를 보내면 True
+        self.expired = False
+
+    def is_alive(self) -> bool:
+        """SSO 쿠키가 있고 만료 신호를 받지 않은 세션인지 확인"""
+        return not self.expired and "JSESSIONIDSSO" in self.get_cookies()
+
+    def restore_cookies(self, cookies: dict):
+        """로그인 시 발급받은 쿠키를 세션에 복구"""
+        self.session.cookies.update(cookies)
+
+    def get_cookies(self) -> dict:
+        """현재 세션의 쿠키를 {이름: 값} 형태로 반환"""
+        return {cookie.name: cookie.value for cookie in self.session.cookies.jar}
 
     async def _async_post(self, url, **kwargs):
-        """requests.post를 비동기 스레드에서 실행"""
-        func = partial(self.session.post, url, **kwargs)
-        return await asyncio.to_thread(func)
+        """
+        공유 커넥션 풀을 통해 비동기로 POST 요청을 보냅니다. (재시도 없음)
+        타임아웃/연결 오류/5xx는 서킷 브레이커에 기록하고 UpstreamUnavailableError로 올립니다.
+        """
+        endpoint = _endpoint_name(url)
+        await _before_call(endpoint)
+        try:
+            async with get_host_limit(httpx.URL(url).host):
+                with _track_upstream(endpoint):
+                    res = await self.session.post(url, timeout=_timeout_for(url), **kwargs)
+        except httpx.TransportError as e:
+            UPSTREAM_REQUESTS.inc(endpoint, "transport_error")
+            await oasis_breaker.record_failure()
+            raise UpstreamUnavailableError() from e
+
+        if res.status_code >= 500:
+            UPSTREAM_REQUESTS.inc(endpoint, "server_error")
+            await oasis_breaker.record_failure()
+            raise UpstreamUnavailableError()
+        UPSTREAM_REQUESTS.inc(endpoint, "ok" if res.status_code == 200 else "client_error")
+        await oasis_breaker.record_success()
+        return res
 
     async def authenticate(self, user_id: str, user_pw: str, otp: str) -> dict | None:
         """
@@ -37,41 +137,129 @@ class OasisClient:
             }
             res1 = await self._async_post(const.LOGIN_URL, json=payload_login)
             if res1.status_code != 200:
-                logger.warning(f"Step 1 Failed: {res1.status_code}")
+                logger.warning("Step 1 Failed: %s", res1.status_code)
                 return None
 
             # --- [Step 2] OTP 프로세스 트리거 (서버 상태 변경용) ---
             # 구글 OTP라도 서버 내부 플래그를 위해 호출해주는 게 안전합니다.
             res2 = await self._async_post(const.LOGIN_OTP_TRIGGER, data={"userId": user_id})
             if res2.status_code != 200:
-                logger.warning(f"Step 2 Failed: {res2.status_code}")
+                logger.warning("Step 2 Failed: %s", res2.status_code)
                 return None
 
             # --- [Step 3] OTP 코드 검증 ---
             res3 = await self._async_post(const.LOGIN_OTP_CHECK, data={"userCode": otp})
             
             # 쿠키 확인 (성공 시 JSESSIONIDSSO 발급됨)
-            if "JSESSIONIDSSO" in self.session.cookies:
-                logger.info(f"User {user_id}: Authentication successful")
-                return self.session.cookies.get_dict()
+            cookies = self.get_cookies()
+            if "JSESSIONIDSSO" in cookies:
+                logger.info("User %s: Authentication successful", user_id)
+                return cookies
             else:
-                logger.warning(f"Step 3 Failed: Invalid OTP or Session")
+                logger.warning("Step 3 Failed: Invalid OTP or Session")
                 return None
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
-            logger.error(f"Authentication Error: {e}")
+            logger.error("Authentication Error: %s", e)
             return None
 
     async def fetch_xml(self, url: str, xml_payload: str) -> Optional[List[Dict[str, str]]]:
+        """마지막 Dataset의 Row 목록만 반환하는 단축 메서드"""
+        result = await self.fetch_nexacro(url, xml_payload)
+        return result.last_rows() if result else None
+
+    async def fetch_nexacro(self, url: str, xml_payload: str) -> Optional[NexacroResult]:
+        """
+        [Request Coalescing]
+        같은 URL/페이로드로 이미 요청 중이면 새 요청을 보내지 않고 진행 중인 결과를 함께 기다립니다.
+        페이로드에는 build_payload가 세션 쿠키를 넣으므로 다른 세션의 요청과 합쳐지지 않습니다.
+        rType이 다른 요청(학점 B1, 수강 과목 C)은 같은 URL이어도 응답이 달라 합치지 않습니다.
+        반환된 결과는 여러 호출자가 공유하므로 수정하지 말고 슬라이싱/복사해서 사용해야 합니다.
+        """
+        key = (url, xml_payload)
+        pending = _inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_nexacro(url, xml_payload))
+            _inflight[key] = pending
+            pending.add_done_callback(lambda _: _inflight.pop(key, None))
+        else:
+            logger.debug("중복 요청 병합: %s", url)
+
+        # 한 호출자가 취소되어도 공유 요청은 계속 진행되도록 shield 처리
+        return await asyncio.shield(pending)
+
+    async def _fetch_nexacro(self, url: str, xml_payload: str) -> Optional[NexacroResult]:
+        """
+        조회 요청은 멱등이므로 타임아웃/연결 오류/5xx에 한해 지터 백오프로 재시도합니다.
+        재시도를 모두 소진하거나 서킷이 열려 있으면 UpstreamUnavailableError를 던집니다.
+        """
+        endpoint = _endpoint_name(url)
+        retries = settings.OASIS_FETCH_RETRIES
+        for attempt in range(retries + 1):
+            await _before_call(endpoint)
+            try:
+                with _track_upstream(endpoint):
+                    result = await self._stream_nexacro(url, xml_payload, endpoint)
+            except (httpx.TransportError, _UpstreamServerError) as e:
+                UPSTREAM_REQUESTS.inc(endpoint, "server_error" if isinstance(e, _UpstreamServerError) else "transport_error")
+                await oasis_breaker.record_failure()
+                if attempt >= retries or oasis_breaker.state == "open":
+                    logger.error("XML 데이터 요청 실패 (%d회 시도): %r", attempt + 1, e)
+                    raise UpstreamUnavailableError() from e
+                oasis_breaker.record_retry()
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            except Exception as e:
+                # 응답은 받았지만 파싱할 수 없는 경우 (업스트림 장애로 보지 않음)
+                UPSTREAM_REQUESTS.inc(endpoint, "parse_error")
+                await oasis_breaker.record_success()
+                logger.error("XML 데이터 요청 실패: %s", e)
+                return None
+
+            UPSTREAM_REQUESTS.inc(endpoint, "ok" if result is not None else "client_error")
+            await oasis_breaker.record_success()
+            return result
+
+    async def _stream_nexacro(self, url: str, xml_payload: str, endpoint: str) -> Optional[NexacroResult]:
+        """
+        응답 본문을 문자열로 만들지 않고 바이트 그대로 파싱합니다.
+        본문을 읽기 전에 Content-Length로 경로를 정합니다.
+        - CPU_OFFLOAD_MIN_BYTES보다 크고 CPU_EXECUTOR가 inline이 아니면: 본문을 모두 받은 뒤 CPU 실행기에서 파싱
+        - 그 밖(작은 응답, 길이를 모르는 chunked 응답, inline): 청크가 도착하는 대로 이벤트 루프에서 증분 파싱
+        """
         headers = {"Content-Type": "text/xml"}
-        try:
-            res = await self._async_post(url, data=xml_payload, headers=headers)
-            if res.status_code == 200:
-                return self._parse_nexacro_xml(res.text)
-            return None
-        except Exception as e:
-            logger.error(f"XML 데이터 요청 실패: {e}")
-            return None
+        async with get_host_limit(httpx.URL(url).host):
+            async with self.session.stream(
+                "POST", url, content=xml_payload, headers=headers, timeout=_timeout_for(url)
+            ) as res:
+                if res.status_code >= 500:
+                    raise _UpstreamServerError(f"HTTP {res.status_code}")
+                if res.history or res.status_code in (401, 403):
+                    logger.warning("세션 만료 감지: %s", url)
+                    self.expired = True
+                    return None
+                if res.status_code != 200:
+                    return None
+                length = res.headers.get("content-length")
+                if length and length.isdigit() and cpu_executor.should_offload("xml", int(length)):
+                    body = await res.aread()
+                    start = time.perf_counter()
+                    result = await cpu_executor.run("xml", len(body), parse_nexacro_xml, body)
+                    STAGE_LATENCY.observe(time.perf_counter() - start, "xml_parse", endpoint)
+                    return result
+                # 네트워크 대기와 섞여 있으므로 파싱에 쓴 CPU 시간만 따로 합산합니다.
+                parser = NexacroParser()
+                parse_time = 0.0
+                async for chunk in res.aiter_bytes():
+                    start = time.perf_counter()
+                    parser.feed(chunk)
+                    parse_time += time.perf_counter() - start
+                start = time.perf_counter()
+                result = parser.close()
+                STAGE_LATENCY.observe(parse_time + time.perf_counter() - start, "xml_parse", endpoint)
+                return result
 
     def build_payload(self, std_no: str, extra_params: dict | None) -> str:
         """
@@ -86,7 +274,7 @@ class OasisClient:
         }
         
         # 2. 쿠키 추가
-        params.update(self.session.cookies.get_dict())
+        params.update(self.get_cookies())
         
         # 3. 추가 파라미터 병합 (사용자가 넘긴 값으로 덮어씀)
         if extra_params:
@@ -106,57 +294,15 @@ class OasisClient:
             </Parameters>
         </Root>"""
 
-    def _parse_nexacro_xml(self, xml_string: str) -> List[Dict[str, str]]:
+    def _parse_nexacro_xml(self, xml: bytes | str) -> NexacroResult:
         """
-        어떤 넥사크로 XML 응답이든 파싱해서 Dictionary 형태로 반환합니다.
-        구조: {
-            "Parameters": {파라미터들...},
-            "Datasets": {
-                "DS_성적": [DataFrame],
-                "DS_시간표": [DataFrame],
+        어떤 넥사크로 XML 응답이든 파싱해서 반환합니다.
+        구조: NexacroResult(
+            parameters={파라미터들...},
+            datasets={
+                "DS_성적": NexacroDataset(columns={...}, rows=[...]),
                 ...
             }
-        }
+        )
         """
-        root = ET.fromstring(xml_string)
-        
-        # 2. 네임스페이스 제거 로직
-        for el in root.iter():
-            if '}' in el.tag:
-                el.tag = el.tag.split('}', 1)[1]
-                
-        # result = {
-        #     "Parameters": {},
-        #     "Datasets": {}
-        # }
-        
-        # params_node = root.find("Parameters")
-        # if params_node is not None:
-        #     for param in params_node.findall("Parameter"):
-        #         p_id = param.get("id")
-        #         p_val = param.text if param.text else ""
-        #         result["Parameters"][p_id] = p_val
-        
-        for dataset in root.findall("Dataset"):
-            # ds_id = dataset.get("id")
-            
-            row_list = []
-            rows = dataset.find("Rows")
-            
-            if rows is not None:
-                for row in rows.findall("Row"):
-                    row_data = {}
-                    for col in row.findall("Col"):
-                        col_id = col.get("id")
-                        col_val = col.text
-                        row_data[col_id] = col_val
-                    row_list.append(row_data)
-            
-        return row_list
-    
-            # if row_list:
-            #     result["Datasets"][ds_id] = pd.DataFrame(row_list)
-            # else:
-            #     result["Datasets"][ds_id] = pd.DataFrame()
-        
-                
\ No newline at end of file
+        return parse_nexacro_xml(xml)
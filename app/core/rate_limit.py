@@ -0,0 +1,62 @@
+import time
+import asyncio
+from typing import Optional
+from app.core.state import StateBackend
+from app.utils import get_logger
+
+logger = get_logger("oasis.rate_limit")
+
+
+class TokenBucket:
+    """
+    [Token Bucket]
+    초당 rate개씩 토큰이 채워지고 최대 capacity개까지 쌓입니다.
+    acquire()는 토큰이 모자라면 채워질 때까지 기다립니다.
+    backend를 주면 버킷을 StateBackend(key)에 두어 모든 워커가 한 예산(rate, capacity)을 나눠 씁니다.
+    공유 저장소에 접근할 수 없으면 워커 수(local_share)로 나눈 몫만큼 이 워커 안에서 제한합니다.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        backend: Optional[StateBackend] = None,
+        key: str = "rate:oasis",
+        local_share: int = 1,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.backend = backend
+        self.key = key
+        self._local_rate = rate / local_share
+        self._local_capacity = max(1.0, capacity / local_share)
+        self._tokens = self._local_capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        tokens = min(tokens, self.capacity)
+        if self.backend is not None:
+            try:
+                wait = await self.backend.reserve_tokens(self.key, tokens, self.rate, self.capacity)
+            except Exception as e:
+                logger.warning("공유 토큰 버킷 사용 실패, 워커 몫으로 제한합니다: %s", e)
+            else:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                return
+        await self._acquire_local(min(tokens, self._local_capacity))
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._local_capacity, self._tokens + (now - self._updated) * self._local_rate)
+        self._updated = now
+
+    async def _acquire_local(self, tokens: float):
+        # 요청 순서대로 토큰을 받도록 lock 안에서 대기합니다. (FIFO)
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self._local_rate)
+                self._refill()
+            self._tokens -= tokens
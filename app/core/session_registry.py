@@ -0,0 +1,140 @@
+import json
+import time
+import secrets
+from collections import OrderedDict
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.oasis_client import OasisClient
+from app.core.state import StateBackend, get_state_backend
+from app.utils import get_logger, dumps
+
+logger = get_logger("oasis.sessions")
+
+
+class SessionRegistry:
+    """
+    로그인된 OASIS 세션을 불투명 토큰으로 보관하는 서버 측 세션 저장소입니다.
+    StateBackend에 저장하므로 STATE_BACKEND=redis 이면 모든 워커 프로세스가 같은 토큰을 사용할 수 있습니다.
+    - session:{token}          세션 기록(쿠키, 마지막 사용 시각), 마지막 사용 후 ttl 초가 지나면 만료
+    - session:{token}:std_nos  이 세션으로 동기화한 학번 집합 (원소 추가라 동시에 기록해도 잃지 않음)
+    - sessions                 마지막 사용 시각 순 색인. max_sessions개를 넘으면 가장 오래 안 쓴 세션부터 폐기(LRU)
+    워커마다 최근에 쓴 OasisClient도 max_sessions개까지 LRU로 들고 있고, 없으면 저장된 쿠키로 새로 만듭니다.
+    """
+
+    INDEX_KEY = "sessions"
+
+    def __init__(self, backend: StateBackend, ttl: float, max_sessions: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._clients: OrderedDict[str, OasisClient] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return f"session:{token}"
+
+    @staticmethod
+    def _std_nos_key(token: str) -> str:
+        return f"session:{token}:std_nos"
+
+    async def _load(self, token: str) -> Optional[dict]:
+        raw = await self.backend.get(self._key(token))
+        return json.loads(raw) if raw is not None else None
+
+    async def _save(self, token: str, record: dict):
+        """세션 기록을 저장하고 색인에서 최근 사용으로 올립니다. (한도를 넘은 세션은 폐기)"""
+        await self.backend.set(self._key(token), dumps(record), self.ttl)
+        evicted = await self.backend.zadd_bounded(self.INDEX_KEY, token, record["last_used"], self.max_sessions)
+        for old in evicted:
+            logger.info("세션 한도(%d) 초과로 가장 오래 안 쓴 세션 폐기", self.max_sessions)
+            await self._drop(old)
+
+    def _remember(self, token: str, client: OasisClient):
+        self._clients[token] = client
+        self._clients.move_to_end(token)
+        while len(self._clients) > self.max_sessions:
+            # 로컬 객체만 버립니다. 세션 자체는 백엔드에 남아 있어 다음 사용 때 쿠키로 복구됩니다.
+            self._clients.popitem(last=False)
+
+    async def _drop(self, token: str) -> bool:
+        self._clients.pop(token, None)
+        await self.backend.delete(self._std_nos_key(token))
+        return await self.backend.delete(self._key(token))
+
+    async def create(self, client: OasisClient) -> str:
+        token = secrets.token_urlsafe(32)
+        await self._save(token, {"cookies": client.get_cookies(), "last_used": time.time()})
+        self._remember(token, client)
+        return token
+
+    async def get(self, token: str) -> Optional[OasisClient]:
+        """유효한 세션이면 OasisClient를, 만료/죽은 세션이면 None을 반환"""
+        return await self._resolve(token, touch=True)
+
+    async def peek(self, token: str) -> Optional[OasisClient]:
+        """
+        get()과 같지만 마지막 사용 시각(TTL)을 갱신하지 않습니다.
+        백그라운드 작업이 세션을 쓰는 것만으로 사용자 세션의 TTL이 늘어나지 않게 합니다.
+        """
+        return await self._resolve(token, touch=False)
+
+    async def _resolve(self, token: str, touch: bool) -> Optional[OasisClient]:
+        record = await self._load(token)
+        if record is None:
+            # 만료됐거나 다른 워커에서 폐기된 세션
+            self._clients.pop(token, None)
+            return None
+
+        client = self._clients.get(token)
+        if client is None:
+            client = OasisClient()
+            client.restore_cookies(record["cookies"])
+        if not client.is_alive():
+            await self.invalidate(token)
+            return None
+
+        if touch:
+            # 업스트림이 쿠키를 새로 발급했을 수 있으므로 함께 저장합니다.
+            record["cookies"] = client.get_cookies()
+            record["last_used"] = time.time()
+            await self._save(token, record)
+            await self.backend.expire(self._std_nos_key(token), self.ttl)
+        self._remember(token, client)
+        return client
+
+    async def bind(self, token: str, std_no: str):
+        """세션으로 std_no 동기화에 성공했음을 기록합니다. (집합에 원소 추가 한 번이라 동시 호출에도 안전)"""
+        # 학번 집합은 세션 기록보다 먼저 만료되지 않도록 세션 TTL 전체를 줍니다.
+        await self.backend.sadd(self._std_nos_key(token), std_no, self.ttl)
+
+    async def bound_std_nos(self) -> Dict[str, str]:
+        """{std_no: 세션 토큰} (같은 학번이 여러 세션에 있으면 가장 최근에 쓴 세션)"""
+        latest: Dict[str, str] = {}
+        # 색인은 max_sessions개로 제한되고, 마지막 사용 순으로 읽으므로 최근 세션이 덮어씁니다.
+        for token in await self.backend.zrange(self.INDEX_KEY, time.time() - self.ttl):
+            for std_no in await self.backend.smembers(self._std_nos_key(token)):
+                latest[std_no] = token
+        return latest
+
+    async def invalidate(self, token: str) -> bool:
+        await self.backend.zrem(self.INDEX_KEY, token)
+        return await self._drop(token)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "local_clients": len(self._clients),
+            "max": self.max_sessions,
+            "ttl": self.ttl,
+        }
+
+
+session_registry = SessionRegistry(
+    backend=get_state_backend(),
+    ttl=settings.OASIS_SESSION_TTL_SECONDS,
+    max_sessions=settings.OASIS_MAX_SESSIONS,
+)
+
+# 의존성 주입용 함수
+def get_session_registry() -> SessionRegistry:
+    return session_registry
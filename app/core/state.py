@@ -0,0 +1,274 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.utils import get_logger
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # 선택 의존성: STATE_BACKEND=redis 일 때만 필요
+    aioredis = None
+
+logger = get_logger("oasis.state")
+
+
+class StateBackend(ABC):
+    """
+    워커 프로세스들이 함께 보는 상태 저장소 (세션, 작업 상태, 분산 락, OASIS 요청 예산, 서킷 상태)
+    값은 bytes로 주고받고, 색인(z*)을 뺀 모든 키는 TTL을 가집니다.
+    """
+
+    # 다른 프로세스와 실제로 공유되는 백엔드인지 (memory는 False)
+    shared = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        pass
+
+    @abstractmethod
+    async def set_nx(self, key: str, value: bytes, ttl: float) -> bool:
+        """키가 없을 때만 저장하고 True를 반환합니다. (락 획득용)"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def expire(self, key: str, ttl: float):
+        """이미 있는 키의 TTL을 다시 설정합니다."""
+
+    # --- 집합 (Redis SADD/SMEMBERS): 원소 추가가 원자적이라 동시 수정 시 덮어쓰지 않음 ---
+    @abstractmethod
+    async def sadd(self, key: str, member: str, ttl: float):
+        """집합에 원소를 추가하고 키의 TTL을 ttl로 설정합니다."""
+
+    @abstractmethod
+    async def smembers(self, key: str) -> Set[str]:
+        pass
+
+    # --- 점수 순 색인 (Redis sorted set, TTL 없음) ---
+    @abstractmethod
+    async def zadd_bounded(self, key: str, member: str, score: float, cap: int) -> List[str]:
+        """
+        member를 score로 추가(이미 있으면 갱신)하고, cap개를 넘으면 점수가 낮은 것부터 빼서 돌려줍니다.
+        추가와 제거는 한 번에(원자적으로) 일어납니다.
+        """
+
+    @abstractmethod
+    async def zrange(self, key: str, min_score: float = -math.inf) -> List[str]:
+        """점수가 min_score 이상인 원소를 점수 오름차순으로"""
+
+    @abstractmethod
+    async def zrem(self, key: str, member: str):
+        pass
+
+    # --- 토큰 버킷 (워커 전체가 한 예산을 나눠 씀) ---
+    @abstractmethod
+    async def reserve_tokens(self, key: str, tokens: float, rate: float, capacity: float) -> float:
+        """
+        초당 rate개씩 capacity까지 채워지는 버킷에서 tokens개를 예약하고, 예약한 토큰을 쓸 수 있을 때까지 기다려야 할 초를 돌려줍니다.
+        모자라도 바로 빼 두므로(음수 잔량) 먼저 예약한 호출이 먼저 차례가 옵니다.
+        """
+
+    async def close(self):
+        pass
+
+
+class MemoryStateBackend(StateBackend):
+    """
+    프로세스 내 TTL 저장소 (단일 워커 배포/로컬 개발용 대체)
+    Redis 백엔드와 같은 의미(TTL, set_nx)를 지키므로 같은 코드 경로를 그대로 탑니다.
+    """
+
+    # 이 횟수만큼 저장할 때마다 만료된 키를 한 번에 정리
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        # 키 -> (만료 시각, 값). 값은 bytes, 집합(set), 색인(dict: 원소 -> 점수, 만료 없음)
+        self._store: Dict[str, Tuple[float, Any]] = {}
+        self._writes = 0
+
+    def _live(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._store[key]
+            return None
+        return value
+
+    def _put(self, key: str, value: Any, ttl: float):
+        self._store[key] = (time.monotonic() + ttl, value)
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY == 0:
+            self._sweep()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._live(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._put(key, value, ttl)
+
+    async def set_nx(self, key: str, value: bytes, ttl: float) -> bool:
+        if self._live(key) is not None:
+            return False
+        self._put(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self._store.pop(key, None) is not None
+
+    async def expire(self, key: str, ttl: float):
+        value = self._live(key)
+        if value is not None:
+            self._store[key] = (time.monotonic() + ttl, value)
+
+    async def sadd(self, key: str, member: str, ttl: float):
+        members = self._live(key) or set()
+        members.add(member)
+        self._put(key, members, ttl)
+
+    async def smembers(self, key: str) -> Set[str]:
+        return set(self._live(key) or ())
+
+    def _index(self, key: str) -> Dict[str, float]:
+        return self._store.setdefault(key, (math.inf, {}))[1]
+
+    async def zadd_bounded(self, key: str, member: str, score: float, cap: int) -> List[str]:
+        # 이벤트 루프 안에서 await 없이 끝나므로 그 자체로 원자적입니다.
+        index = self._index(key)
+        index[member] = score
+        excess = len(index) - cap
+        if excess <= 0:
+            return []
+        evicted = sorted(index, key=index.__getitem__)[:excess]
+        for old in evicted:
+            del index[old]
+        return evicted
+
+    async def zrange(self, key: str, min_score: float = -math.inf) -> List[str]:
+        index = self._index(key)
+        return sorted((m for m, score in index.items() if score >= min_score), key=index.__getitem__)
+
+    async def zrem(self, key: str, member: str):
+        self._index(key).pop(member, None)
+
+    async def reserve_tokens(self, key: str, tokens: float, rate: float, capacity: float) -> float:
+        now = time.monotonic()
+        level, updated = self._live(key) or (capacity, now)
+        level = min(capacity, level + (now - updated) * rate) - tokens
+        self._put(key, (level, now), (capacity - level) / rate + 1.0)
+        return max(0.0, -level / rate)
+
+    def _sweep(self):
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._store.items() if expires_at < now]:
+            del self._store[key]
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+# ZADD 후 cap을 넘은 만큼 ZPOPMIN (다른 워커와 동시에 실행돼도 cap보다 많이/적게 남지 않도록 한 스크립트로)
+_ZADD_BOUNDED = """
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+local excess = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[3])
+if excess > 0 then
+    return redis.call('ZPOPMIN', KEYS[1], excess)
+end
+return {}
+"""
+
+# 토큰 버킷 예약: 시각은 Redis 서버 시계(TIME)를 써서 워커/인스턴스 간 시계 차이의 영향을 받지 않습니다.
+# 대기 시간은 소수라 문자열로 돌려줍니다. (Lua 숫자를 그대로 돌려주면 정수로 잘림)
+_RESERVE_TOKENS = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tokens, rate, capacity = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'level', 'updated')
+local level = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+level = math.min(capacity, level + math.max(0, now - updated) * rate) - tokens
+redis.call('HSET', KEYS[1], 'level', tostring(level), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - level) / rate * 1000) + 1000)
+if level >= 0 then
+    return '0'
+end
+return tostring(-level / rate)
+"""
+
+
+class RedisStateBackend(StateBackend):
+    """여러 워커 프로세스/인스턴스가 공유하는 Redis 상태 저장소"""
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "oasis:state:"):
+        if aioredis is None:
+            raise RuntimeError("STATE_BACKEND=redis 를 사용하려면 redis 패키지를 설치해야 합니다.")
+        self.client = aioredis.from_url(url)
+        self.prefix = prefix
+        self._zadd_bounded = self.client.register_script(_ZADD_BOUNDED)
+        self._reserve_tokens = self.client.register_script(_RESERVE_TOKENS)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def set_nx(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)), nx=True))
+
+    async def delete(self, key: str) -> bool:
+        return bool(await self.client.delete(self.prefix + key))
+
+    async def expire(self, key: str, ttl: float):
+        await self.client.pexpire(self.prefix + key, max(1, int(ttl * 1000)))
+
+    async def sadd(self, key: str, member: str, ttl: float):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.sadd(self.prefix + key, member)
+            pipe.pexpire(self.prefix + key, max(1, int(ttl * 1000)))
+            await pipe.execute()
+
+    async def smembers(self, key: str) -> Set[str]:
+        return {m.decode() if isinstance(m, bytes) else m for m in await self.client.smembers(self.prefix + key)}
+
+    async def zadd_bounded(self, key: str, member: str, score: float, cap: int) -> List[str]:
+        # ZPOPMIN 결과는 [원소, 점수, 원소, 점수, ...]
+        popped = await self._zadd_bounded(keys=[self.prefix + key], args=[member, score, cap])
+        return [m.decode() if isinstance(m, bytes) else m for m in popped[::2]]
+
+    async def zrange(self, key: str, min_score: float = -math.inf) -> List[str]:
+        members = await self.client.zrangebyscore(self.prefix + key, min_score, "+inf")
+        return [m.decode() if isinstance(m, bytes) else m for m in members]
+
+    async def zrem(self, key: str, member: str):
+        await self.client.zrem(self.prefix + key, member)
+
+    async def reserve_tokens(self, key: str, tokens: float, rate: float, capacity: float) -> float:
+        wait = await self._reserve_tokens(keys=[self.prefix + key], args=[tokens, rate, capacity])
+        return float(wait)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def _build_state_backend() -> StateBackend:
+    if settings.STATE_BACKEND == "redis":
+        return RedisStateBackend(settings.STATE_REDIS_URL)
+    return MemoryStateBackend()
+
+
+state_backend = _build_state_backend()
+
+# 의존성 주입용 함수
+def get_state_backend() -> StateBackend:
+    return state_backend
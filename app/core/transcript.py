@@ -0,0 +1,167 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.schemas.crawler import SemesterSummary, TranscriptSummary
+
+# 학기명 정렬 순서 (모르는 학기명은 뒤로)
+SEMESTER_ORDER = {"1학기": 1, "여름계절": 2, "하기계절": 2, "2학기": 3, "겨울계절": 4, "동기계절": 4}
+
+# P/F 과목 등급: 통과는 이수 학점에만, 미통과는 아무 데도 포함하지 않음 (평점 계산 제외)
+PASS_GRADES = {"P", "PASS", "S"}
+NON_PASS_GRADES = {"NP", "FAIL", "U"}
+
+# 비고(REMT)에 이 문구가 있으면 재수강 (예: "재이수신청")
+RETAKE_MARKERS = ("재이수", "재수강")
+
+
+def semester_key(year: str, semester: str) -> Tuple[str, int, str]:
+    return (year, SEMESTER_ORDER.get(semester, 9), semester)
+
+
+def _classify(grade: Optional[str]) -> str:
+    """등급 -> in_progress / pass / non_pass / graded"""
+    grade = (grade or "").strip().upper()
+    if not grade:
+        return "in_progress"  # 성적 미입력 (수강 중인 학기)
+    if grade in PASS_GRADES:
+        return "pass"
+    if grade in NON_PASS_GRADES:
+        return "non_pass"
+    return "graded"
+
+
+def _is_retake(remarks: Optional[str]) -> bool:
+    return bool(remarks) and any(marker in remarks for marker in RETAKE_MARKERS)
+
+
+def _earned_nothing(row: dict) -> bool:
+    """F / NP처럼 학점을 얻지 못한 수강인지"""
+    kind = _classify(row.get("grade"))
+    return kind == "non_pass" or (kind == "graded" and (row.get("grade") or "").strip().upper().startswith("F"))
+
+
+def _superseded_rows(rows: List[dict], order: List[int]) -> set[int]:
+    """
+    재수강으로 대체되어 누적 집계에서 빠지는 이전 수강 행의 인덱스
+    - 비고(REMT)에 재수강 표시가 있는 행: 같은 과목 코드의 이전 수강을, 없으면(과목 코드가 바뀐 경우) 같은 과목명의 이전 수강을 대체
+    - 표시가 없는 행: 같은 과목 코드의 이전 수강이 F / NP일 때만 대체
+      (세미나, 캡스톤처럼 같은 코드로 여러 번 이수하는 과목은 모두 반영)
+    """
+    by_code: Dict[str, int] = {}
+    by_name: Dict[str, int] = {}
+    superseded: set[int] = set()
+
+    for i in order:
+        row = rows[i]
+        code, name = row["subject_code"], row.get("subject_name")
+        if _is_retake(row.get("remarks")):
+            previous = by_code.get(code, by_name.get(name))
+        else:
+            previous = by_code.get(code)
+            if previous is not None and not _earned_nothing(rows[previous]):
+                previous = None
+
+        if previous is not None:
+            superseded.add(previous)
+            # 과목 코드가 바뀐 재수강이면 이전 코드/이름으로는 더 이상 찾지 않습니다.
+            if by_code.get(rows[previous]["subject_code"]) == previous:
+                del by_code[rows[previous]["subject_code"]]
+            if by_name.get(rows[previous].get("subject_name")) == previous:
+                del by_name[rows[previous].get("subject_name")]
+        by_code[code] = i
+        by_name[name] = i
+
+    return superseded
+
+
+class _Totals:
+    __slots__ = ("attempted", "earned", "gpa_credits", "grade_points")
+
+    def __init__(self):
+        self.attempted = 0.0
+        self.earned = 0.0
+        self.gpa_credits = 0.0
+        self.grade_points = 0.0
+
+    def add(self, kind: str, credit: float, points: float, failed: bool):
+        if kind == "in_progress":
+            return
+        self.attempted += credit
+        if kind == "graded":
+            self.gpa_credits += credit
+            self.grade_points += credit * points
+            if not failed:
+                self.earned += credit
+        elif kind == "pass":
+            self.earned += credit
+
+    @property
+    def gpa(self) -> Optional[float]:
+        return round(self.grade_points / self.gpa_credits, 2) if self.gpa_credits else None
+
+
+def summarize_transcript(rows: Iterable[dict]) -> TranscriptSummary:
+    """
+    [Transcript Summary]
+    저장 형태(ScoreItem dict)의 수강 과목 목록을 한 번 순회해 학기별/누적 평점과 학점을 집계합니다.
+    - 평점: 학점 가중 평균 (P/F 과목, 성적 미입력 과목 제외)
+    - 재수강: 대체된 이전 수강은 누적 집계에서 제외 (판단 기준은 _superseded_rows)
+      (학기별 집계는 그 학기에 실제로 받은 성적 그대로)
+    - F / NP는 신청 학점에는 포함되지만 취득 학점에는 포함되지 않음
+    """
+    rows = list(rows)
+    order = sorted(range(len(rows)), key=lambda i: semester_key(rows[i]["year"], rows[i]["semester"]))
+
+    # 재수강으로 대체된 이전 수강 (누적 집계에서 제외)
+    superseded = _superseded_rows(rows, order)
+
+    semesters: Dict[Tuple[str, int, str], _Totals] = {}
+    total = _Totals()
+    by_course_type: Dict[str, float] = {}
+    pass_credits = in_progress_credits = 0.0
+    retakes = 0
+
+    for i in order:
+        row = rows[i]
+        kind = _classify(row.get("grade"))
+        credit = float(row.get("credit") or 0.0)
+        points = float(row.get("gpa") or 0.0)
+        failed = (row.get("grade") or "").strip().upper().startswith("F")
+
+        key = semester_key(row["year"], row["semester"])
+        semesters.setdefault(key, _Totals()).add(kind, credit, points, failed)
+
+        if i in superseded:
+            retakes += 1
+            continue
+
+        total.add(kind, credit, points, failed)
+        if kind == "in_progress":
+            in_progress_credits += credit
+        elif kind == "pass":
+            pass_credits += credit
+        if kind == "pass" or (kind == "graded" and not failed):
+            course_type = row.get("course_type") or ""
+            by_course_type[course_type] = by_course_type.get(course_type, 0.0) + credit
+
+    by_semester: List[SemesterSummary] = [
+        SemesterSummary(
+            year=key[0],
+            semester=key[2],
+            attempted_credits=totals.attempted,
+            earned_credits=totals.earned,
+            gpa_credits=totals.gpa_credits,
+            gpa=totals.gpa,
+        )
+        for key, totals in semesters.items()
+    ]
+
+    return TranscriptSummary(
+        attempted_credits=total.attempted,
+        earned_credits=total.earned,
+        gpa_credits=total.gpa_credits,
+        gpa=total.gpa,
+        pass_credits=pass_credits,
+        in_progress_credits=in_progress_credits,
+        retake_count=retakes,
+        by_semester=by_semester,
+        by_course_type=by_course_type,
+    )
@@ -3,7 +3,9 @@ from typing import List
 from app.crawlers.base import BaseCrawler
 from app.core.oasis_client import OasisClient
 from app.core.constants import COURSES_TAKEN_URL, COURSES_TAKEN_PAYLOAD
-from app.schemas.crawler import ScoreItem
+from app.schemas.crawler import ScoreItem, validate_score_items
+from app.core.cpu_executor import cpu_executor
+from app.core.metrics import STAGE_LATENCY
 
 class TakenCourseCrawler(BaseCrawler[List[ScoreItem]]):
     async def crawl(self, std_no: str, client: OasisClient) -> List[ScoreItem]:
@@ -17,6 +19,8 @@ class TakenCourseCrawler(BaseCrawler[List[ScoreItem]]):
         if not data: 
             return []
         
-        clean_data = [ScoreItem.model_validate(item) for item in data]
+        # 행이 많으면 CPU 실행기에서 검증합니다. (기다리는 동안 이벤트 루프는 다른 요청을 처리)
+        with STAGE_LATENCY.time("validation", "ScoreItem"):
+            clean_data = await cpu_executor.run("rows", len(data), validate_score_items, data)
                 
         return clean_data
\ No newline at end of file
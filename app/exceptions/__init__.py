@@ -0,0 +1,4 @@
+from app.exceptions.session import SessionExpiredError
+from app.exceptions.upstream import UpstreamUnavailableError
+
+__all__ = ["SessionExpiredError", "UpstreamUnavailableError"]
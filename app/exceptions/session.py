@@ -0,0 +1,6 @@
+class SessionExpiredError(Exception):
+    """세션 토큰이 없거나 만료/축출된 경우"""
+
+    def __init__(self, message: str = "Session expired or not found. Please log in again."):
+        self.message = message
+        super().__init__(message)
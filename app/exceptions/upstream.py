@@ -0,0 +1,6 @@
+class UpstreamUnavailableError(Exception):
+    """OASIS가 응답하지 않거나(타임아웃/5xx) 서킷 브레이커가 열려 있는 경우"""
+
+    def __init__(self, message: str = "OASIS is temporarily unavailable. Please try again later."):
+        self.message = message
+        super().__init__(message)
@@ -1,19 +1,42 @@
-from fastapi import FastAPI
+import os
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.core.mongodb import connect_to_mongo, close_mongo_connection
-from app.utils import setup_logging
+from app.core.mongodb import connect_to_mongo, close_mongo_connection, get_mongo_db, mongo_health
+from app.core.http_client import open_http_client, close_http_client
+from app.core.state import state_backend
+from app.core.cpu_executor import cpu_executor
+from app.utils import setup_logging, shutdown_logging
 from app.middleware import LoggingMiddleware
-from app.routers import crawler
+from app.routers import crawler, jobs, export
+from app.services.job_service import job_manager
+from app.services.resync_service import resync_scheduler
+from app.repositories.indexes import ensure_indexes
+from app.exceptions import SessionExpiredError, UpstreamUnavailableError
+from app.schemas.response import ErrorResponse
+from app.core.metrics import registry as metrics_registry
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 시작 시: DB 연결
+    # 시작 시: DB 연결(+ 인덱스 생성), OASIS 커넥션 풀 생성, 백그라운드 재동기화 시작
     await connect_to_mongo()
+    if settings.MONGODB_CREATE_INDEXES:
+        await ensure_indexes(get_mongo_db())
+    await open_http_client()
+    cpu_executor.start()
+    if settings.RESYNC_ENABLED:
+        resync_scheduler.start()
     yield
-    # 종료 시: 연결 해제
+    # 종료 시: 백그라운드 재동기화/진행 중인 배치 작업 취소 후 연결 해제
+    await resync_scheduler.stop()
+    await job_manager.shutdown()
+    await close_http_client()
+    cpu_executor.shutdown()
+    await state_backend.close()
     await close_mongo_connection()
+    shutdown_logging()
 
 def create_app() -> FastAPI:
     # 로깅 초기화
@@ -38,7 +61,18 @@ def create_app() -> FastAPI:
 
     # 라우터 등록
     app.include_router(crawler.router, prefix="/oasis", tags=["oasis-crawler"])
+    app.include_router(jobs.router, prefix="/oasis", tags=["oasis-jobs"])
+    # 전체 성적 내보내기는 관리자 토큰을 설정했을 때만 노출합니다.
+    if settings.EXPORT_API_TOKEN:
+        app.include_router(export.router, prefix="/oasis", tags=["oasis-export"])
     # 예외 핸들러 등록
+    @app.exception_handler(SessionExpiredError)
+    async def session_expired_handler(request: Request, exc: SessionExpiredError):
+        return JSONResponse(status_code=401, content=ErrorResponse(message=exc.message).model_dump())
+
+    @app.exception_handler(UpstreamUnavailableError)
+    async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError):
+        return JSONResponse(status_code=503, content=ErrorResponse(message=exc.message).model_dump())
 
     return app
 
@@ -47,3 +81,18 @@ app = create_app()
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
+
+@app.get("/ready", include_in_schema=False)
+async def read_readiness():
+    """
+    readiness 확인: MongoDB ping과 커넥션 풀 상태 (이 워커 프로세스 기준)
+    DB가 응답하지 않으면 503을 반환해 로드밸런서가 트래픽을 빼도록 합니다.
+    """
+    mongo = await mongo_health()
+    body = {"status": "ready" if mongo["ok"] else "not_ready", "pid": os.getpid(), "mongo": mongo}
+    return JSONResponse(status_code=200 if mongo["ok"] else 503, content=body)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    """Prometheus 텍스트 포맷 메트릭"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
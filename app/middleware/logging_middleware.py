@@ -1,42 +1,90 @@
 import time
+import uuid
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import HTTP_REQUESTS, HTTP_LATENCY
+from app.utils.logging import request_id_ctx
 
 logger = logging.getLogger("app.middleware")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """HTTP 요청/응답 로깅 미들웨어"""
+def route_template(scope) -> str:
+    """
+    메트릭 라벨용 라우트 템플릿 (/oasis/credits/2021... -> /oasis/credits/{std_no})
+    경로 파라미터 값으로 라벨이 폭증하지 않도록 라우터가 매칭한 라우트의 경로 템플릿을 그대로 씁니다.
+    """
+    route = getattr(scope.get("route"), "path", None)
+    if route is None:
+        return "unmatched"
+    # FastAPI 버전에 따라 include_router(prefix=...)로 붙은 라우트가 prefix 없는 원래 경로를 가집니다.
+    # 템플릿과 실제 경로의 세그먼트 수는 같으므로, 모자란 앞부분을 실제 경로에서 가져옵니다.
+    prefix = scope["path"].split("/")[:-route.count("/")]
+    return "/".join(prefix) + route
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
 
-        # 요청 정보
-        method = request.method
-        path = request.url.path
-        query = str(request.query_params) if request.query_params else ""
+class LoggingMiddleware:
+    """
+    HTTP 요청/응답 로깅 미들웨어 (순수 ASGI)
+    BaseHTTPMiddleware와 달리 요청마다 별도 태스크/스트림 래핑을 만들지 않고,
+    응답 시작 메시지에서 상태 코드만 가로챕니다.
+    """
 
-        # 요청 로깅
-        if query:
-            logger.info(f"→ {method} {path}?{query}")
-        else:
-            logger.info(f"→ {method} {path}")
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        # 요청 처리
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # 응답 시간 계산
-        duration = time.time() - start_time
-        duration_ms = duration * 1000
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
 
-        # 응답 로깅 (상태 코드에 따라 로그 레벨 변경)
-        status_code = response.status_code
-        if status_code >= 500:
-            logger.error(f"← {status_code} ({duration_ms:.2f}ms)")
-        elif status_code >= 400:
-            logger.warning(f"← {status_code} ({duration_ms:.2f}ms)")
-        else:
-            logger.info(f"← {status_code} ({duration_ms:.2f}ms)")
+        # 요청 ID: 클라이언트가 보낸 X-Request-ID를 이어받거나 새로 발급
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_ctx.set(request_id)
 
-        return response
+        if logger.isEnabledFor(logging.INFO):
+            query = scope.get("query_string", b"").decode("latin-1")
+            logger.info("→ %s %s%s", method, path, f"?{query}" if query else "")
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+
+            # 메트릭 기록 (경로 파라미터로 라벨이 폭증하지 않도록 라우트 템플릿 사용)
+            route_path = route_template(scope)
+            HTTP_REQUESTS.inc(route_path, method, str(status_code))
+            HTTP_LATENCY.observe(duration, route_path, method)
+
+            # 응답 로깅 (상태 코드에 따라 로그 레벨 변경)
+            if status_code >= 500:
+                level = logging.ERROR
+            elif status_code >= 400:
+                level = logging.WARNING
+            else:
+                level = logging.INFO
+            if logger.isEnabledFor(level):
+                logger.log(
+                    level, "← %s (%.2fms)", status_code, duration * 1000,
+                    extra={"method": method, "route": route_path, "status": status_code,
+                           "duration_ms": round(duration * 1000, 2)},
+                )
+
+            request_id_ctx.reset(token)
@@ -1,26 +1,66 @@
-from typing import List, Any
-from datetime import datetime
+from typing import List, Any, Optional
+from datetime import datetime, timezone
 from fastapi import Depends
 from app.core.mongodb import get_mongo_db
+from app.core.config import settings
+from app.core.metrics import STAGE_LATENCY
+from app.repositories.layout import SectionLayout
+from app.schemas.crawler import CREDITS_ADAPTER
+
+
+def render_credits(data: list) -> bytes:
+    """조회 API의 data 부분(List[CreditResponse])을 JSON bytes로 만듭니다."""
+    return CREDITS_ADAPTER.dump_json(CREDITS_ADAPTER.validate_python(data))
+
 
 class CreditRepository:
     def __init__(self, db: Any = Depends(get_mongo_db)):
         self.db = db
-        self.collection = db["credits"]
+        self.layout = SectionLayout(db, "credits")
+        self.collection = self.layout.collection
+
+    async def create_indexes(self) -> List[str]:
+        """
+        std_no(유니크), updated_at 인덱스를 생성합니다. (앱 시작 시 한 번만 호출하면 됨)
+        이미 있는 인덱스는 그대로 두므로 여러 번 호출해도 안전합니다.
+        """
+        return await self.collection.create_indexes(self.layout.indexes())
 
     async def save_credits(self, std_no: str, data: list):
-        """학점 정보 저장"""
+        """학점 정보 저장 (통합 레이아웃에서는 credits 섹션만 갱신)"""
+        field = self.layout.field
         document = {
             "std_no": std_no,
-            "data": data,
-            "updated_at": datetime.now()
+            field("data"): data,
+            field("updated_at"): datetime.now(timezone.utc)
         }
-        await self.collection.update_one(
-            {"std_no": std_no},
-            {"$set": document},
-            upsert=True
-        )
-    
+        update = {"$set": document}
+        # 조회 API가 그대로 내보낼 JSON(data_json)을 저장 시점에 미리 만들어 둡니다.
+        if settings.STORE_RENDERED_JSON:
+            document[field("data_json")] = render_credits(data)
+        else:
+            update["$unset"] = {field("data_json"): ""}
+
+        with STAGE_LATENCY.time("mongo_write", "credits"):
+            await self.collection.update_one(
+                {"std_no": std_no},
+                update,
+                upsert=True
+            )
+
     async def get_credits(self, std_no: str) -> dict | None:
-        """학점 정보 조회"""
-        return await self.collection.find_one({"std_no": std_no}, {"_id": 0})
\ No newline at end of file
+        """학점 정보 조회 ({"data", "updated_at"})"""
+        doc = await self.collection.find_one({"std_no": std_no}, self.layout.projection("data", "updated_at"))
+        return self.layout.extract(doc)
+
+    async def get_rendered(self, std_no: str) -> Optional[dict]:
+        """
+        저장 시 미리 만든 응답 JSON을 갱신 시각과 함께 조회합니다. ({"data_json", "updated_at"}, 없으면 None)
+        조건부 GET의 ETag/Last-Modified는 이 updated_at으로 만들어 본문과 항상 같은 버전을 가리킵니다.
+        """
+        doc = self.layout.extract(
+            await self.collection.find_one({"std_no": std_no}, self.layout.projection("data_json", "updated_at"))
+        )
+        if not doc or "data_json" not in doc:
+            return None
+        return doc
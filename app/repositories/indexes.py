@@ -0,0 +1,39 @@
+from typing import Any, Dict, List
+from pymongo.errors import PyMongoError
+from app.repositories.student_info_repository import StudentInfoRepository
+from app.repositories.credit_repository import CreditRepository
+from app.repositories.taken_courses_repository import TakenCoursesRepository
+from app.utils import get_logger
+
+logger = get_logger("oasis.indexes")
+
+
+async def ensure_indexes(db: Any) -> Dict[str, List[str]]:
+    """
+    [Index Bootstrap]
+    세 컬렉션에 std_no(유니크) / updated_at 인덱스를 만들고,
+    컬렉션별로 현재 존재하는 인덱스 이름 목록을 반환합니다.
+    한 컬렉션에서 실패해도(예: 기존 데이터의 std_no 중복) 나머지는 계속 진행합니다.
+    """
+    repos = (
+        StudentInfoRepository(db),
+        CreditRepository(db),
+        TakenCoursesRepository(db),
+    )
+
+    report: Dict[str, List[str]] = {}
+    for repo in repos:
+        name = repo.collection.name
+        try:
+            await repo.create_indexes()
+        except PyMongoError as e:
+            logger.error("인덱스 생성 실패 (%s): %s", name, e)
+
+        try:
+            report[name] = [index["name"] async for index in await repo.collection.list_indexes()]
+        except PyMongoError as e:
+            logger.error("인덱스 조회 실패 (%s): %s", name, e)
+            report[name] = []
+
+    logger.info("MongoDB 인덱스: %s", report, extra={"indexes": report})
+    return report
@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Optional
+from pymongo import ASCENDING, IndexModel
+from app.core.config import settings
+
+# 섹션 이름 -> 분리(split) 레이아웃에서의 컬렉션 이름
+SECTION_COLLECTIONS = {
+    "student_info": "students",
+    "credits": "credits",
+    "taken_courses": "courses",
+}
+
+
+class SectionLayout:
+    """
+    [Storage Layout]
+    한 섹션(student_info / credits / taken_courses)이 어느 컬렉션의 어느 경로에 저장되는지를 감춥니다.
+    - split:   섹션별 컬렉션, 문서 최상위에 data / data_json / updated_at
+    - unified: 학생당 문서 하나(MONGODB_UNIFIED_COLLECTION), <섹션>.data / <섹션>.updated_at ...
+    리포지토리는 field()로 경로를 만들고 extract()로 섹션 부분만 꺼내 씁니다.
+    """
+
+    def __init__(self, db: Any, section: str, layout: Optional[str] = None):
+        self.section = section
+        self.unified = (layout or settings.STORAGE_LAYOUT) == "unified"
+        if self.unified:
+            self.collection = db[settings.MONGODB_UNIFIED_COLLECTION]
+            self.prefix = f"{section}."
+        else:
+            self.collection = db[SECTION_COLLECTIONS[section]]
+            self.prefix = ""
+
+    def field(self, name: str) -> str:
+        return self.prefix + name
+
+    def projection(self, *names: str) -> Dict[str, int]:
+        """섹션 안의 필요한 필드만 읽는 projection"""
+        return {"_id": 0, **{self.field(name): 1 for name in names}}
+
+    def extract(self, doc: Optional[dict]) -> Optional[dict]:
+        """조회한 문서에서 섹션 부분만 꺼냅니다. (섹션이 없으면 None)"""
+        if doc is None or not self.unified:
+            return doc
+        return doc.get(self.section)
+
+    def wrap(self, fields: dict) -> dict:
+        """섹션 필드(data, updated_at ...)를 이 레이아웃의 문서 모양으로 감쌉니다."""
+        return {self.section: fields} if self.unified else fields
+
+    def indexes(self) -> List[IndexModel]:
+        # - std_no: 조회/upsert 필터 (유니크)
+        # - updated_at: 오래된 데이터 재동기화 등 갱신 시각 기준 조회
+        return [
+            IndexModel([("std_no", ASCENDING)], unique=True),
+            IndexModel([(self.field("updated_at"), ASCENDING)]),
+        ]
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
+from fastapi import Depends
+from app.core.config import settings
+from app.core.mongodb import get_mongo_db
+from app.repositories.layout import SectionLayout, SECTION_COLLECTIONS
+
+
+class StudentRecordRepository:
+    """
+    학생 한 명의 세 섹션(student_info, credits, taken_courses)을 한 번에 조회합니다.
+    - unified: 통합 문서 하나를 find_one 1회로 (섹션별 필요한 필드만 projection)
+    - split:   섹션별 컬렉션을 동시에 find_one
+    """
+
+    def __init__(self, db: Any = Depends(get_mongo_db)):
+        self.db = db
+        self.layouts = {section: SectionLayout(db, section) for section in SECTION_COLLECTIONS}
+        self.unified = settings.STORAGE_LAYOUT == "unified"
+
+    async def get_record(
+        self, std_no: str, fields: Sequence[str] = ("data", "updated_at")
+    ) -> Optional[Dict[str, Optional[dict]]]:
+        """{섹션: {필드...} 또는 None}, 어느 섹션도 없으면 None"""
+        if self.unified:
+            projection = {"_id": 0}
+            for layout in self.layouts.values():
+                projection.update(layout.projection(*fields))
+            collection = next(iter(self.layouts.values())).collection
+            doc = await collection.find_one({"std_no": std_no}, projection)
+            if doc is None:
+                return None
+            record = {section: layout.extract(doc) for section, layout in self.layouts.items()}
+        else:
+            docs = await asyncio.gather(*(
+                layout.collection.find_one({"std_no": std_no}, layout.projection(*fields))
+                for layout in self.layouts.values()
+            ))
+            record = dict(zip(self.layouts, docs))
+
+        if not any(record.values()):
+            return None
+        return record
+
+    async def iter_sections(
+        self, std_nos: Sequence[str], sections: Sequence[str], fields: Sequence[str]
+    ) -> AsyncIterator[Tuple[str, str, dict]]:
+        """
+        여러 학생의 섹션을 (섹션, std_no, {필드...}) 순서로 흘려 보냅니다.
+        컬렉션마다 $in 쿼리 한 번 + 커서(batch_size 단위)로 읽으므로 메모리는 배치 크기만큼만 씁니다.
+        """
+        query = {"std_no": {"$in": list(std_nos)}}
+        batch_size = settings.BATCH_READ_CURSOR_SIZE
+
+        if self.unified:
+            projection = {"_id": 0, "std_no": 1}
+            for section in sections:
+                projection.update(self.layouts[section].projection(*fields))
+            collection = next(iter(self.layouts.values())).collection
+            async for doc in collection.find(query, projection, batch_size=batch_size).sort("std_no", 1):
+                for section in sections:
+                    part = self.layouts[section].extract(doc)
+                    if part:
+                        yield section, doc["std_no"], part
+            return
+
+        for section in sections:
+            layout = self.layouts[section]
+            projection = {**layout.projection(*fields), "std_no": 1}
+            async for doc in layout.collection.find(query, projection, batch_size=batch_size).sort("std_no", 1):
+                yield section, doc["std_no"], doc
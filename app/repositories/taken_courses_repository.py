@@ -1,46 +1,282 @@
-from typing import List, Any, Optional
+import re
+import uuid
+from typing import List, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime, timezone
 from fastapi import Depends
+from pymongo import UpdateOne
 from app.core.mongodb import get_mongo_db
-from app.schemas.crawler import ScoreItem
+from app.core.config import settings
+from app.core.metrics import STAGE_LATENCY
+from app.repositories.layout import SectionLayout
+from app.schemas.crawler import ScoreItem, CourseChangeSummary, CohortSummary, SCORE_ITEMS_ADAPTER
+from app.core.transcript import summarize_transcript
+from app.utils import dumps
+
+# 과목 한 건을 식별하는 키 (년도, 학기, 과목코드)
+COURSE_KEY_FIELDS = ("year", "semester", "subject_code")
+
+def course_key(row: dict) -> tuple:
+    return tuple(row[field] for field in COURSE_KEY_FIELDS)
+
+def render_courses(rows: List[dict]) -> bytes:
+    """조회 API의 data 부분(List[ScoreItem])을 JSON bytes로 만듭니다. (저장된 행은 이미 ScoreItem 형태)"""
+    return dumps(rows)
 
 class TakenCoursesRepository:
     def __init__(self, db: Any = Depends(get_mongo_db)):
         self.db = db
-        self.collection = db["courses"]
+        self.layout = SectionLayout(db, "taken_courses")
+        self.collection = self.layout.collection
 
-    async def create_indexes(self):
+    async def create_indexes(self) -> List[str]:
         """
-        std_no에 인덱스를 생성합니다. (앱 시작 시 한 번만 호출하면 됨)
+        std_no(유니크), updated_at 인덱스를 생성합니다. (앱 시작 시 한 번만 호출하면 됨)
+        이미 있는 인덱스는 그대로 두므로 여러 번 호출해도 안전합니다.
         """
         # std_no를 기준으로 오름차순(1) 정렬, 유니크 제약조건 설정
-        await self.collection.create_index("std_no", unique=True)
+        return await self.collection.create_indexes(self.layout.indexes())
     
-    async def save_courses(self, std_no: str, data: List[ScoreItem]):
-        """수강 과목 정보 저장"""
-        
-        serialized_data = [item.model_dump() for item in data]
-        
-        document = {
+    # 비교한 뒤 다른 동기화가 먼저 문서를 바꾸면 다시 비교할 횟수 (모두 밀리면 전체를 덮어씀)
+    DIFF_ATTEMPTS = 2
+
+    async def save_courses(self, std_no: str, data: List[ScoreItem]) -> CourseChangeSummary:
+        """
+        수강 과목 정보 저장 (변경분만 반영)
+        저장된 목록과 (년도, 학기, 과목코드) 기준으로 비교해
+        추가/변경/삭제된 과목만 쓰고, 바뀐 게 없으면 쓰기를 생략합니다.
+        같은 학생을 동시에 동기화해 비교한 목록이 그사이 바뀌었으면 다시 비교하고,
+        DIFF_ATTEMPTS번 모두 밀리면 한 번의 update로 전체를 덮어씁니다.
+        """
+        serialized_data = SCORE_ITEMS_ADAPTER.dump_python(data)
+        for _ in range(self.DIFF_ATTEMPTS):
+            summary, applied = await self._save_diff(std_no, serialized_data)
+            if applied:
+                return summary
+
+        await self._replace_courses(std_no, serialized_data)
+        return summary
+
+    async def _save_diff(self, std_no: str, serialized_data: List[dict]) -> Tuple[CourseChangeSummary, bool]:
+        """변경분만 씁니다. 다른 쓰기가 먼저 문서를 바꿔 반영하지 못했으면 (비교 결과, False)"""
+        field = self.layout.field
+        data_field = field("data")
+
+        stored = self.layout.extract(
+            await self.collection.find_one({"std_no": std_no}, self.layout.projection("data", "revision"))
+        )
+        stored_rows = stored.get("data", []) if stored else None
+
+        new_by_key = {course_key(row): row for row in serialized_data}
+        old_by_key = {course_key(row): row for row in stored_rows or []}
+
+        # 저장된 문서가 없거나, 키가 중복되어 행 단위 비교가 불가능하면 전체를 덮어씁니다.
+        if (
+            stored_rows is None
+            or len(new_by_key) != len(serialized_data)
+            or len(old_by_key) != len(stored_rows)
+        ):
+            await self._replace_courses(std_no, serialized_data)
+            return CourseChangeSummary(
+                inserted=len(serialized_data),
+                removed=len(stored_rows or []),
+                written=True,
+            ), True
+
+        inserted = [row for key, row in new_by_key.items() if key not in old_by_key]
+        updated = [
+            row for key, row in new_by_key.items()
+            if key in old_by_key and old_by_key[key] != row
+        ]
+        removed = [key for key in old_by_key if key not in new_by_key]
+        summary = CourseChangeSummary(
+            inserted=len(inserted),
+            updated=len(updated),
+            removed=len(removed),
+            unchanged=len(new_by_key) - len(inserted) - len(updated),
+            written=bool(inserted or updated or removed),
+        )
+
+        if not summary.written:
+            return summary, True
+
+        # 첫 연산이 revision을 읽어 온 값에서 이번 쓰기의 값으로 바꾸고, 나머지는 revision이 그 값일 때만 적용됩니다.
+        # 읽은 뒤 다른 쓰기가 먼저 revision을 바꿨거나 중간에 끼어들면 남은 연산은 적용되지 않습니다. (matched_count 부족)
+        revision = uuid.uuid4().hex
+        mine = {"std_no": std_no, field("revision"): revision}
+        ops = [UpdateOne(
+            {"std_no": std_no, field("revision"): stored.get("revision")},
+            {"$set": {field("revision"): revision}},
+        )]
+        # 같은 배열(data)에 대한 $pull/$set/$push는 한 update에 섞을 수 없어 순서대로 나눕니다.
+        if removed:
+            ops.append(UpdateOne(
+                mine,
+                {"$pull": {data_field: {"$or": [dict(zip(COURSE_KEY_FIELDS, key)) for key in removed]}}},
+            ))
+        if updated:
+            ops.append(UpdateOne(
+                mine,
+                {"$set": {f"{data_field}.$[e{i}]": row for i, row in enumerate(updated)}},
+                array_filters=[
+                    {f"e{i}.{name}": row[name] for name in COURSE_KEY_FIELDS}
+                    for i, row in enumerate(updated)
+                ],
+            ))
+        if inserted:
+            ops.append(UpdateOne(
+                mine,
+                {"$push": {data_field: {"$each": inserted}}},
+            ))
+        # 미리 만든 응답 JSON은 위 연산들이 끝난 뒤의 배열 순서(기존 순서 + 추가분)로 다시 만듭니다.
+        merged = [new_by_key[key] for key in old_by_key if key in new_by_key] + inserted
+        ops.append(UpdateOne(mine, self._meta_update(merged)))
+
+        with STAGE_LATENCY.time("mongo_write", "courses"):
+            result = await self.collection.bulk_write(ops, ordered=True)
+        return summary, result.matched_count == len(ops)
+
+    async def _replace_courses(self, std_no: str, serialized_data: List[dict]):
+        update = self._meta_update(serialized_data)
+        update["$set"].update({
             "std_no": std_no,
-            "data": serialized_data,
-            "updated_at": datetime.now(timezone.utc)
-        }
+            self.layout.field("data"): serialized_data,
+            # 이 문서를 비교 중이던 다른 쓰기가 변경분을 덧쓰지 않도록 revision도 바꿉니다.
+            self.layout.field("revision"): uuid.uuid4().hex,
+        })
         
-        await self.collection.update_one(
-            {"std_no": std_no},
-            {"$set": document},
-            upsert=True
-        )
+        with STAGE_LATENCY.time("mongo_write", "courses"):
+            await self.collection.update_one(
+                {"std_no": std_no},
+                update,
+                upsert=True
+            )
+
+    def _meta_update(self, rows: List[dict]) -> dict:
+        """updated_at, 평점/학점 요약(summary), 조회 API가 그대로 내보낼 JSON(data_json)을 갱신하는 update 문서"""
+        field = self.layout.field
+        update = {"$set": {
+            field("updated_at"): datetime.now(timezone.utc),
+            field("summary"): summarize_transcript(rows).model_dump(),
+        }}
+        if settings.STORE_RENDERED_JSON:
+            update["$set"][field("data_json")] = render_courses(rows)
+        else:
+            update["$unset"] = {field("data_json"): ""}
+        return update
     
-    async def get_courses(self, std_no: str) -> Optional[List[ScoreItem]]:
-        """수강 과목 정보 조회"""
-        doc = await self.collection.find_one({"std_no": std_no}, {"_id": 0})
+    async def get_courses(self, std_no: str) -> Optional[dict]:
+        """
+        수강 과목 정보 조회 ({"data", "updated_at"})
+        저장 시 이미 ScoreItem으로 검증된 행이므로 다시 검증하지 않고 dict 그대로 반환합니다.
+        """
+        doc = self.layout.extract(
+            await self.collection.find_one({"std_no": std_no}, self.layout.projection("data", "updated_at"))
+        )
         
-        # 조회된 문서가 아예 없을시 None반환
+        # 조회된 문서(섹션)가 아예 없을시 None반환
         if doc is None:
             return None
-            
-        raw_data = doc.get("data", [])
-        
-        return [ScoreItem.model_validate(item) for item in raw_data]
\ No newline at end of file
+
+        doc.setdefault("data", [])
+        return doc
+
+    async def iter_courses(
+        self,
+        row_filter: Optional[dict] = None,
+        after_std_no: Optional[str] = None,
+        batch_size: int = 200,
+    ) -> AsyncIterator[Tuple[str, List[dict]]]:
+        """
+        저장된 수강 과목을 std_no 오름차순으로 (std_no, 행 목록)씩 흘려 보냅니다. (내보내기용)
+        - row_filter: {"year": ..., "semester": ...} 처럼 행 필드 조건. 조건에 맞는 행이 있는 문서만 읽음
+        - after_std_no: 이 학번 다음부터 읽음 (중단된 내보내기 이어 받기)
+        """
+        data_field = self.layout.field("data")
+        query: dict = {data_field: {"$exists": True}}
+        if row_filter:
+            query[data_field] = {"$elemMatch": row_filter}
+        if after_std_no:
+            query["std_no"] = {"$gt": after_std_no}
+
+        cursor = self.collection.find(
+            query, {**self.layout.projection("data"), "std_no": 1}, batch_size=batch_size
+        ).sort("std_no", 1)
+        async for doc in cursor:
+            rows = (self.layout.extract(doc) or {}).get("data", [])
+            yield doc["std_no"], rows
+
+    async def get_rendered(self, std_no: str) -> Optional[dict]:
+        """
+        저장 시 미리 만든 응답 JSON을 갱신 시각과 함께 조회합니다. ({"data_json", "updated_at"}, 없으면 None)
+        조건부 GET의 ETag/Last-Modified는 이 updated_at으로 만들어 본문과 항상 같은 버전을 가리킵니다.
+        """
+        doc = self.layout.extract(
+            await self.collection.find_one({"std_no": std_no}, self.layout.projection("data_json", "updated_at"))
+        )
+        if not doc or "data_json" not in doc:
+            return None
+        return doc
+
+    async def get_summary(self, std_no: str) -> Optional[dict]:
+        """동기화 시 계산해 둔 평점/학점 요약을 갱신 시각과 함께 조회 ({"summary", "updated_at"})"""
+        doc = self.layout.extract(
+            await self.collection.find_one({"std_no": std_no}, self.layout.projection("summary", "updated_at"))
+        )
+        if doc and "summary" in doc:
+            return doc
+
+        # 요약이 아직 없는 문서(기능 추가 전에 저장된 문서)는 저장된 행으로 바로 계산합니다.
+        doc = await self.get_courses(std_no)
+        if doc is None:
+            return None
+        return {"summary": summarize_transcript(doc["data"]).model_dump(), "updated_at": doc.get("updated_at")}
+
+    async def aggregate_cohort(self, std_no_prefix: Optional[str] = None) -> CohortSummary:
+        """
+        [Aggregation Pipeline]
+        저장된 요약(summary)으로 여러 학생의 평점/학점 통계를 MongoDB 안에서 계산합니다.
+        std_no_prefix(예: 입학년도 "2021")로 대상 학생을 좁힐 수 있습니다. (std_no 인덱스 사용)
+        """
+        summary = "$" + self.layout.field("summary")
+        match: dict = {self.layout.field("summary"): {"$exists": True}}
+        if std_no_prefix:
+            match["std_no"] = {"$regex": "^" + re.escape(std_no_prefix)}
+
+        pipeline = [
+            {"$match": match},
+            {"$project": {
+                "gpa": f"{summary}.gpa",
+                "earned": f"{summary}.earned_credits",
+                "types": {"$objectToArray": f"{summary}.by_course_type"},
+            }},
+            {"$facet": {
+                "totals": [{"$group": {
+                    "_id": None,
+                    "students": {"$sum": 1},
+                    "avg_gpa": {"$avg": "$gpa"},
+                    "min_gpa": {"$min": "$gpa"},
+                    "max_gpa": {"$max": "$gpa"},
+                    "avg_earned_credits": {"$avg": "$earned"},
+                }}],
+                "by_course_type": [
+                    {"$unwind": "$types"},
+                    {"$group": {"_id": "$types.k", "credits": {"$sum": "$types.v"}}},
+                ],
+            }},
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        result = (await cursor.to_list())[0]
+        if not result["totals"]:
+            return CohortSummary()
+
+        totals = result["totals"][0]
+        students = totals["students"]
+        return CohortSummary(
+            students=students,
+            avg_gpa=round(totals["avg_gpa"], 2) if totals["avg_gpa"] is not None else None,
+            min_gpa=totals["min_gpa"],
+            max_gpa=totals["max_gpa"],
+            avg_earned_credits=round(totals["avg_earned_credits"], 2) if totals["avg_earned_credits"] is not None else None,
+            # 해당 이수 구분 학점이 없는 학생은 0으로 보고 전체 학생 수로 나눕니다.
+            by_course_type={t["_id"]: round(t["credits"] / students, 2) for t in result["by_course_type"]},
+        )
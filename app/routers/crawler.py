@@ -1,41 +1,142 @@
-from fastapi import APIRouter, Depends, Body, HTTPException
+from fastapi import APIRouter, Depends, Body, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.schemas.crawler import StudentInfoResponse, LoginRequest
 from app.schemas.response import SuccessResponse, ErrorResponse
 from app.services.oasis_service import OasisService
+from app.services.resync_service import resync_scheduler
+from app.services.job_service import SyncJobManager, get_job_manager
+from app.core.session_registry import get_session_registry
+from app.exceptions import SessionExpiredError
+from app.schemas.job import BatchSyncItem, JobResponse
+from app.core.cache import ResponseCache, get_response_cache
+from app.core.circuit_breaker import oasis_breaker
+from app.core.config import settings
+from app.utils import build_validators, is_not_modified, dumps, success_json_response
 from app.crawlers.base import BaseCrawler
 from app.crawlers.score import CreditCrawler
 from app.crawlers.student_info import StudentInfoCrawler
 from app.crawlers.taken_courses import TakenCourseCrawler
-from typing import List
-from app.schemas.crawler import CreditResponse, ScoreItem
+from datetime import datetime
+from typing import List, Optional
+from app.schemas.crawler import (
+    CreditResponse, ScoreItem, SyncAllResponse, CourseChangeSummary, CREDITS_ADAPTER,
+    StudentRecordResponse, StudentBatchReadRequest, TranscriptSummary, CohortSummary,
+)
 
 router = APIRouter()
 
+# async=true로 호출한 동기화 엔드포인트의 응답 (OpenAPI 문서용)
+ASYNC_SYNC_RESPONSES = {202: {"model": SuccessResponse[JobResponse], "description": "async=true: 작업 등록"}}
+
+
+async def accept_sync_job(
+    request: Request,
+    jobs: SyncJobManager,
+    std_no: str,
+    cookies: Optional[dict],
+    session_token: Optional[str],
+    section: Optional[str] = None,
+) -> JSONResponse:
+    """
+    [Async Sync]
+    동기화를 작업(1건)으로 등록하고 202와 job_id를 바로 돌려줍니다. 업스트림 대기 동안 요청을 붙잡지 않습니다.
+    결과는 GET /oasis/jobs/{job_id} 폴링 또는 GET /oasis/jobs/{job_id}/events(SSE)로 받습니다.
+    """
+    # 세션 문제는 작업을 만들기 전에 바로 401로 알려 줍니다.
+    if not session_token and not cookies:
+        raise SessionExpiredError("Either session_token or cookies is required.")
+    if session_token and await get_session_registry().peek(session_token) is None:
+        raise SessionExpiredError()
+    if not jobs.can_accept(1):
+        raise HTTPException(status_code=429, detail="Too many pending sync jobs. Retry later.")
+
+    job = await jobs.submit([BatchSyncItem(std_no=std_no, cookies=cookies, session_token=session_token)], section)
+    return JSONResponse(
+        status_code=202,
+        content=SuccessResponse(data=job.to_response(include_items=False)).model_dump(mode="json"),
+        headers={"Location": str(request.url_for("read_job", job_id=job.job_id))},
+    )
+
+
+
+def check_not_modified(
+    key: str, updated_at: Optional[datetime | str], request: Request, response: Response
+) -> Response | None:
+    """
+    [Conditional GET]
+    내보낼 본문과 같은 문서(캐시 항목)의 updated_at으로 ETag/Last-Modified를 만들고,
+    클라이언트가 가진 버전과 같으면 본문 없는 304 응답을 돌려줍니다.
+    """
+    if updated_at is None:
+        return None
+
+    validators = build_validators(key, updated_at)
+    if is_not_modified(request, validators):
+        return Response(status_code=304, headers=validators)
+
+    response.headers.update(validators)
+    return None
+
+
+async def rendered_response(
+    section: str, std_no: str, request: Request, response: Response, service: OasisService
+) -> Response | None:
+    """
+    [Raw Passthrough]
+    동기화 시 저장해 둔 응답 JSON이 있으면 모델을 만들지 않고 봉투(SuccessResponse)에만 감싸 반환합니다.
+    (클라이언트가 같은 버전을 갖고 있으면 304)
+    """
+    if not settings.STORE_RENDERED_JSON:
+        return None
+    rendered = await service.get_rendered_from_db(section, std_no)
+    if rendered is None:
+        return None
+    data_json, updated_at = rendered
+    not_modified = check_not_modified(f"{section}:{std_no}", updated_at, request, response)
+    return not_modified or success_json_response(data_json, response)
+
 @router.post("/auth/session", response_model=SuccessResponse[dict], status_code=200)
 async def get_session(
     # 로그인에 필요한 정보를 Body로 받아야 합니다 (기존 LoginRequest 스키마 활용 권장)
     req: LoginRequest,
     service: OasisService = Depends(OasisService)
 ):
-    cookies = await service.login_and_get_cookies(req.user_id, req.user_pw, req.otp)
+    # 세션은 서버에 보관되고, 이후 동기화 요청은 session_token만 보내면 됩니다.
+    session = await service.login_and_open_session(req.user_id, req.user_pw, req.otp)
     
-    if not cookies:
-        # HTTPException import 필요
-        from fastapi import HTTPException
+    if not session:
         raise HTTPException(status_code=401, detail="Authentication failed")
 
     # SuccessResponse로 감싸서 반환
-    return SuccessResponse(data=cookies)
+    return SuccessResponse(data=session)
+
+@router.delete("/auth/session", response_model=SuccessResponse[None])
+async def close_session(
+    session_token: str = Body(..., embed=True),
+    service: OasisService = Depends(OasisService)
+):
+    """서버에 보관 중인 세션을 폐기합니다."""
+    if not await service.logout(session_token):
+        raise HTTPException(status_code=404, detail="Session not found")
 
-@router.post("/student/info/sync", response_model=SuccessResponse[dict])
+    return SuccessResponse(message="Session closed")
+
+@router.post("/student/info/sync", response_model=SuccessResponse[dict], responses=ASYNC_SYNC_RESPONSES)
 async def get_student_info(
+    request: Request,
     std_no: str = Body(...),      # 학번 (Payload 생성용)
-    cookies: dict = Body(...),    # 로그인 세션 쿠키
+    cookies: Optional[dict] = Body(None),    # 로그인 세션 쿠키 (session_token이 없을 때)
+    session_token: Optional[str] = Body(None), # /auth/session에서 받은 세션 토큰
+    run_async: bool = Query(False, alias="async", description="true면 202와 job_id를 바로 반환"),
     service: OasisService = Depends(OasisService),
+    jobs: SyncJobManager = Depends(get_job_manager),
     crawler: BaseCrawler = Depends(StudentInfoCrawler) # 학생 정보 크롤러 주입
 ):
+    if run_async:
+        return await accept_sync_job(request, jobs, std_no, cookies, session_token, "student_info")
+
     # 1. 서비스 로직 호출 (쿠키와 학번을 넘겨 데이터 수집)
-    success = await service.sync_student_info(cookies, crawler, std_no) #
+    success = await service.sync_student_info(cookies, crawler, std_no, session_token)
     
     # 2. 데이터 수집 실패 시 예외 처리
     if not success:
@@ -44,28 +145,106 @@ async def get_student_info(
     # 3. 성공 응답 반환 (SuccessResponse가 자동으로 Pydantic 모델 변환)
     return SuccessResponse(data={"message": "Student info synchronized successfully"})
 
+@router.post("/student/{std_no}/sync", response_model=SuccessResponse[SyncAllResponse], responses=ASYNC_SYNC_RESPONSES)
+async def sync_all(
+    std_no: str,
+    request: Request,
+    cookies: Optional[dict] = Body(None),
+    session_token: Optional[str] = Body(None),
+    run_async: bool = Query(False, alias="async", description="true면 202와 job_id를 바로 반환"),
+    service: OasisService = Depends(OasisService),
+    jobs: SyncJobManager = Depends(get_job_manager),
+    student_crawler: BaseCrawler = Depends(StudentInfoCrawler),
+    credit_crawler: BaseCrawler = Depends(CreditCrawler),
+    course_crawler: BaseCrawler = Depends(TakenCourseCrawler)
+):
+    """[저장 전용] 학생 정보/성적/수강 과목을 한 번에 동시 동기화합니다."""
+    if run_async:
+        return await accept_sync_job(request, jobs, std_no, cookies, session_token)
+
+    result = await service.sync_all(cookies, std_no, student_crawler, credit_crawler, course_crawler, session_token)
+
+    # 세 파트 모두 실패한 경우에만 에러로 처리 (부분 성공은 파트별 결과로 전달)
+    if not any(part.success for part in (result.student_info, result.credits, result.taken_courses)):
+        raise HTTPException(status_code=400, detail="Failed to sync data")
+
+    return SuccessResponse(data=result)
+
+@router.get("/student/{std_no}", response_model=SuccessResponse[StudentRecordResponse])
+async def read_student_record(
+    std_no: str,
+    service: OasisService = Depends(OasisService)
+):
+    """[응답 전용] 학생 정보/성적/수강 과목을 한 번에 조회합니다. (통합 레이아웃이면 DB 조회 1회)"""
+    resync_scheduler.touch(std_no)
+    record = await service.get_student_record_json(std_no)
+
+    if record is None:
+        raise HTTPException(status_code=404, detail="Data not found. Please sync first.")
+
+    return success_json_response(record)
+
+@router.post("/students/batch", response_class=StreamingResponse)
+async def read_students_batch(
+    req: StudentBatchReadRequest,
+    service: OasisService = Depends(OasisService)
+):
+    """
+    [응답 전용] 여러 학생의 섹션을 한 번에 조회해 NDJSON으로 스트리밍합니다.
+    한 줄 = {"std_no", "section", "updated_at", "data"} (저장된 데이터가 없으면 data는 null)
+    """
+    if len(req.std_nos) > settings.BATCH_READ_MAX_STUDENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many students (max {settings.BATCH_READ_MAX_STUDENTS})",
+        )
+
+    return StreamingResponse(
+        service.stream_student_sections(req.std_nos, req.sections),
+        media_type="application/x-ndjson",
+    )
+
 @router.get("/student/info/{std_no}", response_model=SuccessResponse[StudentInfoResponse])
 async def read_student_info(
     std_no: str,
+    request: Request,
+    response: Response,
     service: OasisService = Depends(OasisService)
 ):
     """[응답 전용] DB에 저장된 학생 정보를 조회합니다. (쿠키 필요 없음)"""
-    data = await service.get_student_info_from_db(std_no)
+    # 조회 시각은 백그라운드 재동기화의 우선순위로 쓰입니다.
+    resync_scheduler.touch(std_no)
+    rendered = await rendered_response("student_info", std_no, request, response, service)
+    if rendered:
+        return rendered
+
+    doc = await service.get_student_info_from_db(std_no)
     
-    if not data:
+    if not doc or not doc["data"]:
         raise HTTPException(status_code=404, detail="Data not found. Please sync first.")
+
+    not_modified = check_not_modified(f"student_info:{std_no}", doc.get("updated_at"), request, response)
+    if not_modified:
+        return not_modified
         
-    return SuccessResponse(data=data)
+    return SuccessResponse(data=doc["data"])
 
-@router.post("/credits/sync", response_model=SuccessResponse[dict])
+@router.post("/credits/sync", response_model=SuccessResponse[dict], responses=ASYNC_SYNC_RESPONSES)
 async def sync_credits(
+    request: Request,
     std_no: str = Body(...),
-    cookies: dict = Body(...),
+    cookies: Optional[dict] = Body(None),
+    session_token: Optional[str] = Body(None),
+    run_async: bool = Query(False, alias="async", description="true면 202와 job_id를 바로 반환"),
     service: OasisService = Depends(OasisService),
+    jobs: SyncJobManager = Depends(get_job_manager),
     crawler: BaseCrawler = Depends(CreditCrawler)
 ):
     """[저장 전용] 학교 서버에서 성적 정보를 가져와 DB를 업데이트합니다."""
-    success = await service.sync_credits(cookies, crawler, std_no)
+    if run_async:
+        return await accept_sync_job(request, jobs, std_no, cookies, session_token, "credits")
+
+    success = await service.sync_credits(cookies, crawler, std_no, session_token)
     
     if not success:
          return SuccessResponse(data={"message": "No data found or sync failed"})
@@ -76,38 +255,109 @@ async def sync_credits(
 @router.get("/credits/{std_no}", response_model=SuccessResponse[List[CreditResponse]])
 async def read_credits(
     std_no: str,
+    request: Request,
+    response: Response,
     service: OasisService = Depends(OasisService)
 ):
     """[응답 전용] DB에 저장된 성적 정보를 조회합니다."""
-    data = await service.get_credits_from_db(std_no)
+    resync_scheduler.touch(std_no)
+    rendered = await rendered_response("credits", std_no, request, response, service)
+    if rendered:
+        return rendered
+
+    doc = await service.get_credits_from_db(std_no)
+    if doc:
+        not_modified = check_not_modified(f"credits:{std_no}", doc.get("updated_at"), request, response)
+        if not_modified:
+            return not_modified
     
     # 데이터가 없으면 빈 리스트 반환 (혹은 404)
-    return SuccessResponse(data=data)
+    # 원본 행 -> CreditResponse 변환과 JSON 직렬화를 어댑터로 한 번에 처리합니다.
+    credits = CREDITS_ADAPTER.validate_python(doc["data"] if doc else [])
+    return success_json_response(CREDITS_ADAPTER.dump_json(credits), response)
 
 
-@router.post("/taken-courses/sync", response_model=SuccessResponse[None])
+@router.post("/taken-courses/sync", response_model=SuccessResponse[CourseChangeSummary], responses=ASYNC_SYNC_RESPONSES)
 async def sync_courses(
+    request: Request,
     std_no: str = Body(...),
-    cookies: dict = Body(...),
+    cookies: Optional[dict] = Body(None),
+    session_token: Optional[str] = Body(None),
+    run_async: bool = Query(False, alias="async", description="true면 202와 job_id를 바로 반환"),
     service: OasisService = Depends(OasisService),
+    jobs: SyncJobManager = Depends(get_job_manager),
     crawler: BaseCrawler = Depends(TakenCourseCrawler)
 ):
     """[저장 전용] 학교 서버에서 수강 과목 정보를 가져와 DB를 업데이트합니다."""
-    success = await service.sync_taken_courses(cookies, crawler, std_no)
+    if run_async:
+        return await accept_sync_job(request, jobs, std_no, cookies, session_token, "taken_courses")
+
+    changes = await service.sync_taken_courses(cookies, crawler, std_no, session_token)
     
-    if not success:
+    if changes is None:
          return ErrorResponse(message = "No data found or sync failed")
         
-    return SuccessResponse(message = "Taken courses list synchronized successfully")
+    # 추가/변경/삭제된 과목 수를 함께 반환합니다.
+    return SuccessResponse(data=changes, message = "Taken courses list synchronized successfully")
 
 @router.get("/taken-courses/{std_no}", response_model=SuccessResponse[List[ScoreItem]])
 async def get_courses(
     std_no: str,
+    request: Request,
+    response: Response,
     service: OasisService = Depends(OasisService)
 ):
     """[응답 전용] DB에 저장된 수강과목 정보를 조회합니다."""
+    resync_scheduler.touch(std_no)
+    rendered = await rendered_response("taken_courses", std_no, request, response, service)
+    if rendered:
+        return rendered
+
+    doc = await service.get_courses_from_db(std_no)
+    if doc:
+        not_modified = check_not_modified(f"taken_courses:{std_no}", doc.get("updated_at"), request, response)
+        if not_modified:
+            return not_modified
     
-    data = await service.get_courses_from_db(std_no)
-    
-    # 데이터가 없으면 빈 리스트 반환 (혹은 404)
-    return SuccessResponse(data=data)
\ No newline at end of file
+    # 데이터가 없으면 null 반환 (혹은 404)
+    # 저장된 행은 이미 ScoreItem 형태이므로 재검증 없이 바로 직렬화합니다.
+    return success_json_response(dumps(doc["data"] if doc else None), response)
+
+@router.get("/taken-courses/{std_no}/summary", response_model=SuccessResponse[TranscriptSummary])
+async def get_course_summary(
+    std_no: str,
+    request: Request,
+    response: Response,
+    service: OasisService = Depends(OasisService)
+):
+    """[응답 전용] 누적/학기별 평점, 이수 구분별 취득 학점 요약을 조회합니다. (동기화 시 계산된 값)"""
+    resync_scheduler.touch(std_no)
+    doc = await service.get_course_summary_from_db(std_no)
+
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Data not found. Please sync first.")
+
+    not_modified = check_not_modified(f"taken_courses:summary:{std_no}", doc.get("updated_at"), request, response)
+    if not_modified:
+        return not_modified
+
+    return SuccessResponse(data=doc["summary"])
+
+@router.get("/cohort/summary", response_model=SuccessResponse[CohortSummary])
+async def get_cohort_summary(
+    std_no_prefix: Optional[str] = None,
+    service: OasisService = Depends(OasisService)
+):
+    """[응답 전용] 학번 접두사(예: 입학년도)로 묶은 학생들의 평점/학점 통계를 조회합니다."""
+    return SuccessResponse(data=await service.get_cohort_summary(std_no_prefix))
+
+@router.get("/cache/stats", response_model=SuccessResponse[dict])
+async def read_cache_stats(cache: ResponseCache = Depends(get_response_cache)):
+    """조회 캐시의 적중/미스 통계를 반환합니다."""
+    return SuccessResponse(data=cache.stats())
+
+
+@router.get("/upstream/status", response_model=SuccessResponse[dict])
+async def read_upstream_status():
+    """OASIS 서킷 브레이커 상태와 호출 결과 카운터를 반환합니다."""
+    return SuccessResponse(data=oasis_breaker.stats())
@@ -0,0 +1,39 @@
+import secrets
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.services.export_service import ExportService, CourseExportFilter, EXPORT_FORMATS
+
+
+def require_export_token(authorization: Optional[str] = Header(None)):
+    """EXPORT_API_TOKEN과 같은 Bearer 토큰을 보낸 요청만 허용합니다. (토큰이 비어 있으면 모두 거절)"""
+    scheme, _, token = (authorization or "").partition(" ")
+    expected = settings.EXPORT_API_TOKEN
+    if not expected or scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Export token required", headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(dependencies=[Depends(require_export_token)])
+
+@router.get("/export/courses", response_class=StreamingResponse)
+async def export_courses(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="출력 형식"),
+    year: Optional[str] = Query(None, description="수강 년도 (예: 2021)"),
+    semester: Optional[str] = Query(None, description="학기명 (예: 1학기)"),
+    course_type: Optional[str] = Query(None, description="이수 구분 (예: 전공필수)"),
+    after_std_no: Optional[str] = Query(None, description="이 학번 다음부터 내보내기 (이어 받기, CSV 헤더 생략)"),
+    batch_size: int = Query(200, ge=1, le=5000, description="MongoDB 커서 배치 크기"),
+    service: ExportService = Depends(ExportService)
+):
+    """
+    저장된 수강 과목 전체를 과목 한 건당 한 줄(NDJSON/CSV)로 스트리밍합니다.
+    학번 오름차순으로 학생 한 명 분량씩 나갑니다. 끊기면 마지막 학번은 일부만 받았을 수 있으므로
+    그 학번의 줄을 버리고, 바로 앞 학번을 after_std_no로 넘겨 이어 받습니다.
+    """
+    filters = CourseExportFilter(year=year, semester=semester, course_type=course_type)
+    return StreamingResponse(
+        service.stream_courses(format, filters, after_std_no, batch_size),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="courses.{format}"'},
+    )
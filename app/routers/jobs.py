@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.schemas.job import BatchSyncRequest, JobResponse
+from app.schemas.response import SuccessResponse
+from app.services.job_service import SyncJobManager, get_job_manager
+from app.services.resync_service import ResyncScheduler, get_resync_scheduler
+
+router = APIRouter()
+
+@router.post("/jobs/sync", response_model=SuccessResponse[JobResponse], status_code=202)
+async def submit_batch_sync(
+    req: BatchSyncRequest,
+    jobs: SyncJobManager = Depends(get_job_manager)
+):
+    """여러 학생의 동기화를 배치 작업으로 등록하고 job_id를 즉시 반환합니다."""
+    if len(req.items) > settings.JOB_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {settings.JOB_MAX_ITEMS})")
+    if not jobs.can_accept(len(req.items)):
+        raise HTTPException(status_code=429, detail="Too many pending sync jobs. Retry later.")
+
+    job = await jobs.submit(req.items)
+    return SuccessResponse(data=job.to_response(include_items=False))
+
+@router.get("/jobs/{job_id}", response_model=SuccessResponse[JobResponse])
+async def read_job(
+    job_id: str,
+    jobs: SyncJobManager = Depends(get_job_manager)
+):
+    """배치 작업의 진행 상태와 학생별 결과를 조회합니다. (다른 워커가 실행 중인 작업 포함)"""
+    job = await jobs.load(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return SuccessResponse(data=job)
+
+@router.get("/jobs/{job_id}/events", response_class=StreamingResponse)
+async def stream_job_events(
+    job_id: str,
+    jobs: SyncJobManager = Depends(get_job_manager)
+):
+    """작업 진행 상황을 Server-Sent Events로 구독합니다. (항목 완료: item, 작업 완료: done)"""
+    if jobs.get(job_id) is None and await jobs.load(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return StreamingResponse(
+        jobs.events(job_id, settings.JOB_EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/resync/status", response_model=SuccessResponse[dict])
+async def read_resync_status(scheduler: ResyncScheduler = Depends(get_resync_scheduler)):
+    """백그라운드 재동기화 상태 (이 워커 프로세스 기준)"""
+    return SuccessResponse(data=scheduler.stats())
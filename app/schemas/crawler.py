@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, BeforeValidator, ConfigDict
-from typing import Optional, Dict, Any, List, Annotated
+from pydantic import BaseModel, Field, BeforeValidator, ConfigDict, TypeAdapter
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Annotated, Literal
 
 def empty_to_zero(v):
     """
@@ -53,6 +54,10 @@ class CreditResponse(BaseModel):
         extra = "ignore"
 
 
+# 행 목록 전체를 pydantic-core 안에서 한 번에 검증/직렬화합니다. (행마다 model_validate 호출 X)
+CREDITS_ADAPTER = TypeAdapter(List[CreditResponse])
+
+
 # 개별 과목 스키마 (알맹이)
 class ScoreItem(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
@@ -73,4 +78,85 @@ class ScoreItem(BaseModel):
     
     # 🌟 핵심: 재수강이 아닌 일반 과목은 원본 데이터에 아예 'REMT' 태그가 없습니다.
     # 따라서 Optional[str]과 default=None으로 설정해 에러를 방지합니다.
-    remarks: Optional[str] = Field(validation_alias="REMT", default=None, description="비고 (재이수신청 등)")
\ No newline at end of file
+    remarks: Optional[str] = Field(validation_alias="REMT", default=None, description="비고 (재이수신청 등)")
+
+
+# 넥사크로 컬럼(YY, SBJTCD ...) -> 저장 필드(year, subject_code ...) 매핑이 미리 컴파일된 어댑터
+SCORE_ITEMS_ADAPTER = TypeAdapter(List[ScoreItem])
+
+
+def validate_score_items(rows: List[Dict[str, Any]]) -> List[ScoreItem]:
+    """넥사크로 행 목록 -> ScoreItem 목록 (프로세스 풀에서 실행할 수 있도록 모듈 최상위 함수로 둠)"""
+    return SCORE_ITEMS_ADAPTER.validate_python(rows)
+
+
+# 수강 과목 저장 시 기존 데이터 대비 변경 내역
+class CourseChangeSummary(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    written: bool = False  # 실제로 DB 쓰기가 발생했는지 여부
+
+
+# 통합 동기화 결과 (파트별 성공/실패)
+class SyncPartResult(BaseModel):
+    success: bool
+    message: Optional[str] = None
+    changes: Optional[CourseChangeSummary] = None
+
+
+class SyncAllResponse(BaseModel):
+    student_info: SyncPartResult
+    credits: SyncPartResult
+    taken_courses: SyncPartResult
+
+
+# 학생 통합 조회 (세 섹션 + 섹션별 마지막 갱신 시각)
+class StudentRecordResponse(BaseModel):
+    student_info: Optional[StudentInfoResponse] = None
+    credits: List[CreditResponse] = []
+    taken_courses: Optional[List[ScoreItem]] = None
+    updated_at: Dict[str, Optional[datetime]] = {}
+
+
+# 여러 학생 일괄 조회 요청
+class StudentBatchReadRequest(BaseModel):
+    std_nos: List[str] = Field(min_length=1, description="조회할 학번 목록")
+    sections: List[Literal["student_info", "credits", "taken_courses"]] = Field(
+        default=["student_info", "credits", "taken_courses"],
+        min_length=1,
+        description="조회할 섹션",
+    )
+
+
+# 수강 과목 요약 (동기화 시 계산해 저장)
+class SemesterSummary(BaseModel):
+    year: str
+    semester: str
+    attempted_credits: float = 0.0  # 신청 학점 (성적 미입력 제외)
+    earned_credits: float = 0.0     # 취득 학점 (F/NP 제외)
+    gpa_credits: float = 0.0        # 평점 계산에 들어간 학점 (P/F 제외)
+    gpa: Optional[float] = None
+
+
+class TranscriptSummary(BaseModel):
+    attempted_credits: float = 0.0
+    earned_credits: float = 0.0
+    gpa_credits: float = 0.0
+    gpa: Optional[float] = None          # 누적 평점 (재수강은 최근 성적만 반영)
+    pass_credits: float = 0.0            # P 과목 취득 학점
+    in_progress_credits: float = 0.0     # 성적 미입력(수강 중) 학점
+    retake_count: int = 0                # 재수강으로 누적 집계에서 제외된 이전 수강 수
+    by_semester: List[SemesterSummary] = []
+    by_course_type: Dict[str, float] = {}  # 이수 구분별 취득 학점
+
+
+# 여러 학생(코호트) 요약 통계
+class CohortSummary(BaseModel):
+    students: int = 0
+    avg_gpa: Optional[float] = None
+    min_gpa: Optional[float] = None
+    max_gpa: Optional[float] = None
+    avg_earned_credits: Optional[float] = None
+    by_course_type: Dict[str, float] = {}  # 이수 구분별 평균 취득 학점
@@ -0,0 +1,34 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from app.schemas.crawler import SyncAllResponse, SyncPartResult
+
+
+class BatchSyncItem(BaseModel):
+    std_no: str
+    session_token: Optional[str] = None  # /auth/session에서 받은 세션 토큰
+    cookies: Optional[dict] = None       # 세션 토큰이 없을 때 사용할 쿠키
+
+
+class BatchSyncRequest(BaseModel):
+    items: List[BatchSyncItem] = Field(min_length=1)
+
+
+class JobItemResult(BaseModel):
+    std_no: str
+    status: str = "pending"  # pending, running, succeeded, failed
+    result: Optional[SyncAllResponse] = None  # 전체 동기화 결과
+    part: Optional[SyncPartResult] = None     # 섹션 하나만 동기화한 경우의 결과
+    error: Optional[str] = None
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str  # pending, running, completed
+    section: Optional[str] = None  # student_info, credits, taken_courses (None이면 전체)
+    total: int
+    succeeded: int
+    failed: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    items: Optional[List[JobItemResult]] = None
@@ -0,0 +1,132 @@
+import csv
+import io
+import os
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, BinaryIO, Iterator, Optional, Tuple
+from fastapi import Depends
+from app.repositories.taken_courses_repository import TakenCoursesRepository
+from app.schemas.crawler import ScoreItem
+from app.utils import dumps, loads
+
+# 내보내기 한 행의 컬럼 순서 (학번 + ScoreItem 필드)
+COURSE_EXPORT_COLUMNS = ("std_no", *ScoreItem.model_fields)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@dataclass(slots=True)
+class CourseExportFilter:
+    year: Optional[str] = None
+    semester: Optional[str] = None
+    course_type: Optional[str] = None
+
+    def as_query(self) -> dict:
+        """값이 지정된 조건만 {필드: 값}으로"""
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+class ExportService:
+    """
+    [Streaming Export]
+    courses 컬렉션을 커서로 읽어 과목 한 건을 한 줄(NDJSON/CSV)로 펼쳐 내보냅니다.
+    학생 한 명 분량씩 bytes로 만들어 흘려 보내므로 메모리 사용량은 전체 데이터 크기와 무관합니다.
+    전송이 학생 중간에서 끊길 수 있으므로, 이어 받을 때는 마지막 학번의 줄을 버리고
+    그 앞 학번을 after_std_no로 넘깁니다. (find_resume_point)
+    API(/oasis/export/courses)와 CLI(app.cli.export_courses)가 함께 사용합니다.
+    """
+
+    def __init__(self, taken_courses_repo: TakenCoursesRepository = Depends()):
+        self.taken_courses_repo = taken_courses_repo
+
+    async def stream_courses(
+        self,
+        fmt: str = "ndjson",
+        filters: Optional[CourseExportFilter] = None,
+        after_std_no: Optional[str] = None,
+        batch_size: int = 200,
+    ) -> AsyncIterator[bytes]:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        conditions = filters.as_query() if filters else {}
+
+        csv_buffer = io.StringIO()
+        csv_writer = csv.writer(csv_buffer)
+        # 이어 받기(after_std_no)일 때는 기존 파일 뒤에 붙이므로 CSV 헤더를 다시 쓰지 않습니다.
+        if fmt == "csv" and after_std_no is None:
+            csv_writer.writerow(COURSE_EXPORT_COLUMNS)
+            yield self._drain(csv_buffer)
+
+        async for std_no, rows in self.taken_courses_repo.iter_courses(conditions, after_std_no, batch_size):
+            matched = [
+                row for row in rows
+                if all(row.get(k) == v for k, v in conditions.items())
+            ]
+            if not matched:
+                continue
+
+            if fmt == "csv":
+                for row in matched:
+                    csv_writer.writerow([std_no, *(row.get(c) for c in COURSE_EXPORT_COLUMNS[1:])])
+                yield self._drain(csv_buffer)
+            else:
+                yield b"".join(dumps({"std_no": std_no, **row}) + b"\n" for row in matched)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> bytes:
+        chunk = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+
+def _reversed_lines(f: BinaryIO, block_size: int = 1 << 16) -> Iterator[Tuple[int, bytes]]:
+    """파일 끝에서부터 \n으로 끝나는 줄을 (시작 위치, 줄)로 돌려줍니다. 맨 끝의 잘린 줄은 건너뜁니다."""
+    # 마지막 \n 다음 위치 (그 뒤는 쓰다 만 줄)
+    end, pos = 0, f.seek(0, os.SEEK_END)
+    while pos > 0 and not end:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        newline = f.read(step).rfind(b"\n")
+        if newline >= 0:
+            end = pos + newline + 1
+
+    # carry = 파일[pos:end], 항상 \n으로 끝나며 첫 조각은 앞 블록과 이어질 수 있습니다.
+    pos, carry = end, b""
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        carry = f.read(step) + carry
+        parts = carry.split(b"\n")
+        for line in reversed(parts[1 if pos else 0:-1]):
+            end -= len(line) + 1
+            yield end, line + b"\n"
+        carry = parts[0] + b"\n" if pos else b""
+
+
+def _line_std_no(fmt: str, line: bytes) -> str:
+    if fmt == "csv":
+        return next(csv.reader([line.decode()]))[0]
+    return loads(line)["std_no"]
+
+
+def find_resume_point(f: BinaryIO, fmt: str) -> Tuple[int, Optional[str]]:
+    """
+    중단된 내보내기 파일에서 (잘라낼 위치, 이어 받을 after_std_no)를 찾습니다.
+    마지막 학번은 일부 행만 쓰였을 수 있으므로 그 학번의 줄(과 잘린 줄)을 모두 버리고 바로 앞 학번 다음부터 다시 받습니다.
+    앞 학번이 없으면 (0, None): 처음부터 다시 (CSV 헤더 포함)
+    """
+    last = None
+    for offset, line in _reversed_lines(f):
+        if fmt == "csv" and offset == 0:
+            break  # 헤더
+        std_no = _line_std_no(fmt, line)
+        if last is None:
+            last = std_no
+        elif std_no != last:
+            return offset + len(line), std_no
+    return 0, None
@@ -0,0 +1,327 @@
+import time
+import uuid
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+from app.core.config import settings
+from app.core.rate_limit import TokenBucket
+from app.core.state import StateBackend, get_state_backend
+from app.crawlers.score import CreditCrawler
+from app.crawlers.student_info import StudentInfoCrawler
+from app.crawlers.taken_courses import TakenCourseCrawler
+from app.exceptions import SessionExpiredError
+from app.schemas.crawler import SyncPartResult
+from app.schemas.job import BatchSyncItem, JobItemResult, JobResponse
+from app.services.oasis_service import build_oasis_service
+from app.utils import get_logger
+
+logger = get_logger("oasis.jobs")
+
+# 학생 한 명을 동기화할 때 OASIS로 나가는 요청 수 (학생 정보, 학점, 수강 과목)
+UPSTREAM_CALLS_PER_ITEM = 3
+
+# 섹션 하나만 동기화하는 작업: 섹션 -> (크롤러, OasisService 메서드 이름)
+SECTION_SYNCS = {
+    "student_info": (StudentInfoCrawler, "sync_student_info"),
+    "credits": (CreditCrawler, "sync_credits"),
+    "taken_courses": (TakenCourseCrawler, "sync_taken_courses"),
+}
+
+
+@dataclass
+class SyncJob:
+    job_id: str
+    requests: List[BatchSyncItem]
+    items: List[JobItemResult]
+    section: Optional[str] = None  # None이면 세 섹션 전체(sync_all)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    finished_mono: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+    # 항목 상태가 바뀔 때마다 set 후 새 Event로 교체 (이벤트 스트림 구독자 깨우기)
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    # 상태가 바뀐 횟수 (공유 저장소에 마지막으로 기록한 상태와 비교)
+    version: int = 0
+
+    def notify(self):
+        self.version += 1
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def wait_changed(self, timeout: float) -> bool:
+        """상태가 바뀌면 True, timeout 동안 변화가 없으면 False"""
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    @property
+    def status(self) -> str:
+        if self.finished_at:
+            return "completed"
+        if any(item.status != "pending" for item in self.items):
+            return "running"
+        return "pending"
+
+    def to_response(self, include_items: bool = True) -> JobResponse:
+        return JobResponse(
+            job_id=self.job_id,
+            status=self.status,
+            section=self.section,
+            total=len(self.items),
+            succeeded=sum(item.status == "succeeded" for item in self.items),
+            failed=sum(item.status == "failed" for item in self.items),
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            items=self.items if include_items else None,
+        )
+
+
+class SyncJobManager:
+    """
+    여러 학생의 동기화를 백그라운드에서 실행하는 배치 작업 관리자입니다.
+    - 전역 동시 실행 수: JOB_MAX_CONCURRENCY (워커마다 워커 수로 나눈 몫)
+    - OASIS 요청 속도: 토큰 버킷 (OASIS_RATE_LIMIT_PER_SECOND / OASIS_RATE_LIMIT_BURST, StateBackend에 두어 모든 워커 합계)
+    - 호스트별 연결 수: 공유 HTTP 풀의 OASIS_MAX_CONNECTIONS_PER_HOST
+    - 대기열: 끝나지 않은 항목이 max_pending을 넘으면 새 작업을 받지 않음
+    작업은 등록받은 워커 프로세스에서 실행되고(대기열도 워커별),
+    진행 상태는 StateBackend에 기록되어 다른 워커에서도 조회/구독할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate_limiter: TokenBucket,
+        retention: float,
+        max_pending: int,
+        backend: StateBackend,
+        publish_interval: float,
+    ):
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.retention = retention
+        self.max_pending = max_pending
+        self.backend = backend
+        self.publish_interval = publish_interval
+        self._jobs: Dict[str, SyncJob] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def pending_items(self) -> int:
+        """아직 끝나지 않은(pending/running) 항목 수"""
+        return sum(
+            item.status in ("pending", "running")
+            for job in self._jobs.values() if job.finished_at is None
+            for item in job.items
+        )
+
+    def can_accept(self, count: int) -> bool:
+        return self.pending_items() + count <= self.max_pending
+
+    async def submit(self, requests: List[BatchSyncItem], section: Optional[str] = None) -> SyncJob:
+        """
+        section을 주면 그 섹션만, 없으면 세 섹션 전체를 동기화하는 작업을 등록합니다.
+        job_id를 돌려주기 전에 상태를 먼저 기록해 두므로 바로 다른 워커로 조회해도 찾을 수 있습니다.
+        """
+        if section is not None and section not in SECTION_SYNCS:
+            raise ValueError(f"Unknown section: {section}")
+        self._purge_finished()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        job = SyncJob(
+            job_id=uuid.uuid4().hex,
+            requests=requests,
+            items=[JobItemResult(std_no=req.std_no) for req in requests],
+            section=section,
+        )
+        self._jobs[job.job_id] = job
+        await self._publish(job)
+        job.task = asyncio.create_task(self._run(job))
+        logger.info("배치 작업 등록: %s (%d건, %s)", job.job_id, len(requests), section or "all")
+        return job
+
+    def get(self, job_id: str) -> Optional[SyncJob]:
+        """이 워커에서 실행 중이거나 보관 중인 작업"""
+        return self._jobs.get(job_id)
+
+    async def load(self, job_id: str) -> Optional[JobResponse]:
+        """작업 상태 조회: 이 워커의 작업이면 바로, 아니면 공유 저장소에 기록된 상태를 읽습니다."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_response()
+        try:
+            raw = await self.backend.get(f"job:{job_id}")
+        except Exception as e:
+            logger.warning("작업 상태 조회 실패 (%s): %s", job_id, e)
+            return None
+        return JobResponse.model_validate_json(raw) if raw is not None else None
+
+    async def shutdown(self):
+        """앱 종료 시 진행 중인 작업을 취소합니다."""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: SyncJob):
+        publisher = asyncio.create_task(self._publish_loop(job))
+        try:
+            await asyncio.gather(
+                *(self._run_item(job, req, item) for req, item in zip(job.requests, job.items))
+            )
+            job.finished_at = datetime.now(timezone.utc)
+            job.finished_mono = time.monotonic()
+            job.notify()
+            logger.info("배치 작업 완료: %s", job.job_id)
+            await publisher
+        finally:
+            publisher.cancel()
+
+    async def _publish_loop(self, job: SyncJob):
+        """
+        작업 상태를 공유 저장소에 기록합니다.
+        항목이 많을 때 매 변경마다 전체 상태를 쓰지 않도록 publish_interval에 한 번만 씁니다.
+        """
+        published = job.version  # submit에서 처음 상태를 기록함
+        while True:
+            if published == job.version:
+                await job.wait_changed(self.retention)
+                continue
+            published = job.version
+            await self._publish(job)
+            if job.finished_at is not None:
+                return
+            await asyncio.sleep(self.publish_interval)
+
+    async def _publish(self, job: SyncJob):
+        try:
+            await self.backend.set(f"job:{job.job_id}", job.to_response().model_dump_json().encode(), self.retention)
+        except Exception as e:
+            logger.warning("작업 상태 기록 실패 (%s): %s", job.job_id, e)
+
+    async def _run_item(self, job: SyncJob, req: BatchSyncItem, item: JobItemResult):
+        async with self._semaphore:
+            await self.rate_limiter.acquire(UPSTREAM_CALLS_PER_ITEM if job.section is None else 1)
+            item.status = "running"
+            job.notify()
+            try:
+                if job.section is None:
+                    await self._sync_all(req, item)
+                else:
+                    await self._sync_section(job.section, req, item)
+            except SessionExpiredError as e:
+                item.status, item.error = "failed", e.message
+            except Exception as e:
+                logger.error("배치 동기화 실패 (%s): %s", req.std_no, e)
+                item.status, item.error = "failed", "Sync failed"
+            job.notify()
+
+    @staticmethod
+    async def _sync_all(req: BatchSyncItem, item: JobItemResult):
+        service = build_oasis_service()
+        result = await service.sync_all(
+            req.cookies,
+            req.std_no,
+            StudentInfoCrawler(),
+            CreditCrawler(),
+            TakenCourseCrawler(),
+            req.session_token,
+        )
+        item.result = result
+        parts = (result.student_info, result.credits, result.taken_courses)
+        item.status = "succeeded" if any(part.success for part in parts) else "failed"
+
+    @staticmethod
+    async def _sync_section(section: str, req: BatchSyncItem, item: JobItemResult):
+        crawler_cls, method = SECTION_SYNCS[section]
+        service = build_oasis_service()
+        outcome = await getattr(service, method)(req.cookies, crawler_cls(), req.std_no, req.session_token)
+        # sync_taken_courses는 변경 내역(없으면 None), 나머지는 성공 여부(bool)를 돌려줍니다.
+        changes = outcome if section == "taken_courses" else None
+        success = outcome is not None if section == "taken_courses" else bool(outcome)
+        item.part = SyncPartResult(
+            success=success,
+            message=None if success else "No data found or sync failed",
+            changes=changes,
+        )
+        item.status = "succeeded" if item.part.success else "failed"
+
+    async def events(self, job_id: str, heartbeat: float) -> AsyncIterator[bytes]:
+        """
+        [Server-Sent Events]
+        항목이 끝날 때마다 `event: item`(JobItemResult), 작업이 끝나면 `event: done`(JobResponse)을 보냅니다.
+        heartbeat 초 동안 변화가 없으면 연결 유지용 주석(: keep-alive)을 보냅니다.
+        다른 워커의 작업이면 공유 저장소의 상태를 publish_interval마다 다시 읽어 같은 이벤트를 만듭니다.
+        """
+        sent = set()
+        job = self._jobs.get(job_id)
+        if job is not None:
+            while True:
+                for event in _finished_item_events(job.items, sent):
+                    yield event
+                if job.finished_at is not None:
+                    yield _sse("done", job.to_response(include_items=False).model_dump_json())
+                    return
+                if not await job.wait_changed(heartbeat):
+                    yield b": keep-alive\n\n"
+
+        idle = 0.0
+        while True:
+            snapshot = await self.load(job_id)
+            if snapshot is None:
+                return
+            for event in _finished_item_events(snapshot.items or [], sent):
+                idle = 0.0
+                yield event
+            if snapshot.finished_at is not None:
+                yield _sse("done", snapshot.model_copy(update={"items": None}).model_dump_json())
+                return
+            await asyncio.sleep(self.publish_interval)
+            idle += self.publish_interval
+            if idle >= heartbeat:
+                idle = 0.0
+                yield b": keep-alive\n\n"
+
+    def _purge_finished(self):
+        deadline = time.monotonic() - self.retention
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_mono is not None and job.finished_mono < deadline
+        ]:
+            del self._jobs[job_id]
+
+
+def _sse(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+
+def _finished_item_events(items: List[JobItemResult], sent: set) -> List[bytes]:
+    """아직 보내지 않은 완료 항목의 `event: item` 목록 (보낸 인덱스는 sent에 기록)"""
+    events = []
+    for index, item in enumerate(items):
+        if index not in sent and item.status in ("succeeded", "failed"):
+            sent.add(index)
+            events.append(_sse("item", item.model_dump_json()))
+    return events
+
+
+job_manager = SyncJobManager(
+    max_concurrency=settings.per_worker(settings.JOB_MAX_CONCURRENCY),
+    # 배치 작업과 재동기화가 함께 쓰는 OASIS 요청 예산 (모든 워커 합계)
+    rate_limiter=TokenBucket(
+        settings.OASIS_RATE_LIMIT_PER_SECOND,
+        settings.OASIS_RATE_LIMIT_BURST,
+        backend=get_state_backend(),
+        local_share=settings.WEB_CONCURRENCY,
+    ),
+    retention=settings.JOB_RETENTION_SECONDS,
+    max_pending=settings.JOB_MAX_PENDING_ITEMS,
+    backend=get_state_backend(),
+    publish_interval=settings.JOB_STATE_PUBLISH_INTERVAL_SECONDS,
+)
+
+# 의존성 주입용 함수
+def get_job_manager() -> SyncJobManager:
+    return job_manager
@@ -1,12 +1,50 @@
+import time
+import asyncio
+from datetime import datetime, timezone
 from app.core.oasis_client import OasisClient
 from app.crawlers.base import BaseCrawler
 from fastapi import Depends
 from app.core.mongodb import get_mongo_db
-from app.repositories.credit_repository import CreditRepository
-from app.repositories.student_info_repository import StudentInfoRepository
-from app.repositories.taken_courses_repository import TakenCoursesRepository
-from typing import List, Optional
-from app.schemas.crawler import ScoreItem
+from app.core.session_registry import SessionRegistry, get_session_registry
+from app.core.cache import ResponseCache, get_response_cache
+from app.core.config import settings
+from app.exceptions import SessionExpiredError
+from app.repositories.credit_repository import CreditRepository, render_credits
+from app.repositories.student_info_repository import StudentInfoRepository, render_student_info
+from app.repositories.taken_courses_repository import TakenCoursesRepository, render_courses
+from app.repositories.student_record_repository import StudentRecordRepository
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from app.schemas.crawler import SyncAllResponse, SyncPartResult, CourseChangeSummary, CohortSummary
+from app.core.metrics import CRAWLER_LATENCY
+from app.utils import get_logger, dumps
+
+logger = get_logger("oasis.service")
+
+# 통합 조회에서 섹션별 data를 JSON으로 만드는 함수와, 섹션이 없을 때의 값
+_RENDERERS = {
+    "student_info": (render_student_info, b"null"),
+    "credits": (render_credits, b"[]"),
+    "taken_courses": (render_courses, b"null"),
+}
+
+
+def _isoformat(ts) -> Optional[str]:
+    # PyMongo는 tz 정보 없는 UTC datetime을 돌려줍니다.
+    if ts is None:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.isoformat()
+
+def _pack_rendered(data_json: bytes, updated_at: Optional[datetime]) -> bytes:
+    # 캐시에는 "<updated_at ISO>\n<data_json>" 한 덩어리로 넣어 본문과 갱신 시각이 함께 저장/삭제되게 합니다.
+    return (updated_at.isoformat().encode() if updated_at else b"") + b"\n" + data_json
+
+
+def _unpack_rendered(packed: bytes) -> Tuple[bytes, Optional[datetime]]:
+    stamp, _, data_json = packed.partition(b"\n")
+    return data_json, datetime.fromisoformat(stamp.decode()) if stamp else None
+
 
 class OasisService:
     def __init__(
@@ -14,12 +52,19 @@ class OasisService:
         client: OasisClient = Depends(),
         student_repo: StudentInfoRepository = Depends(),
         credit_repo: CreditRepository = Depends(),
-        taken_courses_repo: TakenCoursesRepository = Depends()
+        taken_courses_repo: TakenCoursesRepository = Depends(),
+        record_repo: StudentRecordRepository = Depends(),
+        sessions: SessionRegistry = Depends(get_session_registry),
+        cache: ResponseCache = Depends(get_response_cache)
     ):
         self.client = client
         self.student_repo = student_repo
         self.credit_repo = credit_repo
         self.taken_courses_repo = taken_courses_repo
+        self.record_repo = record_repo
+        self.sessions = sessions
+        self.cache = cache
+        self._session_token: Optional[str] = None
         
     async def login_and_get_cookies(self, user_id: str, user_pw: str, otp: str) -> dict | None:
         """로그인 비즈니스 로직"""
@@ -27,49 +72,296 @@ class OasisService:
         cookies = await self.client.authenticate(user_id, user_pw, otp)
         return cookies
 
-    async def crawl_student_data(self, cookies: dict, crawler: BaseCrawler, std_no: str):
+    async def login_and_open_session(self, user_id: str, user_pw: str, otp: str) -> dict | None:
+        """로그인 후 세션을 서버에 보관하고, 재사용용 토큰을 함께 반환"""
+        cookies = await self.client.authenticate(user_id, user_pw, otp)
+        if not cookies:
+            return None
+
+        token = await self.sessions.create(self.client)
+        return {"session_token": token, "cookies": cookies}
+
+    async def logout(self, session_token: str) -> bool:
+        return await self.sessions.invalidate(session_token)
+
+    async def _attach_session(self, cookies: dict | None, session_token: str | None):
+        """세션 토큰이 있으면 보관 중인 세션을 재사용하고, 없으면 쿠키를 복구합니다."""
+        if session_token:
+            client = await self.sessions.get(session_token)
+            if client is None:
+                raise SessionExpiredError()
+            self.client = client
+            self._session_token = session_token
+        elif cookies:
+            self.client.restore_cookies(cookies)
+        else:
+            raise SessionExpiredError("Either session_token or cookies is required.")
+
+    async def _bind_session(self, std_no: str):
+        """세션 토큰으로 동기화에 성공한 학번을 세션에 묶어 둡니다. (백그라운드 재동기화용)"""
+        if self._session_token:
+            await self.sessions.bind(self._session_token, std_no)
+
+    async def _crawl(self, crawler: BaseCrawler, std_no: str):
+        """크롤러 실행 + 크롤러별 소요 시간 기록"""
+        start = time.perf_counter()
+        result = "error"
+        try:
+            data = await crawler.crawl(std_no, self.client)
+            result = "ok" if data else "empty"
+            return data
+        finally:
+            CRAWLER_LATENCY.observe(time.perf_counter() - start, type(crawler).__name__, result)
+
+    async def crawl_student_data(self, cookies: dict | None, crawler: BaseCrawler, std_no: str, session_token: str | None = None):
         """데이터 수집 로직"""
-        self.client.session.cookies.update(cookies) # 쿠키 복구
+        await self._attach_session(cookies, session_token) # 세션/쿠키 복구
         
-        return await crawler.crawl(std_no, self.client)
+        return await self._crawl(crawler, std_no)
     
     # --- [1] 동기화 (Sync): 크롤링 후 저장만 수행 ---
-    async def sync_student_info(self, cookies: dict, crawler: BaseCrawler, std_no: str) -> bool:
-        self.client.session.cookies.update(cookies)
-        raw_data = await crawler.crawl(std_no, self.client)
+    async def sync_student_info(self, cookies: dict | None, crawler: BaseCrawler, std_no: str, session_token: str | None = None) -> bool:
+        await self._attach_session(cookies, session_token)
+        raw_data = await self._crawl(crawler, std_no)
         
         if raw_data:
             await self.student_repo.save_student_info(std_no, raw_data)
+            await self._invalidate("student_info", std_no)
+            await self._bind_session(std_no)
             return True
         return False
     
-    async def sync_credits(self, cookies: dict, crawler: BaseCrawler, std_no: str) -> bool:
-        self.client.session.cookies.update(cookies)
-        raw_data = await crawler.crawl(std_no, self.client)
+    async def sync_credits(self, cookies: dict | None, crawler: BaseCrawler, std_no: str, session_token: str | None = None) -> bool:
+        await self._attach_session(cookies, session_token)
+        raw_data = await self._crawl(crawler, std_no)
         
         if raw_data:
             await self.credit_repo.save_credits(std_no, raw_data)
+            await self._invalidate("credits", std_no)
+            await self._bind_session(std_no)
             return True
         return False
     
-    async def sync_taken_courses(self, cookies: dict, crawler: BaseCrawler, std_no: str) -> bool:
-        self.client.session.cookies.update(cookies)
-        raw_data = await crawler.crawl(std_no, self.client)
+    async def sync_taken_courses(self, cookies: dict | None, crawler: BaseCrawler, std_no: str, session_token: str | None = None) -> CourseChangeSummary | None:
+        """변경분만 저장하고, 변경 내역을 반환합니다. (수집 실패 시 None)"""
+        await self._attach_session(cookies, session_token)
+        raw_data = await self._crawl(crawler, std_no)
         
         if raw_data:
-            await self.taken_courses_repo.save_courses(std_no, raw_data)
-            return True
-        return False
+            changes = await self.taken_courses_repo.save_courses(std_no, raw_data)
+            if changes.written:
+                await self._invalidate("taken_courses", std_no)
+            await self._bind_session(std_no)
+            return changes
+        return None
     
+    async def sync_all(
+        self,
+        cookies: dict | None,
+        std_no: str,
+        student_crawler: BaseCrawler,
+        credit_crawler: BaseCrawler,
+        course_crawler: BaseCrawler,
+        session_token: str | None = None,
+    ) -> SyncAllResponse:
+        """
+        하나의 인증 세션으로 세 크롤러를 동시에 실행하고,
+        수집된 결과를 한 번에(병렬로) DB에 저장합니다.
+        전체 소요 시간은 세 요청의 합이 아니라 가장 느린 요청에 수렴합니다.
+        """
+        await self._attach_session(cookies, session_token)
+
+        parts = {
+            "student_info": (student_crawler, self.student_repo.save_student_info),
+            "credits": (credit_crawler, self.credit_repo.save_credits),
+            "taken_courses": (course_crawler, self.taken_courses_repo.save_courses),
+        }
+
+        # 1. 크롤링 (동시 실행)
+        crawled = await asyncio.gather(
+            *(self._crawl(crawler, std_no) for crawler, _ in parts.values()),
+            return_exceptions=True,
+        )
+
+        results: dict[str, SyncPartResult] = {}
+        writes = {}
+        for (name, (_, save)), raw_data in zip(parts.items(), crawled):
+            if isinstance(raw_data, Exception):
+                logger.error("%s 크롤링 실패 (%s): %s", name, std_no, raw_data)
+                results[name] = SyncPartResult(success=False, message="Crawl failed")
+            elif not raw_data:
+                results[name] = SyncPartResult(success=False, message="No data found")
+            else:
+                writes[name] = save(std_no, raw_data)
+
+        # 2. 저장 (한 단계에서 일괄 실행)
+        saved = await asyncio.gather(*writes.values(), return_exceptions=True)
+        for name, outcome in zip(writes, saved):
+            if isinstance(outcome, Exception):
+                logger.error("%s 저장 실패 (%s): %s", name, std_no, outcome)
+                results[name] = SyncPartResult(success=False, message="Save failed")
+            else:
+                await self._invalidate(name, std_no)
+                # 수강 과목은 save_courses가 변경 내역(CourseChangeSummary)을 돌려줍니다.
+                changes = outcome if isinstance(outcome, CourseChangeSummary) else None
+                results[name] = SyncPartResult(success=True, changes=changes)
+
+        if any(part.success for part in results.values()):
+            await self._bind_session(std_no)
+        return SyncAllResponse(**results)
+
+    async def _invalidate(self, section: str, std_no: str):
+        """조회 캐시(문서 + 미리 만든 JSON)를 함께 지웁니다."""
+        await self.cache.invalidate(self.cache.key(section, std_no))
+        await self.cache.invalidate(self.cache.key(f"{section}:json", std_no))
+        if section == "taken_courses":
+            await self.cache.invalidate(self.cache.key("taken_courses:summary", std_no))
+
     # --- [2] 조회 (Read): DB에서 데이터만 가져옴 ---
-    async def get_student_info_from_db(self, std_no: str):
-        doc = await self.student_repo.get_student_info(std_no)
-        return doc["data"] if doc else None
+    def _repo(self, section: str):
+        repos = {
+            "student_info": self.student_repo,
+            "credits": self.credit_repo,
+            "taken_courses": self.taken_courses_repo,
+        }
+        return repos[section]
+
+    async def get_rendered_from_db(self, section: str, std_no: str) -> Optional[Tuple[bytes, Optional[datetime]]]:
+        """
+        [Raw Passthrough]
+        동기화 시 저장해 둔 응답 JSON(bytes)을 모델 변환 없이 갱신 시각과 함께 가져옵니다. ((data_json, updated_at))
+        둘은 한 번의 조회로 읽어 한 캐시 항목에 묶어 두므로, ETag가 가리키는 버전과 본문이 어긋나지 않습니다.
+        아직 만들어지지 않은 문서라면 None (기존 조회 경로로 대체)
+        """
+        async def load() -> Optional[bytes]:
+            doc = await self._repo(section).get_rendered(std_no)
+            return _pack_rendered(doc["data_json"], doc.get("updated_at")) if doc else None
+
+        packed = await self.cache.get_or_load(self.cache.key(f"{section}:json", std_no), load)
+        return _unpack_rendered(packed) if packed is not None else None
 
-    async def get_credits_from_db(self, std_no: str):
-        doc = await self.credit_repo.get_credits(std_no)
-        return doc["data"] if doc else []
+    # 캐시에 먼저 조회하고, 없을 때만 MongoDB를 읽습니다. (Read-through)
+    # 문서는 {"data", "updated_at"} 그대로 캐시해 조건부 GET 검증자도 같은 항목에서 만듭니다.
+    async def get_student_info_from_db(self, std_no: str) -> Optional[dict]:
+        return await self.cache.get_or_load(
+            self.cache.key("student_info", std_no),
+            lambda: self.student_repo.get_student_info(std_no),
+        )
+
+    async def get_credits_from_db(self, std_no: str) -> Optional[dict]:
+        return await self.cache.get_or_load(
+            self.cache.key("credits", std_no),
+            lambda: self.credit_repo.get_credits(std_no),
+        )
     
-    async def get_courses_from_db(self, std_no: str) -> Optional[List[ScoreItem]]:
-        doc = await self.taken_courses_repo.get_courses(std_no)
-        return doc
\ No newline at end of file
+    async def get_courses_from_db(self, std_no: str) -> Optional[dict]:
+        return await self.cache.get_or_load(
+            self.cache.key("taken_courses", std_no),
+            lambda: self.taken_courses_repo.get_courses(std_no),
+        )
+
+    async def get_course_summary_from_db(self, std_no: str) -> Optional[dict]:
+        """동기화 시 계산해 둔 평점/학점 요약 ({"summary", "updated_at"}, Read-through 캐시)"""
+        return await self.cache.get_or_load(
+            self.cache.key("taken_courses:summary", std_no),
+            lambda: self.taken_courses_repo.get_summary(std_no),
+        )
+
+    async def get_cohort_summary(self, std_no_prefix: Optional[str] = None) -> CohortSummary:
+        """여러 학생의 요약 통계 (MongoDB aggregation pipeline)"""
+        return await self.taken_courses_repo.aggregate_cohort(std_no_prefix)
+
+    async def get_student_record_json(self, std_no: str) -> Optional[bytes]:
+        """
+        [Combined View]
+        세 섹션을 한 번에 조회해 StudentRecordResponse 모양의 JSON(bytes)으로 이어 붙입니다.
+        통합 레이아웃이면 MongoDB 왕복은 한 번이며, 저장해 둔 data_json을 그대로 씁니다.
+        """
+        fields = ("data_json", "updated_at") if settings.STORE_RENDERED_JSON else ("data", "updated_at")
+        record = await self.record_repo.get_record(std_no, fields)
+        if record is None:
+            return None
+
+        # data_json이 없는 섹션(옵션을 켜기 전에 저장된 문서 등)만 원본 data를 다시 읽어 만듭니다.
+        if any(part and "data_json" not in part for part in record.values()) and "data" not in fields:
+            raw = await self.record_repo.get_record(std_no, ("data",)) or {}
+            for section, part in record.items():
+                if part and "data_json" not in part:
+                    part["data"] = (raw.get(section) or {}).get("data")
+
+        chunks = []
+        updated_at = {}
+        for section, part in record.items():
+            render, empty = _RENDERERS[section]
+            part = part or {}
+            rendered = part.get("data_json")
+            if rendered is None:
+                rendered = render(part["data"]) if part.get("data") is not None else empty
+            chunks.append(b'"' + section.encode() + b'":' + rendered)
+
+            updated_at[section] = _isoformat(part.get("updated_at"))
+
+        chunks.append(b'"updated_at":' + dumps(updated_at))
+        return b"{" + b",".join(chunks) + b"}"
+
+    async def stream_student_sections(self, std_nos: Sequence[str], sections: Sequence[str]) -> AsyncIterator[bytes]:
+        """
+        [Bulk Read]
+        여러 학생의 섹션을 (학번, 섹션)당 한 줄짜리 NDJSON으로 흘려 보냅니다.
+        {"std_no": ..., "section": ..., "updated_at": ..., "data": ...}
+        저장된 데이터가 없는 (학번, 섹션)은 마지막에 data: null 로 내보냅니다.
+        """
+        std_nos = list(dict.fromkeys(std_nos))  # 순서를 유지한 중복 제거
+        sections = list(dict.fromkeys(sections))
+        use_rendered = settings.STORE_RENDERED_JSON
+        fields = ("data_json", "updated_at") if use_rendered else ("data", "updated_at")
+
+        found = {section: set() for section in sections}
+        without_json = {section: [] for section in sections}
+
+        async for section, std_no, part in self.record_repo.iter_sections(std_nos, sections, fields):
+            found[section].add(std_no)
+            if use_rendered and "data_json" not in part:
+                # data_json이 없는 문서는 모아 두었다가 원본 data로 한 번 더 조회합니다.
+                without_json[section].append(std_no)
+                continue
+            yield self._ndjson_line(section, std_no, part)
+
+        for section, pending in without_json.items():
+            if not pending:
+                continue
+            async for _, std_no, part in self.record_repo.iter_sections(pending, [section], ("data", "updated_at")):
+                yield self._ndjson_line(section, std_no, part)
+
+        for section in sections:
+            for std_no in std_nos:
+                if std_no not in found[section]:
+                    yield self._ndjson_line(section, std_no, {})
+
+    @staticmethod
+    def _ndjson_line(section: str, std_no: str, part: dict) -> bytes:
+        rendered = part.get("data_json")
+        if rendered is None:
+            rendered = _RENDERERS[section][0](part["data"]) if part.get("data") is not None else b"null"
+        return (
+            b'{"std_no":' + dumps(std_no)
+            + b',"section":"' + section.encode()
+            + b'","updated_at":' + dumps(_isoformat(part.get("updated_at")))
+            + b',"data":' + rendered + b"}\n"
+        )
+
+def build_oasis_service(client: OasisClient | None = None) -> OasisService:
+    """
+    요청 컨텍스트(Depends) 밖에서 OasisService를 조립합니다.
+    (배치 작업 등 백그라운드에서 사용)
+    """
+    db = get_mongo_db()
+    return OasisService(
+        client=client or OasisClient(),
+        student_repo=StudentInfoRepository(db),
+        credit_repo=CreditRepository(db),
+        taken_courses_repo=TakenCoursesRepository(db),
+        record_repo=StudentRecordRepository(db),
+        sessions=get_session_registry(),
+        cache=get_response_cache(),
+    )
@@ -0,0 +1,232 @@
+import time
+import random
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from app.core.circuit_breaker import oasis_breaker
+from app.core.config import settings
+from app.core.metrics import RESYNC_ITEMS
+from app.core.mongodb import get_mongo_db
+from app.core.rate_limit import TokenBucket
+from app.core.session_registry import SessionRegistry, get_session_registry
+from app.core.state import StateBackend, get_state_backend
+from app.crawlers.score import CreditCrawler
+from app.crawlers.student_info import StudentInfoCrawler
+from app.crawlers.taken_courses import TakenCourseCrawler
+from app.repositories.layout import SECTION_COLLECTIONS
+from app.repositories.student_record_repository import StudentRecordRepository
+from app.services.job_service import UPSTREAM_CALLS_PER_ITEM, job_manager
+from app.services.oasis_service import build_oasis_service
+from app.utils import get_logger
+
+logger = get_logger("oasis.resync")
+
+
+def _as_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    # PyMongo는 tz 정보 없는 UTC datetime을 돌려줍니다.
+    if ts is not None and ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+class ResyncScheduler:
+    """
+    [Background Re-sync]
+    세션이 살아 있는 학생 중 데이터가 오래된(updated_at이 stale_after보다 오래된) 학생을 주기적으로 다시 동기화합니다.
+    - 대상: 세션 토큰으로 동기화에 성공한 적 있는 학번 (SessionRegistry.bind)
+    - 우선순위: read_window 안에 조회된 학생(최근 조회 순) -> 나머지(오래된 순)
+    - 분산: 주기마다 jitter를 주고, 한 주기의 작업도 주기 안에서 무작위 시점으로 흩어 시작
+    - 예산: 배치 작업과 같은 토큰 버킷을 써서 OASIS 요청 속도 상한을 함께 지킴
+    - 여러 워커: 세션은 StateBackend로 공유되므로 모든 워커가 같은 대상을 보게 됩니다.
+      학번별 락(set_nx)을 잡은 워커만 실행하고, 성공하면 stale_after 동안 락을 유지해 다른 워커가 다시 고르지 않게 합니다.
+    """
+
+    def __init__(
+        self,
+        sessions: SessionRegistry,
+        backend: StateBackend,
+        rate_limiter: TokenBucket,
+        interval: float,
+        jitter: float,
+        stale_after: float,
+        max_per_tick: int,
+        max_concurrency: int,
+        read_window: float,
+        read_track_max: int,
+    ):
+        self.sessions = sessions
+        self.backend = backend
+        self.rate_limiter = rate_limiter
+        self.interval = interval
+        self.jitter = jitter
+        self.stale_after = stale_after
+        self.max_per_tick = max_per_tick
+        self.max_concurrency = max_concurrency
+        self.read_window = read_window
+        self.read_track_max = read_track_max
+        self._reads: OrderedDict[str, float] = OrderedDict()
+        # 재동기화로 OASIS와 대조한 시각 (epoch). 수강 과목이 그대로면 updated_at(ETag 기준)이
+        # 바뀌지 않으므로, 이 값이 없으면 같은 학생을 매 주기 다시 고르게 됩니다.
+        self._checked: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.last_run: Optional[datetime] = None
+        self.last_due = 0
+
+    def touch(self, std_no: str):
+        """조회 API가 호출될 때 학번의 마지막 조회 시각을 기록합니다."""
+        self._reads[std_no] = time.monotonic()
+        self._reads.move_to_end(std_no)
+        while len(self._reads) > self.read_track_max:
+            self._reads.popitem(last=False)
+
+    def start(self):
+        if self._task is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._task = asyncio.create_task(self._loop())
+            logger.info("백그라운드 재동기화 시작 (주기 %ss, 기준 %ss)", self.interval, self.stale_after)
+
+    async def stop(self):
+        """앱 종료 시 루프와 진행 중인 재동기화를 취소합니다."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def _next_delay(self) -> float:
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _loop(self):
+        # 여러 워커가 같은 시각에 시작해도 첫 실행이 겹치지 않도록 흩뜨립니다.
+        await asyncio.sleep(random.uniform(0, self.interval))
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("백그라운드 재동기화 실패: %s", e)
+            # run_once는 주기 안에 흩어 놓은 작업이 끝날 때까지 기다리므로 걸린 시간만큼 뺍니다.
+            await asyncio.sleep(max(0.0, self._next_delay() - (time.monotonic() - started)))
+
+    async def run_once(self) -> int:
+        """한 주기 실행: 대상 선정 -> 우선순위 정렬 -> 주기 안에 흩어서 재동기화. 시작한 학생 수를 반환"""
+        self.last_run = datetime.now(timezone.utc)
+        if await oasis_breaker.is_open():
+            logger.info("OASIS 서킷이 열려 있어 이번 재동기화를 건너뜁니다.")
+            self.last_due = 0
+            return 0
+
+        bound = await self.sessions.bound_std_nos()
+        self._checked = {std_no: ts for std_no, ts in self._checked.items() if std_no in bound}
+        due = await self._find_stale(list(bound)) if bound else []
+        self.last_due = len(due)
+        selected = []
+        for std_no, _ in sorted(due, key=self._priority):
+            if len(selected) >= self.max_per_tick:
+                break
+            # 주기 안에 흩어 놓은 작업이 끝날 때까지 다른 워커가 같은 학생을 고르지 않도록 잠급니다.
+            if await self.backend.set_nx(self._lock_key(std_no), b"1", self.interval * 2):
+                selected.append(std_no)
+        if not selected:
+            return 0
+
+        logger.info("재동기화 대상 %d명 중 %d명 실행", len(due), len(selected))
+        window = self.interval * (1 - self.jitter)
+        await asyncio.gather(*(
+            self._resync(std_no, bound[std_no], random.uniform(0, window))
+            for std_no in selected
+        ))
+        return len(selected)
+
+    async def _find_stale(self, std_nos: List[str]) -> List[Tuple[str, Optional[datetime]]]:
+        """[(std_no, 저장된 섹션 중 가장 오래된 updated_at)] 중 기준보다 오래된 학생 (저장된 섹션이 없으면 None)"""
+        stamps: Dict[str, List[datetime]] = {}
+        repo = StudentRecordRepository(get_mongo_db())
+        async for _, std_no, part in repo.iter_sections(std_nos, list(SECTION_COLLECTIONS), ("updated_at",)):
+            updated_at = _as_utc(part.get("updated_at"))
+            if updated_at is not None:
+                stamps.setdefault(std_no, []).append(updated_at)
+
+        threshold = time.time() - self.stale_after
+        due = []
+        for std_no in std_nos:
+            oldest = min(stamps[std_no]) if std_no in stamps else None
+            fresh_at = max(oldest.timestamp() if oldest else 0.0, self._checked.get(std_no, 0.0))
+            if fresh_at < threshold:
+                due.append((std_no, oldest))
+        return due
+
+    def _priority(self, item: Tuple[str, Optional[datetime]]) -> tuple:
+        std_no, updated_at = item
+        read_at = self._reads.get(std_no)
+        if read_at is not None and time.monotonic() - read_at <= self.read_window:
+            return (0, -read_at)
+        return (1, updated_at.timestamp() if updated_at else 0.0)
+
+    @staticmethod
+    def _lock_key(std_no: str) -> str:
+        return f"resync:{std_no}"
+
+    async def _resync(self, std_no: str, token: str, delay: float):
+        await asyncio.sleep(delay)
+        async with self._semaphore:
+            # 기다리는 동안 세션이 만료/폐기됐을 수 있으므로 다시 확인 (TTL은 늘리지 않음)
+            client = await self.sessions.peek(token)
+            if client is None:
+                RESYNC_ITEMS.inc("session_gone")
+                return
+            await self.rate_limiter.acquire(UPSTREAM_CALLS_PER_ITEM)
+            try:
+                service = build_oasis_service(client)
+                result = await service.sync_all(
+                    client.get_cookies(),
+                    std_no,
+                    StudentInfoCrawler(),
+                    CreditCrawler(),
+                    TakenCourseCrawler(),
+                )
+            except Exception as e:
+                logger.error("재동기화 실패 (%s): %s", std_no, e)
+                RESYNC_ITEMS.inc("error")
+                return
+
+            parts = (result.student_info, result.credits, result.taken_courses)
+            if any(part.success for part in parts):
+                self._checked[std_no] = time.time()
+                await self.backend.set(self._lock_key(std_no), b"1", self.stale_after)
+                RESYNC_ITEMS.inc("succeeded")
+            else:
+                RESYNC_ITEMS.inc("failed")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "interval": self.interval,
+            "stale_after": self.stale_after,
+            "last_run": self.last_run,
+            "last_due": self.last_due,
+            "tracked_reads": len(self._reads),
+        }
+
+
+resync_scheduler = ResyncScheduler(
+    sessions=get_session_registry(),
+    backend=get_state_backend(),
+    rate_limiter=job_manager.rate_limiter,
+    interval=settings.RESYNC_INTERVAL_SECONDS,
+    jitter=settings.RESYNC_JITTER,
+    stale_after=settings.RESYNC_STALE_AFTER_SECONDS,
+    # 모든 워커가 같은 주기로 돌므로 주기당 수/동시 실행 수는 워커 몫으로 나눕니다.
+    max_per_tick=settings.per_worker(settings.RESYNC_MAX_PER_TICK),
+    max_concurrency=settings.per_worker(settings.RESYNC_MAX_CONCURRENCY),
+    read_window=settings.RESYNC_READ_WINDOW_SECONDS,
+    read_track_max=settings.RESYNC_READ_TRACK_MAX,
+)
+
+# 의존성 주입용 함수
+def get_resync_scheduler() -> ResyncScheduler:
+    return resync_scheduler
@@ -1,3 +1,6 @@
-from app.utils.logging import setup_logging, get_logger
+from app.utils.logging import setup_logging, shutdown_logging, get_logger, request_id_ctx
+from app.utils.http_cache import build_validators, is_not_modified
+from app.utils.json_response import dumps, loads, render_success, success_json_response
 
-__all__ = ["setup_logging", "get_logger"]
+__all__ = ["setup_logging", "shutdown_logging", "get_logger", "request_id_ctx", "build_validators", "is_not_modified",
+           "dumps", "loads", "render_success", "success_json_response"]
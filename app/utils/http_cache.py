@@ -0,0 +1,51 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request
+
+
+def _as_utc(dt: datetime | str) -> datetime:
+    # 공유 캐시(Redis)를 거친 문서의 updated_at은 ISO 문자열로 돌아옵니다.
+    if isinstance(dt, str):
+        dt = datetime.fromisoformat(dt)
+    # PyMongo는 기본적으로 tz 정보 없는 UTC datetime을 돌려줍니다.
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def build_validators(key: str, updated_at: datetime | str) -> dict[str, str]:
+    """updated_at으로부터 ETag / Last-Modified 헤더를 만듭니다."""
+    updated_at = _as_utc(updated_at)
+    digest = hashlib.sha1(f"{key}:{updated_at.isoformat()}".encode()).hexdigest()[:20]
+    return {
+        "ETag": f'W/"{digest}"',
+        "Last-Modified": format_datetime(updated_at, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, validators: dict[str, str]) -> bool:
+    """If-None-Match가 있으면 우선 적용하고, 없을 때만 If-Modified-Since를 비교합니다."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = _strip_weak(validators["ETag"])
+        return any(_strip_weak(tag) == etag for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        last_modified = parsedate_to_datetime(validators["Last-Modified"])
+        return last_modified <= _as_utc(since)
+
+    return False
@@ -0,0 +1,50 @@
+import json
+from typing import Any, Mapping, Optional
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json으로 직렬화
+    orjson = None
+
+# 조건부 GET 검증자 중 미리 직렬화한 응답에 그대로 옮겨 붙일 헤더
+_VALIDATOR_HEADERS = ("etag", "last-modified", "cache-control")
+
+
+def dumps(obj: Any) -> bytes:
+    """dict/list를 JSON bytes로 직렬화합니다. (orjson이 있으면 orjson 사용)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """dumps()로 만든 JSON을 다시 파이썬 객체로 읽습니다."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def render_success(data_json: bytes, message: Optional[str] = None) -> bytes:
+    """이미 직렬화된 data를 SuccessResponse와 같은 모양의 JSON으로 감쌉니다."""
+    return b'{"status":"success","data":' + data_json + b',"message":' + dumps(message) + b"}"
+
+
+def success_json_response(
+    data_json: bytes,
+    response: Optional[Response] = None,
+    message: Optional[str] = None,
+) -> Response:
+    """
+    [Pre-serialized Response]
+    response_model 검증/직렬화를 거치지 않고 bytes를 그대로 내보냅니다.
+    주입받은 response에 설정된 ETag/Last-Modified 헤더는 함께 옮겨 붙입니다.
+    """
+    headers: Mapping[str, str] = {}
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k in _VALIDATOR_HEADERS}
+    return Response(
+        content=render_success(data_json, message),
+        media_type="application/json",
+        headers=headers,
+    )
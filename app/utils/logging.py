@@ -1,37 +1,118 @@
+import json
+import queue
+import atexit
 import logging
+import logging.handlers
 import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from app.core.config import settings
 
+# 요청 단위로 전파되는 요청 ID (미들웨어에서 설정)
+request_id_ctx: ContextVar[str] = ContextVar("request_id", default="-")
 
-def setup_logging() -> logging.Logger:
-    """애플리케이션 로깅 설정"""
+_listener: logging.handlers.QueueListener | None = None
+
+# LogRecord 기본 속성 (extra로 넘어온 필드만 JSON에 추가하기 위해 사용)
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """로그 레코드에 현재 요청 ID를 붙입니다. (이벤트 루프 스레드에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_ctx.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄짜리 JSON 구조화 로그"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler는 큐에 넣기 전에 메시지를 포맷합니다.
+    같은 프로세스 안의 큐이므로 레코드를 그대로 넘기고, 포맷은 리스너 스레드에서 합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
-    log_format = "%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d | %(message)s"
-    date_format = "%Y-%m-%d %H:%M:%S"
+
+def setup_logging() -> logging.Logger:
+    """
+    애플리케이션 로깅 설정
+    이벤트 루프는 큐에 레코드만 넣고, 포맷과 stdout 쓰기는 별도 리스너 스레드가 처리합니다.
+    """
+    global _listener
 
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
 
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-        ]
-    )
+    if settings.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d | %(request_id)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    if _listener is not None:
+        _listener.stop()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(log_level)
 
     # 외부 라이브러리 로그 레벨 조정
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     logging.getLogger("urllib3.connection").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
     logging.getLogger("pymongo").setLevel(logging.WARNING)
-    
+
     logger = logging.getLogger("app")
-    logger.info(f"로깅 설정 완료 (level: {logging.getLevelName(log_level)})")
+    logger.info("로깅 설정 완료 (level: %s, format: %s)", logging.getLevelName(log_level), settings.LOG_FORMAT)
 
     return logger
 
 
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 리스너 스레드를 종료합니다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """모듈별 로거 생성"""
     return logging.getLogger(name)
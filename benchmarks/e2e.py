@@ -0,0 +1,201 @@
+"""
+엔드투엔드 처리량/지연 시간 벤치마크
+
+FastAPI 앱을 같은 프로세스에서 ASGI로 직접 호출하고, OASIS 대신 로컬 대역 서버(benchmarks.mock_oasis)를
+붙여 로그인 -> 동기화 -> 재동기화(변경 없음) -> 조회 엔드포인트 순서로 부하를 줍니다.
+시나리오마다 p50/p95/p99, 초당 요청 수(RPS), 실패 수, 메모리(RSS, --tracemalloc 시 파이썬 할당 peak)를 출력합니다.
+
+MongoDB는 MONGODB_URL의 서버(로컬 또는 docker compose의 mongodb)에 별도 DB(<MONGODB_DB_NAME>-bench)를
+만들어 쓰고, 끝나면 삭제합니다.
+
+실행:
+    python -m benchmarks.e2e --students 200 --concurrency 20 --reads 2000
+    python -m benchmarks.mock_oasis --port 9100 &                 # 대역 서버를 별도 프로세스로 띄울 때
+    python -m benchmarks.e2e --oasis-url http://127.0.0.1:9100
+    python -m benchmarks.e2e --json bench.json                    # 결과 저장
+    python -m benchmarks.e2e --baseline bench.json --tolerance 0.2  # 20% 이상 나빠지면 종료 코드 1
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Iterable, List
+import httpx
+from app.core.config import settings
+from benchmarks.mock_oasis import MockOasisConfig, RedirectTransport, mock_transport
+from benchmarks.stats import compare_to_baseline, current_rss_mb, latency_stats, save_results
+
+# 조회 시나리오 이름 -> 경로
+READ_ENDPOINTS = {
+    "read_info": "/oasis/student/info/{std_no}",
+    "read_credits": "/oasis/credits/{std_no}",
+    "read_courses": "/oasis/taken-courses/{std_no}",
+    "read_summary": "/oasis/taken-courses/{std_no}/summary",
+    "read_record": "/oasis/student/{std_no}",
+}
+
+Call = Callable[[], Awaitable[httpx.Response]]
+
+
+def std_no_of(i: int) -> str:
+    return f"2021{i:05d}"
+
+
+async def drive(calls: Iterable[Call], concurrency: int) -> dict:
+    """calls를 동시에 concurrency개씩 실행하고 지연 시간/처리량/메모리를 집계합니다."""
+    pending = iter(calls)
+    timings: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker():
+        # 이터레이터를 워커들이 나눠 가지므로 먼저 끝난 워커가 다음 요청을 가져갑니다.
+        for call in pending:
+            start = time.perf_counter()
+            try:
+                res = await call()
+                statuses[res.status_code] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            timings.append(time.perf_counter() - start)
+
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = {
+        **latency_stats(timings),
+        "rps": len(timings) / elapsed,
+        "errors": sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400)),
+        "status": {str(status): count for status, count in statuses.items()},
+        "rss_mb": current_rss_mb(),
+    }
+    if tracemalloc.is_tracing():
+        result["py_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    return result
+
+
+def print_row(name: str, result: dict):
+    peak = f"{result['py_peak_mb']:8.1f}" if "py_peak_mb" in result else f"{'-':>8}"
+    print(
+        f"{name:<14} {result['n']:>6} {result['rps']:>9.1f} {result['p50']:>8.2f} {result['p95']:>8.2f} "
+        f"{result['p99']:>8.2f} {result['max']:>8.2f} {result['errors']:>6} {result['rss_mb']:>8.1f} {peak}"
+    )
+
+
+async def run(args) -> Dict[str, dict]:
+    # 설정은 앱 모듈을 import하기 전에 바꿔야 로깅/캐시/레이아웃에 반영됩니다.
+    settings.MONGODB_DB_NAME = args.db
+    settings.STORAGE_LAYOUT = args.layout
+    settings.CACHE_ENABLED = not args.no_cache
+    settings.LOG_LEVEL = "WARNING"
+
+    from app.main import app
+    from app.core.http_client import http_instance
+    from app.core.mongodb import db_instance
+
+    config = MockOasisConfig(
+        courses=args.courses, delay=args.delay, jitter=args.jitter,
+        login_delay=args.login_delay, error_rate=args.error_rate,
+    )
+    std_nos = [std_no_of(i) for i in range(args.students)]
+    results: Dict[str, dict] = {}
+
+    async with app.router.lifespan_context(app):
+        # lifespan이 만든 OASIS 커넥션 풀을 대역 서버용 트랜스포트로 바꿔 끼웁니다.
+        if args.oasis_url:
+            http_instance.transport = RedirectTransport(args.oasis_url, http_instance.transport)
+        else:
+            await http_instance.transport.aclose()
+            http_instance.transport = mock_transport(config)
+
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None
+            ) as client:
+                login_body = {"user_id": "bench", "user_pw": "bench", "otp": "000000"}
+                tokens: List[str] = []
+
+                async def login() -> httpx.Response:
+                    res = await client.post("/oasis/auth/session", json=login_body)
+                    if res.status_code == 200:
+                        tokens.append(res.json()["data"]["session_token"])
+                    return res
+
+                results["login"] = await drive((login for _ in range(args.sessions)), args.concurrency)
+                if not tokens:
+                    raise RuntimeError(f"대역 서버 로그인 실패: {results['login']['status']}")
+
+                def sync_calls() -> Iterable[Call]:
+                    for i, std_no in enumerate(std_nos):
+                        body = {"session_token": tokens[i % len(tokens)]}
+                        yield lambda std_no=std_no, body=body: client.post(f"/oasis/student/{std_no}/sync", json=body)
+
+                # 처음 동기화(전체 저장)와 같은 데이터로 다시 동기화(diff 결과 변경 없음)를 따로 잽니다.
+                results["sync"] = await drive(sync_calls(), args.concurrency)
+                results["resync"] = await drive(sync_calls(), args.concurrency)
+
+                for name, path in READ_ENDPOINTS.items():
+                    targets = (random.choice(std_nos) for _ in range(args.reads))
+                    results[name] = await drive(
+                        (lambda url=path.format(std_no=std_no): client.get(url) for std_no in targets),
+                        args.concurrency,
+                    )
+        finally:
+            if not args.keep_db and db_instance.client is not None:
+                await db_instance.client.drop_database(args.db)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 OASIS 대역 서버를 붙인 동기화/조회 엔드투엔드 벤치마크")
+    parser.add_argument("--students", type=int, default=200, help="동기화할 학생 수")
+    parser.add_argument("--reads", type=int, default=2000, help="조회 엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 요청 수")
+    parser.add_argument("--sessions", type=int, default=4, help="로그인해 나눠 쓸 세션 수")
+    parser.add_argument("--courses", type=int, default=60, help="학생당 수강 과목 수 (응답 크기)")
+    parser.add_argument("--delay", type=float, default=0.05, help="대역 서버 조회 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--login-delay", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 서버가 503으로 응답할 비율")
+    parser.add_argument("--oasis-url", help="별도 프로세스로 띄운 대역 서버 주소 (없으면 같은 프로세스에서 호출)")
+    parser.add_argument("--layout", choices=("split", "unified"), default=settings.STORAGE_LAYOUT)
+    parser.add_argument("--no-cache", action="store_true", help="조회 캐시를 끄고 MongoDB 조회 성능만 측정")
+    parser.add_argument("--tracemalloc", action="store_true", help="파이썬 할당 peak 측정 (느려짐)")
+    parser.add_argument("--db", default=f"{settings.MONGODB_DB_NAME}-bench")
+    parser.add_argument("--keep-db", action="store_true", help="끝난 뒤 벤치마크 DB를 지우지 않음")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단할 악화 비율")
+    args = parser.parse_args()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    results = asyncio.run(run(args))
+
+    print(
+        f"{'scenario':<14} {'n':>6} {'rps':>9} {'p50(ms)':>8} {'p95(ms)':>8} "
+        f"{'p99(ms)':>8} {'max(ms)':>8} {'errors':>6} {'rss(MB)':>8} {'peak(MB)':>8}"
+    )
+    for name, result in results.items():
+        print_row(name, result)
+
+    if args.json:
+        save_results(args.json, results)
+    if args.baseline:
+        regressions = compare_to_baseline(
+            results, args.baseline, args.tolerance, higher_is_worse=("p95", "p99"), lower_is_worse=("rps",)
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+CPU 구간 마이크로벤치마크 (네트워크/DB 없음)
+
+동기화 한 번에 들어가는 CPU 작업을 응답 크기(과목 수)별로 따로 잽니다.
+- parse_xml:      OasisClient._parse_nexacro_xml (완성된 XML 한 번에 파싱)
+- parse_stream:   NexacroParser에 8KB 청크로 나눠 feed (실제 응답 수신 경로)
+- build_payload:  OasisClient.build_payload (쿠키 포함 요청 XML 생성)
+- validate_list:  SCORE_ITEMS_ADAPTER.validate_python (행 목록 한 번에 검증)
+- validate_rows:  ScoreItem.model_validate 행마다 호출 (비교용)
+- offload_thread / offload_process: CPU 실행기처럼 풀에 넘겨 parse_nexacro_xml을 실행하고 결과를 받기까지
+  (parse_xml과의 차이가 풀 왕복 비용 -> CPU_OFFLOAD_MIN_BYTES를 정할 때 참고)
+
+실행:
+    python -m benchmarks.micro --sizes 10 60 500
+    python -m benchmarks.micro --json micro.json
+    python -m benchmarks.micro --baseline micro.json --tolerance 0.2
+"""
+import argparse
+import multiprocessing
+import sys
+import timeit
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict
+from app.core import constants as const
+from app.core.nexacro import NexacroParser, parse_nexacro_xml
+from app.core.oasis_client import OasisClient
+from app.schemas.crawler import ScoreItem, SCORE_ITEMS_ADAPTER
+from benchmarks.mock_oasis import courses_xml
+from benchmarks.stats import compare_to_baseline, save_results
+
+CHUNK_SIZE = 8192
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    """한 번 호출에 걸린 시간(µs): repeat회 반복 중 가장 빠른 값 (다른 작업의 간섭 제외)"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"us": best * 1e6, "ops": 1 / best}
+
+
+def parse_stream(xml: bytes):
+    parser = NexacroParser()
+    for offset in range(0, len(xml), CHUNK_SIZE):
+        parser.feed(xml[offset:offset + CHUNK_SIZE])
+    return parser.close()
+
+
+def run(sizes, repeat: int) -> Dict[str, dict]:
+    client = OasisClient()
+    client.restore_cookies({"JSESSIONID": "0" * 32, "JSESSIONIDSSO": "1" * 32})
+    results: Dict[str, dict] = {
+        "build_payload": measure(lambda: client.build_payload("202100001", const.COURSES_TAKEN_PAYLOAD), repeat),
+    }
+
+    with ThreadPoolExecutor(1) as threads, ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as procs:
+        procs.submit(int).result()  # 프로세스 기동 시간은 제외
+        for size in sizes:
+            xml = courses_xml("202100001", size)
+            rows = parse_nexacro_xml(xml).last_rows()
+            results[f"parse_xml[{size}]"] = measure(lambda: client._parse_nexacro_xml(xml), repeat)
+            results[f"parse_stream[{size}]"] = measure(lambda: parse_stream(xml), repeat)
+            results[f"offload_thread[{size}]"] = measure(lambda: threads.submit(parse_nexacro_xml, xml).result(), repeat)
+            results[f"offload_process[{size}]"] = measure(lambda: procs.submit(parse_nexacro_xml, xml).result(), repeat)
+            results[f"validate_list[{size}]"] = measure(lambda: SCORE_ITEMS_ADAPTER.validate_python(rows), repeat)
+            results[f"validate_rows[{size}]"] = measure(lambda: [ScoreItem.model_validate(row) for row in rows], repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XML 파싱/페이로드 생성/ScoreItem 검증 마이크로벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 60, 500], help="수강 과목 수 (응답 크기)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단할 악화 비율")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    print(f"{'benchmark':<22} {'us/call':>12} {'ops/s':>12}")
+    for name, result in results.items():
+        print(f"{name:<22} {result['us']:>12.1f} {result['ops']:>12.0f}")
+
+    if args.json:
+        save_results(args.json, results)
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance, higher_is_worse=("us",))
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+로컬 OASIS 대역 서버 (벤치마크 전용)
+
+실제 OASIS와 같은 경로로 로그인 3단계(ID/PW -> OTP 트리거 -> OTP 검증)와
+학적(STD_INFO_URL), 학점(SCORE_URL, rType=B1), 수강 과목(COURSES_TAKEN_URL, rType=C)
+넥사크로 XML 응답을 흉내 냅니다. 응답 크기(과목 수)와 지연 시간은 MockOasisConfig로 조절합니다.
+
+- 같은 프로세스에서: mock_transport(config)를 http_instance.transport 자리에 넣으면
+  네트워크 없이 ASGI로 바로 호출됩니다.
+- 별도 프로세스로: python -m benchmarks.mock_oasis --port 9100 으로 띄우고,
+  앱 쪽 트랜스포트를 RedirectTransport("http://127.0.0.1:9100", ...)로 감싸면
+  oasis.jbnu.ac.kr 요청이 로컬 서버로 전달됩니다. (쿠키 도메인은 원래 주소 기준으로 유지)
+"""
+import argparse
+import asyncio
+import random
+import re
+import secrets
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+from xml.sax.saxutils import escape
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from app.core import constants as const
+
+SEMESTERS = ("1학기", "여름계절", "2학기", "겨울계절")
+COURSE_TYPES = ("교양필수", "교양선택", "전공필수", "전공선택", "일반선택")
+GRADES = (("A+", "4.5"), ("A0", "4.0"), ("B+", "3.5"), ("B0", "3.0"), ("C+", "2.5"), ("C0", "2.0"), ("F", "0"))
+
+# 실제 응답처럼 ScoreItem이 쓰지 않는 컬럼도 함께 내려 보냅니다.
+COURSE_COLUMNS = (
+    ("YY", 4), ("SHTMCD", 2), ("SHTMNM", 20), ("SBJTCD", 10), ("CLSS", 3), ("SBJTNM", 100),
+    ("CPTNFGNM", 20), ("PNT", 5), ("GRDSCOR", 5), ("DISGRDSCOR", 5), ("DISPSCOR", 5),
+    ("PROFNM", 50), ("ORGNM", 50), ("REMT", 100),
+)
+CREDIT_COLUMNS = (
+    ("MAJORFG", 10), ("SUSTMIXNM", 100), ("GUBUN", 20), ("MINCULTPNT", 5),
+    ("MINMJNECEPNT", 5), ("MINMJCHOICEPNT", 5), ("GRDTPNT", 5),
+)
+INFO_COLUMNS = (
+    ("STDNO", 9), ("NM", 50), ("UNIVCDNM", 50), ("MJCDNM", 50), ("SHTRNM", 2), ("ENTRDT", 8),
+    ("TTCPTNSHTMCNT", 2), ("SUBMATTYY", 4), ("TOTALSCORAVG", 5), ("SCHREGSTSNM", 10),
+)
+
+_PARAM_RE = re.compile(rb'<Parameter id="(\w+)">([^<]*)</Parameter>')
+
+
+@dataclass(slots=True)
+class MockOasisConfig:
+    courses: int = 60              # 학생 한 명의 수강 과목 수 (수강 과목 응답 크기)
+    delay: float = 0.05            # 조회 응답 지연(초)
+    jitter: float = 0.02           # 지연에 더할 무작위 값의 상한(초)
+    login_delay: float = 0.1       # 로그인 단계별 응답 지연(초)
+    error_rate: float = 0.0        # 조회 요청 중 503으로 응답할 비율 (재시도/서킷 경로 확인용)
+
+
+def _path(url: str) -> str:
+    return httpx.URL(url).path
+
+
+def render_nexacro(datasets: Sequence[Tuple[str, Sequence[Tuple[str, int]], Iterable[dict]]]) -> bytes:
+    """(Dataset id, 컬럼 정의, 행 목록) 목록 -> 넥사크로 XML bytes"""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<Root xmlns="http://www.nexacroplatform.com/platform/dataset">\n'
+        '<Parameters>\n'
+        '<Parameter id="ErrorCode" type="int">0</Parameter>\n'
+        '<Parameter id="ErrorMsg" type="string">SUCC</Parameter>\n'
+        '</Parameters>\n'
+    ]
+    for dataset_id, columns, rows in datasets:
+        parts.append(f'<Dataset id="{dataset_id}">\n<ColumnInfo>\n')
+        parts.extend(f'<Column id="{name}" type="STRING" size="{size}"/>\n' for name, size in columns)
+        parts.append("</ColumnInfo>\n<Rows>\n")
+        for row in rows:
+            # 값이 없는 컬럼(REMT 등)은 태그 자체를 생략합니다.
+            cols = "".join(
+                f'<Col id="{name}">{escape(row[name])}</Col>' for name, _ in columns if row.get(name) is not None
+            )
+            parts.append(f"<Row>{cols}</Row>\n")
+        parts.append("</Rows>\n</Dataset>\n")
+    parts.append("</Root>")
+    return "".join(parts).encode()
+
+
+def course_rows(std_no: str, count: int) -> List[dict]:
+    """학번마다 항상 같은 결과가 나오는 수강 과목 행 (재수강/P·F/성적 미입력 포함)"""
+    rng = random.Random(f"courses:{std_no}")
+    entrance = int(std_no[:4]) if std_no[:4].isdigit() else 2021
+    rows = []
+    for i in range(count):
+        year = str(entrance + i // 12)
+        semester = SEMESTERS[(i // 6) % 2 * 2]  # 1학기/2학기 위주
+        if i % 17 == 16:
+            semester = rng.choice(SEMESTERS[1::2])
+        retake = i > 10 and i % 13 == 0
+        j = i - 7 if retake else i
+        code = f"{'ABCDEFGH'[j % 8]}{j:05d}"
+        if i % 19 == 18:
+            grade, points = rng.choice((("P", "0"), ("NP", "0")))
+        elif i >= count - 5:
+            grade, points = None, None  # 수강 중인 학기 (성적 컬럼 없음)
+        else:
+            grade, points = rng.choice(GRADES)
+        rows.append({
+            "YY": year,
+            "SHTMCD": "10",
+            "SHTMNM": semester,
+            "SBJTCD": code,
+            "CLSS": f"{rng.randint(1, 4):02d}",
+            "SBJTNM": f"벤치마크 과목 {code}",
+            "CPTNFGNM": rng.choice(COURSE_TYPES),
+            "PNT": rng.choice(("1", "2", "3", "3", "3")),
+            "GRDSCOR": points,
+            "DISGRDSCOR": points,
+            "DISPSCOR": grade,
+            "PROFNM": "홍길동",
+            "ORGNM": "컴퓨터공학부",
+            "REMT": "재이수신청" if retake else None,
+        })
+    return rows
+
+
+@lru_cache(maxsize=4096)
+def courses_xml(std_no: str, count: int) -> bytes:
+    return render_nexacro([
+        ("DS_STD", INFO_COLUMNS[:2], [{"STDNO": std_no, "NM": "홍길동"}]),
+        ("DS_SCOR", COURSE_COLUMNS, course_rows(std_no, count)),
+    ])
+
+
+@lru_cache(maxsize=4096)
+def credits_xml(std_no: str) -> bytes:
+    base = {"MAJORFG": "주전공", "SUSTMIXNM": "컴퓨터공학부"}
+    rows = [
+        {**base, "GUBUN": "기준", "MINCULTPNT": "30", "MINMJNECEPNT": "24", "MINMJCHOICEPNT": "36", "GRDTPNT": "130"},
+        {**base, "GUBUN": "졸업학점", "MINCULTPNT": "30", "MINMJNECEPNT": "24", "MINMJCHOICEPNT": "36", "GRDTPNT": "130"},
+        {**base, "GUBUN": "이수학점", "MINCULTPNT": "27", "MINMJNECEPNT": "18", "MINMJCHOICEPNT": "30", "GRDTPNT": "96"},
+        {**base, "GUBUN": "부족학점", "MINCULTPNT": "3", "MINMJNECEPNT": "6", "MINMJCHOICEPNT": "6", "GRDTPNT": "34"},
+    ]
+    return render_nexacro([
+        ("DS_STD", INFO_COLUMNS[:2], [{"STDNO": std_no, "NM": "홍길동"}]),
+        ("DS_PNT", CREDIT_COLUMNS, rows),
+    ])
+
+
+@lru_cache(maxsize=4096)
+def student_info_xml(std_no: str) -> bytes:
+    row = {
+        "STDNO": std_no, "NM": "홍길동", "UNIVCDNM": "공과대학", "MJCDNM": "컴퓨터공학부",
+        "SHTRNM": "3", "ENTRDT": "20210302", "TTCPTNSHTMCNT": "5", "SUBMATTYY": "2021",
+        "TOTALSCORAVG": "3.85", "SCHREGSTSNM": "재학",
+    }
+    return render_nexacro([("DS_SREG", INFO_COLUMNS, [row])])
+
+
+def create_mock_oasis(config: Optional[MockOasisConfig] = None) -> Starlette:
+    """OASIS 로그인/조회 엔드포인트를 흉내 내는 ASGI 앱"""
+    config = config or MockOasisConfig()
+
+    async def wait(seconds: float):
+        if seconds > 0:
+            await asyncio.sleep(seconds + random.uniform(0, config.jitter))
+
+    async def login(request: Request) -> Response:
+        await wait(config.login_delay)
+        response = JSONResponse({"resultCode": "0000"})
+        response.set_cookie("JSESSIONID", secrets.token_hex(16))
+        return response
+
+    async def otp_trigger(request: Request) -> Response:
+        await wait(config.login_delay)
+        return JSONResponse({"resultCode": "0000"})
+
+    async def otp_check(request: Request) -> Response:
+        await wait(config.login_delay)
+        form = parse_qs((await request.body()).decode())
+        if not form.get("userCode"):
+            return JSONResponse({"resultCode": "9999"})
+        response = JSONResponse({"resultCode": "0000"})
+        response.set_cookie("JSESSIONIDSSO", secrets.token_hex(16))
+        return response
+
+    async def nexacro(request: Request, render) -> Response:
+        if "JSESSIONIDSSO" not in request.cookies:
+            return Response(status_code=401)
+        params = dict(_PARAM_RE.findall(await request.body()))
+        await wait(config.delay)
+        if config.error_rate and random.random() < config.error_rate:
+            return Response(status_code=503)
+        std_no = params.get(b"stdNo", b"").decode()
+        return Response(render(std_no, params.get(b"rType", b"").decode()), media_type="text/xml")
+
+    async def std_info(request: Request) -> Response:
+        return await nexacro(request, lambda std_no, _: student_info_xml(std_no))
+
+    async def score(request: Request) -> Response:
+        # SCORE_URL과 COURSES_TAKEN_URL은 같은 경로이고 rType(B1/C)으로만 구분됩니다.
+        def render(std_no: str, r_type: str) -> bytes:
+            return courses_xml(std_no, config.courses) if r_type == "C" else credits_xml(std_no)
+        return await nexacro(request, render)
+
+    return Starlette(routes=[
+        Route(_path(const.LOGIN_URL), login, methods=["POST"]),
+        Route(_path(const.LOGIN_OTP_TRIGGER), otp_trigger, methods=["POST"]),
+        Route(_path(const.LOGIN_OTP_CHECK), otp_check, methods=["POST"]),
+        Route(_path(const.STD_INFO_URL), std_info, methods=["POST"]),
+        Route(_path(const.SCORE_URL), score, methods=["POST"]),
+    ])
+
+
+class RedirectTransport(httpx.AsyncBaseTransport):
+    """
+    OASIS 주소로 가는 요청을 로컬 대역 서버로 돌립니다.
+    응답의 request는 원래 요청 그대로이므로 쿠키는 oasis.jbnu.ac.kr 기준으로 저장됩니다.
+    """
+
+    def __init__(self, target: str, inner: httpx.AsyncBaseTransport):
+        self.target = httpx.URL(target)
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url.copy_with(scheme=self.target.scheme, host=self.target.host, port=self.target.port)
+        forwarded = httpx.Request(
+            request.method, url, headers=request.headers, stream=request.stream, extensions=request.extensions
+        )
+        return await self.inner.handle_async_request(forwarded)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+def mock_transport(config: Optional[MockOasisConfig] = None) -> httpx.AsyncBaseTransport:
+    """같은 프로세스의 대역 서버를 호출하는 트랜스포트 (네트워크 없음)"""
+    return httpx.ASGITransport(app=create_mock_oasis(config))
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="로컬 OASIS 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--courses", type=int, default=60, help="학생당 수강 과목 수")
+    parser.add_argument("--delay", type=float, default=0.05, help="조회 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--login-delay", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = MockOasisConfig(
+        courses=args.courses, delay=args.delay, jitter=args.jitter,
+        login_delay=args.login_delay, error_rate=args.error_rate,
+    )
+    uvicorn.run(create_mock_oasis(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
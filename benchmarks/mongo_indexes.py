@@ -0,0 +1,96 @@
+"""
+MongoDB 인덱스 벤치마크
+
+students 컬렉션에 학생 N명(기본 100,000명)을 채운 뒤,
+인덱스가 없을 때와 std_no/updated_at 인덱스를 만든 뒤의
+find_one(std_no) 조회와 upsert(save_student_info) 지연 시간을 비교합니다.
+
+실행 (MONGODB_URL 필요, 별도 DB를 만들고 끝나면 삭제합니다):
+    python -m benchmarks.mongo_indexes --students 100000 --samples 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, List
+from pymongo import AsyncMongoClient
+from app.core.config import settings
+from app.repositories.student_info_repository import StudentInfoRepository
+from benchmarks.stats import summarize
+
+SAMPLE_INFO = {
+    "STDNO": "",
+    "NM": "홍길동",
+    "UNIVCDNM": "공과대학",
+    "MJCDNM": "컴퓨터공학부",
+    "SHTRNM": "3",
+    "ENTRDT": "20210302",
+    "TTCPTNSHTMCNT": "5",
+    "SUBMATTYY": "2021",
+    "TOTALSCORAVG": "3.85",
+}
+
+
+def std_no_of(i: int) -> str:
+    return f"2{i:08d}"
+
+
+async def measure(samples: int, op: Callable[[str], Awaitable], population: int) -> List[float]:
+    timings = []
+    for _ in range(samples):
+        std_no = std_no_of(random.randrange(population))
+        start = time.perf_counter()
+        await op(std_no)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def seed(repo: StudentInfoRepository, students: int, batch_size: int = 5000):
+    await repo.collection.drop()
+    for offset in range(0, students, batch_size):
+        docs = []
+        for i in range(offset, min(offset + batch_size, students)):
+            std_no = std_no_of(i)
+            docs.append({"std_no": std_no, **repo.layout.wrap({"data": {**SAMPLE_INFO, "STDNO": std_no}})})
+        await repo.collection.insert_many(docs, ordered=False)
+
+
+async def run(students: int, samples: int, db_name: str):
+    client = AsyncMongoClient(settings.MONGODB_URL)
+    db = client[db_name]
+    repo = StudentInfoRepository(db)
+
+    try:
+        print(f"seeding {students:,} students into {db_name}.students ...")
+        await seed(repo, students)
+
+        for phase in ("no_index", "indexed"):
+            if phase == "indexed":
+                start = time.perf_counter()
+                await repo.create_indexes()
+                print(f"create_indexes: {time.perf_counter() - start:.2f}s")
+
+            indexes = [index["name"] async for index in await repo.collection.list_indexes()]
+            print(f"[{phase}] indexes={indexes}")
+
+            summarize("lookup", await measure(samples, repo.get_student_info, students))
+            summarize(
+                "upsert",
+                await measure(samples, lambda s: repo.save_student_info(s, {**SAMPLE_INFO, "STDNO": s}), students),
+            )
+    finally:
+        await client.drop_database(db_name)
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MongoDB std_no 인덱스 유무에 따른 조회/upsert 지연 시간 비교")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--db", default=f"{settings.MONGODB_DB_NAME}-bench")
+    args = parser.parse_args()
+    asyncio.run(run(args.students, args.samples, args.db))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+워커 수별 처리량 확장 벤치마크 (gunicorn + uvicorn 워커, 멀티 프로세스)
+
+대역 OASIS 서버와 API 서버를 별도 프로세스로 띄우고, 워커 수(--workers)를 바꿔 가며 같은 부하를 줍니다.
+부하 생성기도 여러 프로세스(--clients)로 나눠 클라이언트 쪽이 먼저 포화되지 않게 합니다.
+- sync: POST /oasis/student/{std_no}/sync (XML 파싱/검증/diff 저장, CPU 비중이 큼)
+- read: 조회 엔드포인트 하나 (--read, 기본 read_record)
+첫 측정 전에 한 번 동기화해 두므로, 측정하는 sync는 모두 같은 조건(변경 없음)입니다.
+
+MongoDB는 MONGODB_URL의 서버에 별도 DB(<MONGODB_DB_NAME>-scaling)를 만들어 쓰고, 끝나면 삭제합니다.
+워커가 여럿이면 공유 저장소가 필요하므로 기본으로 세션/작업 상태와 조회 캐시를 모두 Redis(--redis-url)에 두고,
+쿠키 대신 세션 토큰으로 동기화해 공유 세션 경로까지 함께 잽니다. (--backend memory는 워커 1개만 가능)
+
+실행:
+    python -m benchmarks.scaling --workers 1 2 4 8 --students 400 --reads 4000
+    python -m benchmarks.scaling --redis-url redis://localhost:6379/0
+    python -m benchmarks.scaling --workers 1 --backend memory
+    python -m benchmarks.scaling --json scaling.json
+    python -m benchmarks.scaling --baseline scaling.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import httpx
+from app.core.config import settings
+from benchmarks.e2e import READ_ENDPOINTS, std_no_of
+from benchmarks.stats import compare_to_baseline, latency_stats, save_results
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (method, path, json body)
+Request = Tuple[str, str, Optional[dict]]
+
+
+async def _client_run(base_url: str, requests: List[Request], concurrency: int) -> dict:
+    pending = iter(requests)
+    timings: List[float] = []
+    statuses: Counter = Counter()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        async def worker():
+            for method, path, body in pending:
+                start = time.perf_counter()
+                try:
+                    res = await client.request(method, path, json=body)
+                    statuses[str(res.status_code)] += 1
+                except Exception as e:
+                    statuses[type(e).__name__] += 1
+                timings.append(time.perf_counter() - start)
+
+        started = time.time()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return {"timings": timings, "statuses": dict(statuses), "started": started, "ended": time.time()}
+
+
+def _client_proc(job: Tuple[str, List[Request], int]) -> dict:
+    return asyncio.run(_client_run(*job))
+
+
+def drive(pool, base_url: str, requests: List[Request], clients: int, concurrency: int) -> dict:
+    """요청을 clients개 프로세스에 나눠 보내고, 전체 구간 기준 처리량/지연 시간을 집계합니다."""
+    shares = [requests[i::clients] for i in range(clients)]
+    per_client = max(1, concurrency // clients)
+    parts = pool.map(_client_proc, [(base_url, share, per_client) for share in shares if share])
+
+    timings = [t for part in parts for t in part["timings"]]
+    statuses: Counter = Counter()
+    for part in parts:
+        statuses.update(part["statuses"])
+    elapsed = max(part["ended"] for part in parts) - min(part["started"] for part in parts)
+    return {
+        **latency_stats(timings),
+        "rps": len(timings) / elapsed,
+        "errors": sum(count for status, count in statuses.items() if not (status.isdigit() and int(status) < 400)),
+        "status": {str(status): count for status, count in statuses.items()},
+    }
+
+
+def wait_ready(base_url: str, proc: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 프로세스가 종료됨 (exit {proc.returncode})")
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{base_url} 준비 대기 시간 초과")
+
+
+def stop(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def start_mocks(args) -> Tuple[List[subprocess.Popen], List[str]]:
+    procs, urls = [], []
+    for i in range(args.mock_procs):
+        port = args.mock_port + i
+        procs.append(subprocess.Popen(
+            [
+                sys.executable, "-m", "benchmarks.mock_oasis", "--port", str(port),
+                "--courses", str(args.courses), "--delay", str(args.delay), "--jitter", str(args.jitter),
+                "--login-delay", "0",
+            ],
+            cwd=ROOT,
+        ))
+        urls.append(f"http://127.0.0.1:{port}")
+    for url in urls:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(url, timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"대역 서버 준비 대기 시간 초과: {url}")
+                time.sleep(0.1)
+    return procs, urls
+
+
+def start_api(args, workers: int, mock_urls: List[str]) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MOCK_OASIS_URL": ",".join(mock_urls),
+        "WEB_CONCURRENCY": str(workers),
+        "MONGODB_DB_NAME": args.db,
+        "LOG_LEVEL": "WARNING",
+        "RESYNC_ENABLED": "False",
+        "CACHE_ENABLED": str(not args.no_cache),
+        "STATE_BACKEND": args.backend,
+        "STATE_REDIS_URL": args.redis_url,
+        "CACHE_BACKEND": args.backend,
+        "CACHE_REDIS_URL": args.redis_url,
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "benchmarks.scaling_app:app",
+            "-c", "gunicorn.conf.py", "--workers", str(workers), "--bind", f"127.0.0.1:{args.port}",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+def run(args) -> Dict[str, dict]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    std_nos = [std_no_of(i) for i in range(args.students)]
+    read_path = READ_ENDPOINTS[args.read]
+    results: Dict[str, dict] = {}
+    mocks, mock_urls = start_mocks(args)
+
+    try:
+        with multiprocessing.Pool(args.clients) as pool:
+            for index, workers in enumerate(args.workers):
+                api = start_api(args, workers, mock_urls)
+                try:
+                    wait_ready(base_url, api)
+                    login = httpx.post(
+                        f"{base_url}/oasis/auth/session",
+                        json={"user_id": "bench", "user_pw": "bench", "otp": "000000"},
+                        timeout=30,
+                    ).json()["data"]
+                    # 공유 세션 저장소가 없으면 토큰은 로그인한 워커에서만 유효하므로 쿠키로 동기화합니다.
+                    body = (
+                        {"session_token": login["session_token"]}
+                        if args.backend == "redis" else {"cookies": login["cookies"]}
+                    )
+                    sync_requests = [("POST", f"/oasis/student/{std_no}/sync", body) for std_no in std_nos]
+                    if index == 0:
+                        drive(pool, base_url, sync_requests, args.clients, args.concurrency)
+
+                    results[f"sync[w={workers}]"] = drive(pool, base_url, sync_requests, args.clients, args.concurrency)
+                    read_requests = [
+                        ("GET", read_path.format(std_no=random.choice(std_nos)), None) for _ in range(args.reads)
+                    ]
+                    results[f"read[w={workers}]"] = drive(pool, base_url, read_requests, args.clients, args.concurrency)
+                finally:
+                    stop(api)
+    finally:
+        for mock in mocks:
+            stop(mock)
+        if not args.keep_db:
+            from pymongo import MongoClient
+            MongoClient(settings.MONGODB_URL).drop_database(args.db)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn 워커 수별 처리량 확장 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="측정할 워커 수 목록")
+    parser.add_argument("--students", type=int, default=400, help="동기화할 학생 수")
+    parser.add_argument("--reads", type=int, default=4000, help="워커 수별 조회 요청 수")
+    parser.add_argument("--read", choices=list(READ_ENDPOINTS), default="read_record", help="조회 시나리오")
+    parser.add_argument("--concurrency", type=int, default=64, help="전체 동시 요청 수")
+    parser.add_argument("--clients", type=int, default=4, help="부하 생성 프로세스 수")
+    parser.add_argument("--courses", type=int, default=60, help="학생당 수강 과목 수 (응답 크기)")
+    parser.add_argument("--delay", type=float, default=0.0, help="대역 서버 조회 응답 지연(초), 0이면 CPU 비용만 측정")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--mock-procs", type=int, default=2, help="대역 서버 프로세스 수 (대역 서버가 병목이 되지 않게)")
+    parser.add_argument("--mock-port", type=int, default=9100)
+    parser.add_argument("--port", type=int, default=8100, help="API 서버 포트")
+    parser.add_argument("--backend", choices=("memory", "redis"), default="redis", help="세션/작업 상태와 캐시 저장소")
+    parser.add_argument("--redis-url", default=settings.STATE_REDIS_URL)
+    parser.add_argument("--no-cache", action="store_true", help="조회 캐시를 끄고 MongoDB 조회까지 측정")
+    parser.add_argument("--db", default=f"{settings.MONGODB_DB_NAME}-scaling")
+    parser.add_argument("--keep-db", action="store_true", help="끝난 뒤 벤치마크 DB를 지우지 않음")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단할 악화 비율")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    print(f"cpu cores: {os.cpu_count()}")
+    print(f"{'scenario':<14} {'n':>6} {'rps':>9} {'speedup':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'errors':>6}")
+    for name, result in results.items():
+        single = results.get(f"{name.split('[')[0]}[w={args.workers[0]}]")
+        speedup = result["rps"] / single["rps"] if single and single["rps"] else 0.0
+        print(
+            f"{name:<14} {result['n']:>6} {result['rps']:>9.1f} {speedup:>7.2f}x {result['p50']:>8.2f} "
+            f"{result['p95']:>8.2f} {result['p99']:>8.2f} {result['errors']:>6}"
+        )
+
+    if args.json:
+        save_results(args.json, results)
+    if args.baseline:
+        regressions = compare_to_baseline(
+            results, args.baseline, args.tolerance, higher_is_worse=("p95", "p99"), lower_is_worse=("rps",)
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
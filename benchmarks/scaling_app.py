@@ -0,0 +1,22 @@
+"""
+벤치마크용 gunicorn 진입점: app.main:app과 같고, OASIS 요청만 대역 서버(MOCK_OASIS_URL)로 돌립니다.
+
+    MOCK_OASIS_URL=http://127.0.0.1:9100 gunicorn benchmarks.scaling_app:app -c gunicorn.conf.py
+
+MOCK_OASIS_URL에 쉼표로 여러 주소를 주면 워커마다 pid로 하나를 골라 대역 서버 부하를 나눕니다.
+"""
+import os
+from app.core import http_client
+from app.main import app  # noqa: F401
+from benchmarks.mock_oasis import RedirectTransport
+
+_build_transport = http_client._build_transport
+
+
+def _redirected_transport():
+    targets = os.environ["MOCK_OASIS_URL"].split(",")
+    return RedirectTransport(targets[os.getpid() % len(targets)], _build_transport())
+
+
+# lifespan(open_http_client)이 워커마다 이 함수로 커넥션 풀을 만듭니다.
+http_client._build_transport = _redirected_transport
@@ -0,0 +1,81 @@
+"""벤치마크 공통 집계 함수 (지연 시간 분위수, 메모리)"""
+import json
+import resource
+import sys
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    """초 단위 샘플 -> {n, p50, p95, p99, max} (ms)"""
+    ms = [s * 1000 for s in samples]
+    return {
+        "n": len(ms),
+        "p50": percentile(ms, 50),
+        "p95": percentile(ms, 95),
+        "p99": percentile(ms, 99),
+        "max": max(ms),
+    }
+
+
+def summarize(label: str, samples: List[float]):
+    stats = latency_stats(samples)
+    print(
+        f"  {label:<8} n={stats['n']:<6} "
+        f"p50={stats['p50']:7.2f}ms p95={stats['p95']:7.2f}ms "
+        f"p99={stats['p99']:7.2f}ms max={stats['max']:7.2f}ms"
+    )
+
+
+def max_rss_mb() -> float:
+    """프로세스 최대 RSS (MB). Linux는 KB, macOS는 byte 단위로 보고합니다."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def current_rss_mb() -> float:
+    """현재 RSS (MB). /proc이 없는 환경에서는 최대 RSS로 대신합니다."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return max_rss_mb()
+    return pages * resource.getpagesize() / (1024 * 1024)
+
+
+def save_results(path: str, results: Dict[str, dict]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def compare_to_baseline(
+    results: Dict[str, dict],
+    baseline_path: str,
+    tolerance: float,
+    higher_is_worse: Sequence[str] = (),
+    lower_is_worse: Sequence[str] = (),
+) -> List[str]:
+    """
+    이전 결과(JSON)와 비교해 tolerance(비율)보다 나빠진 항목을 돌려줍니다.
+    배포 전 CI에서 돌리고 목록이 비어 있지 않으면 실패로 처리하는 용도입니다.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline: Dict[str, dict] = json.load(f)
+
+    regressions = []
+    for name, current in results.items():
+        previous: Optional[dict] = baseline.get(name)
+        if not previous:
+            continue
+        for key in higher_is_worse:
+            if previous.get(key) and current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}.{key}: {previous[key]:.2f} -> {current[key]:.2f}")
+        for key in lower_is_worse:
+            if previous.get(key) and current[key] < previous[key] * (1 - tolerance):
+                regressions.append(f"{name}.{key}: {previous[key]:.2f} -> {current[key]:.2f}")
+    return regressions
@@ -0,0 +1,48 @@
+"""
+gunicorn 설정 (uvicorn 워커 여러 개로 실행)
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+워커는 각자 이벤트 루프, MongoDB 풀, OASIS 커넥션 풀을 따로 가집니다.
+OASIS 요청 예산(토큰 버킷)과 서킷 상태는 StateBackend에 두고, 배치/재동기화 동시 실행 수는 워커 수로 나눕니다.
+워커가 2개 이상이면 세션/작업 상태/재동기화 락과 조회 캐시를 공유해야 하므로
+STATE_BACKEND=redis, CACHE_BACKEND=redis(또는 CACHE_ENABLED=False)가 아니면 시작하지 않습니다.
+"""
+import multiprocessing
+import os
+import sys
+from app.core.config import settings
+
+# 워커끼리 세션/작업 상태와 캐시 무효화를 함께 볼 수 있는지
+# (memory 백엔드로 여러 워커를 띄우면 다른 워커에서 만든 세션 토큰이 401이 되고, 동기화 후에도 이전 캐시가 보임)
+SHARED_STATE = settings.STATE_BACKEND == "redis" and (settings.CACHE_BACKEND == "redis" or not settings.CACHE_ENABLED)
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# 기본값: 공유 저장소가 있으면 CPU 코어 수 (파싱/검증은 CPU, 나머지는 I/O 대기라 코어당 워커 하나면 충분), 없으면 1
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() if SHARED_STATE else 1))
+
+# 업스트림이 느린 동기화 요청이 끝날 때까지 기다리는 시간
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# 메모리 단편화 대비: 일정 요청 수마다 워커 재시작 (0이면 사용 안 함), 워커끼리 동시에 재시작하지 않도록 jitter
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+accesslog = None  # 요청 로그는 LoggingMiddleware가 남김
+
+
+def on_starting(server):
+    # --workers / WEB_CONCURRENCY까지 반영된 최종 워커 수로 확인합니다.
+    if server.cfg.workers > 1 and not SHARED_STATE:
+        server.log.error(
+            "워커 %d개로 시작하려면 STATE_BACKEND=redis, CACHE_BACKEND=redis(또는 CACHE_ENABLED=False)가 필요합니다. "
+            "(현재 STATE_BACKEND=%s, CACHE_BACKEND=%s)",
+            server.cfg.workers, settings.STATE_BACKEND, settings.CACHE_BACKEND,
+        )
+        sys.exit(1)
+    # 워커는 이 마스터에서 fork되므로 앱 모듈이 읽는 설정에 최종 워커 수가 그대로 전달됩니다.
+    # (워커마다 따로 세는 동시 실행 수를 워커 수로 나눔, preload_app을 쓰지 않는 전제)
+    settings.WEB_CONCURRENCY = server.cfg.workers
@@ -0,0 +1,87 @@
+import asyncio
+import copy
+import os
+from types import SimpleNamespace
+import pytest
+
+# app.core.config의 필수 설정 (테스트는 MongoDB에 접속하지 않음)
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+
+
+def _matches(row: dict, condition: dict) -> bool:
+    return all(row.get(key) == value for key, value in condition.items())
+
+
+class FakeCollection:
+    """
+    리포지토리가 쓰는 만큼만 흉내 낸 컬렉션 (std_no로 문서 하나를 찾는 쿼리, 최상위 필드)
+    bulk_write는 연산 사이마다 이벤트 루프에 양보해 동시에 실행한 쓰기가 서로 끼어들 수 있게 합니다.
+    """
+
+    def __init__(self):
+        self.docs = {}
+        self.writes = 0
+
+    def _find(self, query: dict):
+        doc = self.docs.get(query["std_no"])
+        if doc is None or not _matches(doc, query):
+            return None
+        return doc
+
+    async def find_one(self, query: dict, projection=None):
+        doc = self._find(query)
+        if doc is None:
+            return None
+        if projection:
+            fields = [name for name, keep in projection.items() if keep]
+            doc = {name: doc[name] for name in fields if name in doc}
+        return copy.deepcopy(doc)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False, array_filters=None):
+        self.writes += 1
+        doc = self._find(query)
+        if doc is None:
+            if not upsert or query["std_no"] in self.docs:
+                return SimpleNamespace(matched_count=0)
+            doc = self.docs[query["std_no"]] = {"std_no": query["std_no"]}
+        _apply(doc, copy.deepcopy(update), array_filters or [])
+        return SimpleNamespace(matched_count=1)
+
+    async def bulk_write(self, ops, ordered: bool = True):
+        matched = 0
+        for op in ops:
+            await asyncio.sleep(0)
+            result = await self.update_one(op._filter, op._doc, array_filters=op._array_filters)
+            matched += result.matched_count
+        return SimpleNamespace(matched_count=matched)
+
+
+def _apply(doc: dict, update: dict, array_filters: list):
+    for path, value in update.get("$set", {}).items():
+        if ".$[" not in path:
+            doc[path] = value
+            continue
+        name, identifier = path[:-1].split(".$[")
+        condition = {
+            key.split(".", 1)[1]: expected
+            for array_filter in array_filters
+            for key, expected in array_filter.items() if key.startswith(identifier + ".")
+        }
+        doc[name] = [value if _matches(row, condition) else row for row in doc.get(name, [])]
+    for path in update.get("$unset", {}):
+        doc.pop(path, None)
+    for path, spec in update.get("$pull", {}).items():
+        doc[path] = [row for row in doc.get(path, []) if not any(_matches(row, c) for c in spec["$or"])]
+    for path, spec in update.get("$push", {}).items():
+        doc.setdefault(path, []).extend(spec["$each"])
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name: str) -> FakeCollection:
+        collection = self[name] = FakeCollection()
+        return collection
+
+
+@pytest.fixture
+def fake_db() -> FakeDatabase:
+    return FakeDatabase()
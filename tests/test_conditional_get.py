@@ -0,0 +1,73 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.cache import MemoryCacheBackend, ResponseCache, get_response_cache
+from app.core.config import settings
+from app.core.mongodb import get_mongo_db
+from app.crawlers.score import CreditCrawler
+from app.main import create_app
+
+STD_NO = "202100001"
+
+
+class _FakeCrawler:
+    """업스트림 대신 정해 둔 학점 행을 돌려주는 크롤러 (동기화할 때마다 다음 값을 사용)"""
+
+    def __init__(self, results: list):
+        self.results = results
+
+    async def crawl(self, std_no, client):
+        return self.results.pop(0)
+
+
+@pytest.fixture
+def cache() -> ResponseCache:
+    return ResponseCache(MemoryCacheBackend(100), ttl=60)
+
+
+def client_for(fake_db, cache: ResponseCache, results: list) -> TestClient:
+    app = create_app()
+    app.dependency_overrides[get_mongo_db] = lambda: fake_db
+    app.dependency_overrides[get_response_cache] = lambda: cache
+    crawler = _FakeCrawler(results)
+    app.dependency_overrides[CreditCrawler] = lambda: crawler
+    return TestClient(app)
+
+
+def sync(client: TestClient):
+    res = client.post("/oasis/credits/sync", json={"std_no": STD_NO, "cookies": {"JSESSIONIDSSO": "sso"}})
+    assert res.json()["data"] == {"message": "Credits synchronized successfully"}
+
+
+# 미리 만든 JSON(data_json)으로 내보내는 경로와 문서를 변환하는 경로 모두 확인
+@pytest.mark.parametrize("store_rendered", [True, False])
+def test_matching_if_none_match_returns_304(fake_db, cache, monkeypatch, store_rendered):
+    monkeypatch.setattr(settings, "STORE_RENDERED_JSON", store_rendered)
+    client = client_for(fake_db, cache, [[{"GUBUN": "졸업학점", "GRDTPNT": "130"}]])
+    sync(client)
+
+    first = client.get(f"/oasis/credits/{STD_NO}")
+    etag = first.headers["ETag"]
+    again = client.get(f"/oasis/credits/{STD_NO}", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.json()["data"][0]["total_points"] == "130"
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+
+
+def test_sync_invalidates_cached_entry(fake_db, cache):
+    client = client_for(fake_db, cache, [[{"GRDTPNT": "130"}], [{"GRDTPNT": "133"}]])
+    sync(client)
+    old = client.get(f"/oasis/credits/{STD_NO}")
+    client.get(f"/oasis/credits/{STD_NO}")
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    sync(client)
+    res = client.get(f"/oasis/credits/{STD_NO}", headers={"If-None-Match": old.headers["ETag"]})
+
+    # 캐시에 남은 이전 버전이 아니라 새로 저장한 문서를 다시 읽어 보냅니다.
+    assert cache.misses == 2
+    assert res.status_code == 200
+    assert res.headers["ETag"] != old.headers["ETag"]
+    assert res.json()["data"][0]["total_points"] == "133"
@@ -0,0 +1,26 @@
+import asyncio
+from concurrent.futures import BrokenExecutor, Executor
+from app.core.cpu_executor import CpuExecutor
+
+
+class _BrokenPool(Executor):
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenExecutor("pool died")
+
+
+def test_broken_pool_runs_job_inline_and_drops_pool():
+    executor = CpuExecutor("thread", 1, {"xml": 0})
+    executor._pool = _BrokenPool()
+
+    result = asyncio.run(executor.run("xml", 10, sum, [1, 2, 3]))
+
+    assert result == 6
+    assert executor._pool is None
+    assert executor.in_flight == 0
+
+
+def test_small_job_skips_pool():
+    executor = CpuExecutor("thread", 1, {"xml": 100})
+    executor._pool = _BrokenPool()
+
+    assert asyncio.run(executor.run("xml", 100, len, b"abc")) == 3
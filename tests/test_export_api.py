@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import create_app
+from app.services.export_service import ExportService
+
+
+class _FakeExport:
+    async def stream_courses(self, fmt, filters, after_std_no, batch_size):
+        yield b'{"std_no":"202100001"}\n'
+
+
+def client_with_token(monkeypatch, token: str) -> TestClient:
+    monkeypatch.setattr(settings, "EXPORT_API_TOKEN", token)
+    app = create_app()
+    app.dependency_overrides[ExportService] = _FakeExport
+    return TestClient(app)
+
+
+def test_export_is_not_registered_without_a_token(monkeypatch):
+    client = client_with_token(monkeypatch, "")
+
+    assert client.get("/oasis/export/courses", headers={"Authorization": "Bearer "}).status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}, {"Authorization": "secret"}])
+def test_export_rejects_missing_or_wrong_token(monkeypatch, headers):
+    client = client_with_token(monkeypatch, "secret")
+
+    res = client.get("/oasis/export/courses", headers=headers)
+
+    assert res.status_code == 401
+    assert res.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_export_streams_with_the_admin_token(monkeypatch):
+    client = client_with_token(monkeypatch, "secret")
+
+    res = client.get("/oasis/export/courses", headers={"Authorization": "Bearer secret"})
+
+    assert res.status_code == 200
+    assert res.text == '{"std_no":"202100001"}\n'
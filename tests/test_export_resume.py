@@ -0,0 +1,45 @@
+import asyncio
+import io
+import pytest
+from app.services.export_service import ExportService, _reversed_lines, find_resume_point
+
+STUDENTS = {
+    f"2021{i:05d}": [
+        {"year": "2021", "semester": "1학기", "subject_code": f"C{i}{j}", "subject_name": "과목, \"따옴표\"", "credit": 3}
+        for j in range(i % 3 + 1)
+    ]
+    for i in range(5)
+}
+
+
+class FakeCoursesRepository:
+    async def iter_courses(self, row_filter=None, after_std_no=None, batch_size=200):
+        for std_no in sorted(STUDENTS):
+            if after_std_no is None or std_no > after_std_no:
+                yield std_no, STUDENTS[std_no]
+
+
+def export(fmt, after=None) -> bytes:
+    async def collect():
+        service = ExportService(FakeCoursesRepository())
+        return b"".join([chunk async for chunk in service.stream_courses(fmt, after_std_no=after)])
+    return asyncio.run(collect())
+
+
+def test_reversed_lines_skips_truncated_tail():
+    data = b"a\nbb\nccc\ndd"
+    for block_size in (1, 2, 3, 64):
+        lines = list(_reversed_lines(io.BytesIO(data), block_size))
+        assert lines == [(5, b"ccc\n"), (2, b"bb\n"), (0, b"a\n")]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_resume_from_any_cut_reproduces_full_export(fmt):
+    full = export(fmt)
+    for cut in range(len(full) + 1):
+        f = io.BytesIO(full[:cut])
+        offset, after = find_resume_point(f, fmt)
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(export(fmt, after))
+        assert f.getvalue() == full, cut
@@ -0,0 +1,45 @@
+from app.core.nexacro import NexacroParser, parse_nexacro_xml
+
+UPDATED_ROW_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Root xmlns="http://www.nexacroplatform.com/platform/dataset">
+  <Parameters>
+    <Parameter id="ErrorCode" type="int">0</Parameter>
+  </Parameters>
+  <Dataset id="dsMain">
+    <ColumnInfo>
+      <Column id="A" type="STRING" size="10"/>
+      <Column id="B" type="STRING" size="10"/>
+    </ColumnInfo>
+    <Rows>
+      <Row type="update">
+        <Col id="A">2</Col>
+        <OrgRow>
+          <Col id="A">OLD</Col>
+          <Col id="B">ORIG</Col>
+        </OrgRow>
+      </Row>
+      <Row>
+        <Col id="A">3</Col>
+        <Col id="B">x</Col>
+      </Row>
+    </Rows>
+  </Dataset>
+</Root>
+"""
+
+
+def test_org_row_cols_do_not_overwrite_row_values():
+    result = parse_nexacro_xml(UPDATED_ROW_XML.encode())
+
+    assert result.parameters == {"ErrorCode": "0"}
+    assert result.last_rows() == [{"A": "2"}, {"A": "3", "B": "x"}]
+
+
+def test_org_row_split_across_chunks():
+    # OrgRow 시작/끝 태그가 청크 경계에 걸쳐도 결과가 같아야 합니다.
+    body = UPDATED_ROW_XML.encode()
+    parser = NexacroParser()
+    for offset in range(0, len(body), 7):
+        parser.feed(body[offset:offset + 7])
+
+    assert parser.close().last_rows() == [{"A": "2"}, {"A": "3", "B": "x"}]
@@ -0,0 +1,50 @@
+import asyncio
+import httpx
+from app.core import constants as const
+from app.core.oasis_client import OasisClient
+from test_nexacro import UPDATED_ROW_XML
+
+
+def client_with_upstream(posts: list) -> OasisClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        posts.append(request.content)
+        await asyncio.sleep(0.05)  # 두 번째 호출이 첫 요청이 끝나기 전에 들어오도록
+        return httpx.Response(200, content=UPDATED_ROW_XML.encode())
+
+    client = OasisClient()
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.restore_cookies({"JSESSIONIDSSO": "sso"})
+    return client
+
+
+def test_concurrent_identical_calls_share_one_upstream_post():
+    posts = []
+    client = client_with_upstream(posts)
+    payload = client.build_payload("202100001", const.COURSES_TAKEN_PAYLOAD)
+
+    async def fetch_twice():
+        return await asyncio.gather(
+            client.fetch_xml(const.COURSES_TAKEN_URL, payload),
+            client.fetch_xml(const.COURSES_TAKEN_URL, payload),
+        )
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert len(posts) == 1
+    assert first == second == [{"A": "2"}, {"A": "3", "B": "x"}]
+
+
+def test_credits_and_courses_are_separate_requests():
+    # 같은 URL이지만 rType(B1, C)이 달라 응답이 다르므로 합치지 않습니다.
+    posts = []
+    client = client_with_upstream(posts)
+
+    async def fetch_both():
+        await asyncio.gather(
+            client.fetch_xml(const.SCORE_URL, client.build_payload("202100001", const.SCORE_PAYLOAD)),
+            client.fetch_xml(const.COURSES_TAKEN_URL, client.build_payload("202100001", const.COURSES_TAKEN_PAYLOAD)),
+        )
+
+    asyncio.run(fetch_both())
+
+    assert len(posts) == 2
@@ -0,0 +1,101 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+import pytest
+from app.core import session_registry as registry_module
+from app.core.oasis_client import OasisClient
+from app.core.session_registry import SessionRegistry
+from app.core.state import MemoryStateBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 세션마다 마지막 사용 시각이 확실히 다르도록 1초씩 증가하는 시계
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(registry_module, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def logged_in(sso: str = "sso") -> OasisClient:
+    client = OasisClient()
+    client.restore_cookies({"JSESSIONIDSSO": sso})
+    return client
+
+
+def test_cap_evicts_least_recently_used_session(clock):
+    backend = MemoryStateBackend()
+    sessions = SessionRegistry(backend, ttl=3600, max_sessions=2)
+
+    async def scenario():
+        first = await sessions.create(logged_in("1"))
+        second = await sessions.create(logged_in("2"))
+        await sessions.bind(second, "202100002")
+        await sessions.get(first)  # first를 최근 사용으로
+        third = await sessions.create(logged_in("3"))
+        # 다른 워커처럼 로컬 OasisClient 없이 저장소만 보고 판단
+        other_worker = SessionRegistry(backend, ttl=3600, max_sessions=2)
+        return first, second, third, other_worker
+
+    first, second, third, other_worker = asyncio.run(scenario())
+
+    async def check():
+        assert await other_worker.get(second) is None
+        assert await backend.smembers(f"session:{second}:std_nos") == set()
+        restored = await other_worker.get(first)
+        assert restored.get_cookies() == {"JSESSIONIDSSO": "1"}
+        assert await other_worker.get(third) is not None
+        assert await backend.zrange(SessionRegistry.INDEX_KEY) == [first, third]
+
+    asyncio.run(check())
+
+
+def test_bind_maps_std_nos_to_most_recent_session(clock):
+    sessions = SessionRegistry(MemoryStateBackend(), ttl=3600, max_sessions=10)
+
+    async def scenario():
+        older = await sessions.create(logged_in("old"))
+        newer = await sessions.create(logged_in("new"))
+        await asyncio.gather(*(sessions.bind(older, std_no) for std_no in ("A", "B")))
+        await asyncio.gather(*(sessions.bind(newer, std_no) for std_no in ("B", "C")))
+        return older, newer, await sessions.bound_std_nos()
+
+    older, newer, bound = asyncio.run(scenario())
+
+    assert bound == {"A": older, "B": newer, "C": newer}
+
+
+def test_expired_session_is_gone_and_invalidate_cleans_index():
+    backend = MemoryStateBackend()
+    sessions = SessionRegistry(backend, ttl=0.05, max_sessions=10)
+
+    async def scenario():
+        token = await sessions.create(logged_in())
+        await sessions.bind(token, "202100001")
+        await asyncio.sleep(0.1)
+        expired = await sessions.get(token)
+        bound = await sessions.bound_std_nos()
+        removed = await sessions.invalidate(token)
+        return expired, bound, removed, await backend.zrange(SessionRegistry.INDEX_KEY)
+
+    expired, bound, removed, index = asyncio.run(scenario())
+
+    assert expired is None
+    assert bound == {}
+    # 기록은 이미 만료되어 지울 것이 없지만, 색인에 남은 토큰은 정리됩니다.
+    assert removed is False
+    assert index == []
+
+
+def test_session_without_sso_cookie_is_invalidated(clock):
+    backend = MemoryStateBackend()
+    sessions = SessionRegistry(backend, ttl=3600, max_sessions=10)
+
+    async def scenario():
+        client = logged_in()
+        token = await sessions.create(client)
+        client.expired = True  # 업스트림이 로그인 페이지로 돌려보낸 세션
+        return token, await sessions.get(token)
+
+    token, resolved = asyncio.run(scenario())
+
+    assert resolved is None
+    assert asyncio.run(backend.get(f"session:{token}")) is None
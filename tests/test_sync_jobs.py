@@ -0,0 +1,108 @@
+import asyncio
+import httpx
+import orjson
+import pytest
+from app.core.mongodb import get_mongo_db
+from app.core.rate_limit import TokenBucket
+from app.core.state import MemoryStateBackend
+from app.main import create_app
+from app.services import job_service
+from app.services.job_service import SyncJobManager, get_job_manager
+
+STD_NO = "202100001"
+
+
+class _StubService:
+    """gate가 열릴 때까지 업스트림 대기를 흉내 내는 OasisService 대역"""
+
+    def __init__(self, gate: asyncio.Event):
+        self.gate = gate
+
+    async def sync_credits(self, cookies, crawler, std_no, session_token=None):
+        await self.gate.wait()
+        return True
+
+
+def manager(backend: MemoryStateBackend) -> SyncJobManager:
+    return SyncJobManager(
+        max_concurrency=1,
+        rate_limiter=TokenBucket(100, 10),
+        retention=60,
+        max_pending=10,
+        backend=backend,
+        publish_interval=0.01,
+    )
+
+
+def http_client(jobs: SyncJobManager, fake_db) -> httpx.AsyncClient:
+    app = create_app()
+    app.dependency_overrides[get_job_manager] = lambda: jobs
+    app.dependency_overrides[get_mongo_db] = lambda: fake_db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def parse_events(body: bytes) -> list:
+    events = []
+    for block in body.decode().split("\n\n"):
+        if block.startswith("event: "):
+            name, data = block.split("\n")
+            events.append((name[len("event: "):], orjson.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def gate(monkeypatch) -> asyncio.Event:
+    gate = asyncio.Event()
+    monkeypatch.setattr(job_service, "build_oasis_service", lambda: _StubService(gate))
+    return gate
+
+
+def test_async_sync_job_runs_to_completion(fake_db, gate):
+    backend = MemoryStateBackend()
+    # 작업을 받은 워커와, 공유 저장소로만 상태를 보는 다른 워커
+    owner, other = manager(backend), manager(backend)
+
+    async def scenario():
+        async with http_client(owner, fake_db) as client, http_client(other, fake_db) as remote:
+            accepted = await client.post(
+                "/oasis/credits/sync?async=true", json={"std_no": STD_NO, "cookies": {"JSESSIONIDSSO": "sso"}}
+            )
+            location = accepted.headers["Location"]
+            job_id = accepted.json()["data"]["job_id"]
+            published = orjson.loads(await backend.get(f"job:{job_id}"))
+
+            await asyncio.sleep(0.05)
+            running = (await client.get(location)).json()["data"]
+            remote_running = (await remote.get(location)).json()["data"]
+
+            streams = [
+                asyncio.create_task(c.get(f"/oasis/jobs/{job_id}/events")) for c in (client, remote)
+            ]
+            await asyncio.sleep(0.05)
+            gate.set()
+            local_events, remote_events = [parse_events(res.content) for res in await asyncio.gather(*streams)]
+
+            await owner.get(job_id).task
+            completed = (await remote.get(location)).json()["data"]
+            return accepted, published, running, remote_running, local_events, remote_events, completed
+
+    accepted, published, running, remote_running, local_events, remote_events, completed = asyncio.run(scenario())
+
+    assert accepted.status_code == 202
+    assert accepted.json()["data"]["status"] == "pending"
+    assert accepted.headers["Location"].endswith(f"/oasis/jobs/{accepted.json()['data']['job_id']}")
+    # 202를 돌려주기 전에 상태를 먼저 기록해 두므로 다른 워커도 바로 찾을 수 있습니다.
+    assert published["status"] == "pending"
+    assert running["status"] == remote_running["status"] == "running"
+    assert running["items"][0]["status"] == remote_running["items"][0]["status"] == "running"
+
+    # 항목이 끝나면 item, 작업이 끝나면 done (다른 워커는 공유 저장소를 읽어 같은 이벤트를 만듦)
+    for events in (local_events, remote_events):
+        assert [name for name, _ in events] == ["item", "done"]
+        item, done = events[0][1], events[1][1]
+        assert item["std_no"] == STD_NO and item["status"] == "succeeded" and item["part"]["success"]
+        assert done["status"] == "completed" and done["succeeded"] == 1 and done["items"] is None
+
+    assert completed["status"] == "completed"
+    assert (completed["total"], completed["succeeded"], completed["failed"]) == (1, 1, 0)
+    assert completed["section"] == "credits"
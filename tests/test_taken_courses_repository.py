@@ -0,0 +1,92 @@
+import asyncio
+import orjson
+from app.core.transcript import summarize_transcript
+from app.repositories.taken_courses_repository import TakenCoursesRepository, course_key
+from app.schemas.crawler import ScoreItem
+
+STD_NO = "202100001"
+
+
+def item(code, grade="A0", gpa=4.0, year="2023", semester="1학기"):
+    return ScoreItem(
+        year=year, semester=semester, subject_code=code, subject_name=code, course_type="전공선택",
+        credit=3.0, gpa=gpa, grade=grade,
+    )
+
+
+def stored(repo: TakenCoursesRepository) -> dict:
+    return repo.collection.docs[STD_NO]
+
+
+def assert_consistent(doc: dict):
+    # 미리 만든 응답 JSON과 요약이 실제 저장된 배열과 같은 내용이어야 합니다.
+    assert orjson.loads(doc["data_json"]) == doc["data"]
+    assert doc["summary"] == summarize_transcript(doc["data"]).model_dump()
+    keys = [course_key(row) for row in doc["data"]]
+    assert len(keys) == len(set(keys))
+
+
+def test_only_changed_rows_are_written(fake_db):
+    repo = TakenCoursesRepository(fake_db)
+
+    async def scenario():
+        first = await repo.save_courses(STD_NO, [item("A"), item("B"), item("C")])
+        unchanged = await repo.save_courses(STD_NO, [item("A"), item("B"), item("C")])
+        writes = repo.collection.writes
+        changed = await repo.save_courses(STD_NO, [item("A"), item("B", "B0", 3.0), item("D")])
+        return first, unchanged, writes, changed
+
+    first, unchanged, writes_before, changed = asyncio.run(scenario())
+
+    assert first.inserted == 3 and first.written
+    assert not unchanged.written and unchanged.unchanged == 3 and writes_before == 1
+    assert (changed.inserted, changed.updated, changed.removed, changed.unchanged) == (1, 1, 1, 1)
+    doc = stored(repo)
+    assert [(row["subject_code"], row["grade"]) for row in doc["data"]] == [("A", "A0"), ("B", "B0"), ("D", "A0")]
+    assert_consistent(doc)
+
+
+def test_concurrent_syncs_do_not_interleave(fake_db):
+    repo = TakenCoursesRepository(fake_db)
+    first = [item("A"), item("B"), item("NEW")]
+    second = [item("B", "C0", 2.0), item("C"), item("NEW")]
+
+    async def scenario():
+        await repo.save_courses(STD_NO, [item("A"), item("B"), item("C")])
+        # 두 동기화가 같은 문서를 읽고 각자 변경분을 계산한 뒤 bulk_write 연산이 번갈아 실행됨
+        return await asyncio.gather(repo.save_courses(STD_NO, first), repo.save_courses(STD_NO, second))
+
+    asyncio.run(scenario())
+
+    doc = stored(repo)
+    rows = [ScoreItem(**row) for row in doc["data"]]
+    # 끼어든 쪽이 다시 비교해 마지막으로 쓰므로, 결과는 어느 한쪽 목록과 정확히 같아야 합니다. (중복/부활 없음)
+    assert sorted(rows, key=lambda r: r.subject_code) in (
+        sorted(first, key=lambda r: r.subject_code),
+        sorted(second, key=lambda r: r.subject_code),
+    )
+    assert_consistent(doc)
+
+
+def test_losing_every_diff_attempt_falls_back_to_replace(fake_db):
+    repo = TakenCoursesRepository(fake_db)
+    target = [item("A"), item("D")]
+
+    async def scenario():
+        await repo.save_courses(STD_NO, [item("A"), item("B")])
+        original = repo.collection.bulk_write
+
+        async def bulk_write_after_other_writer(ops, ordered=True):
+            # 매번 비교한 직후 다른 쓰기가 revision을 바꿔 놓음
+            repo.collection.docs[STD_NO]["revision"] = object()
+            return await original(ops, ordered)
+
+        repo.collection.bulk_write = bulk_write_after_other_writer
+        return await repo.save_courses(STD_NO, target)
+
+    summary = asyncio.run(scenario())
+
+    assert summary.written
+    doc = stored(repo)
+    assert [row["subject_code"] for row in doc["data"]] == ["A", "D"]
+    assert_consistent(doc)
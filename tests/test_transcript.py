@@ -0,0 +1,51 @@
+from app.core.transcript import summarize_transcript
+
+
+def course(year, semester, code, name, grade, gpa, credit=3.0, remarks=None, course_type="전공선택"):
+    return {
+        "year": year, "semester": semester, "subject_code": code, "subject_name": name,
+        "course_type": course_type, "credit": credit, "gpa": gpa, "grade": grade, "remarks": remarks,
+    }
+
+
+def test_renumbered_retake_is_counted_once():
+    # 과목 코드가 바뀐 뒤 재이수: 비고(REMT) 표시로 이전 수강(C0)을 대체
+    rows = [
+        course("2021", "1학기", "CSE1001", "자료구조", "C0", 2.0),
+        course("2022", "1학기", "CSE2101", "자료구조", "A0", 4.0, remarks="재이수신청"),
+        course("2022", "1학기", "CSE2200", "운영체제", "B0", 3.0),
+    ]
+    summary = summarize_transcript(rows)
+
+    assert summary.retake_count == 1
+    assert summary.attempted_credits == 6.0
+    assert summary.earned_credits == 6.0
+    assert summary.gpa == 3.5
+    # 학기별 집계는 그 학기에 받은 성적 그대로
+    assert [s.earned_credits for s in summary.by_semester] == [3.0, 6.0]
+
+
+def test_repeatable_course_with_same_code_is_not_collapsed():
+    # 같은 코드로 여러 번 이수하는 세미나: 재수강 표시가 없고 이전 수강도 통과했으므로 모두 반영
+    rows = [
+        course("2023", "1학기", "CSE4900", "캡스톤디자인", "A+", 4.5, credit=1.0),
+        course("2023", "2학기", "CSE4900", "캡스톤디자인", "B+", 3.5, credit=1.0),
+    ]
+    summary = summarize_transcript(rows)
+
+    assert summary.retake_count == 0
+    assert summary.earned_credits == 2.0
+    assert summary.gpa == 4.0
+
+
+def test_same_code_after_failure_falls_back_to_retake():
+    # 비고가 비어 있어도 같은 코드의 이전 수강이 F면 재수강으로 보고 최근 성적만 반영
+    rows = [
+        course("2021", "2학기", "CSE1002", "이산수학", "F", 0.0),
+        course("2022", "2학기", "CSE1002", "이산수학", "B+", 3.5),
+    ]
+    summary = summarize_transcript(rows)
+
+    assert summary.retake_count == 1
+    assert summary.attempted_credits == 3.0
+    assert summary.gpa == 3.5
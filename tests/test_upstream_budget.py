@@ -0,0 +1,95 @@
+import asyncio
+import time
+import pytest
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.rate_limit import TokenBucket
+from app.core.state import MemoryStateBackend
+from app.exceptions import UpstreamUnavailableError
+
+
+def test_reservations_queue_behind_the_shared_budget():
+    backend = MemoryStateBackend()
+
+    async def reserve_four():
+        return [await backend.reserve_tokens("rate:oasis", 1, 10.0, 2) for _ in range(4)]
+
+    waits = asyncio.run(reserve_four())
+
+    # 버킷 2개는 바로, 나머지는 초당 10개씩 채워지는 순서대로
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_workers_sharing_a_backend_share_one_rate():
+    backend = MemoryStateBackend()
+    workers = [TokenBucket(20.0, 1, backend=backend) for _ in range(2)]
+
+    async def drain():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for bucket in workers * 3))
+        return time.monotonic() - start
+
+    # 워커별 버킷이었다면 두 배 빨리 끝남 (6개 = 버킷 1개 + 5/20초)
+    assert asyncio.run(drain()) >= 0.24
+
+
+class _DownBackend(MemoryStateBackend):
+    async def reserve_tokens(self, key, tokens, rate, capacity):
+        raise ConnectionError("down")
+
+
+def test_bucket_falls_back_to_the_worker_share():
+    bucket = TokenBucket(20.0, 2, backend=_DownBackend(), local_share=2)
+
+    async def drain():
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 워커 몫: 초당 10개, 버킷 1개 -> 나머지 2개에 0.2초
+    assert asyncio.run(drain()) >= 0.18
+
+
+def test_breaker_opened_by_one_worker_rejects_on_the_other():
+    backend = MemoryStateBackend()
+    first = CircuitBreaker("t", failure_threshold=2, reset_timeout=0.05, backend=backend)
+    second = CircuitBreaker("t", failure_threshold=2, reset_timeout=0.05, backend=backend)
+
+    async def scenario():
+        await first.before_call()
+        await first.record_failure()
+        await first.record_failure()
+        with pytest.raises(UpstreamUnavailableError):
+            await second.before_call()
+        assert await second.is_open()
+
+        await asyncio.sleep(0.06)
+        # 시험 요청은 워커 전체에서 한 건만
+        await second.before_call()
+        with pytest.raises(UpstreamUnavailableError):
+            await first.before_call()
+        await second.record_success()
+
+        await first.before_call()
+        assert first.state == "closed"
+        assert not await first.is_open()
+
+    asyncio.run(scenario())
+
+
+def test_failed_probe_reopens_for_everyone():
+    backend = MemoryStateBackend()
+    first = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.05, backend=backend)
+    second = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.05, backend=backend)
+
+    async def scenario():
+        await first.record_failure()
+        await asyncio.sleep(0.06)
+        await second.before_call()
+        await second.record_failure()
+        with pytest.raises(UpstreamUnavailableError):
+            await first.before_call()
+
+    asyncio.run(scenario())